@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.deadline import SearchTimeout, check_deadline
+from algorithms.lookahead import leaf_score
+from algorithms.opponent_model import follow_up_degree
+from algorithms.search import SearchResult
+from algorithms.transposition import TranspositionTable
+from board import distance, move_targets
+import config
+from evaluation import score_state
+from metrics import counters
+from policy import legal_moves_for_snake
+from simulate import apply_moves, undo
+from state import GameState, Snake
+from zobrist import ensure_hash
+
+# Terminal values sit far outside the heuristic range; the remaining depth is added so
+# that earlier wins and later losses are preferred.
+WIN = 1000.0
+LOSS = -1000.0
+INF = float("inf")
+
+# Bound kinds for the alpha-beta table.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def alphabeta_deepening(
+    state: GameState,
+    moves: Sequence[str],
+    weights,
+    deadline: Optional[float],
+    max_depth: int,
+    opp_topk: int,
+    table: Optional[TranspositionTable] = None,
+    mode: str = "paranoid",
+) -> SearchResult:
+    """
+    Iterative deepening over simultaneous-move rounds, treating each round as us moving
+    first and the opponents answering one at a time. In "paranoid" mode every opponent
+    minimises our score_state, which allows alpha-beta pruning; in "maxn" mode each snake
+    maximises its own score_state (no deep pruning is possible there). Depth d searches
+    d + 1 rounds, matching beam_search's depth numbering.
+    Root moves are searched best-first from the previous iteration; later ones only need
+    to be resolved down to the TIE_MARGIN band under the best, since anything lower can
+    never be picked. Their scores may be upper bounds below that band; a bound that ends
+    up inside the band is re-searched, so every score in it is exact.
+    Opponents farther than ALPHABETA_RADIUS from our head only play their best move.
+    """
+    if mode not in ("paranoid", "maxn"):
+        raise ValueError(f"Unknown alpha-beta mode {mode!r}")
+    start = time.perf_counter()
+    if table is None:
+        table = TranspositionTable(config.TT_BITS)
+    table.new_search()
+    ensure_hash(state)
+    result = SearchResult()
+    bounds: Dict[int, Tuple[int, int, float, Optional[str]]] = {}
+    killers: Dict[Tuple[int, str], str] = {}
+    order = list(moves)
+    for depth in range(0, max(0, max_depth) + 1):
+        search = _Search(
+            state, weights, None if depth == 0 else deadline, opp_topk, table, bounds, killers
+        )
+        scores: List[Tuple[str, float]] = []
+        try:
+            bounded = set()
+            for move in order:
+                if mode == "maxn":
+                    scores.append((move, search.maxn_root(move, depth)))
+                    continue
+                alpha = -INF
+                if scores:
+                    best = max(score for _, score in scores)
+                    alpha = best - config.TIE_MARGIN * max(1.0, abs(best))
+                value = search.paranoid_root(move, depth, alpha)
+                if value <= alpha:
+                    bounded.add(move)
+                scores.append((move, value))
+            if bounded:
+                # A fail-low score is only an upper bound. Any that still lands in the tie
+                # band of the final best is searched again with a full window, so top-k
+                # selection only ever sees exact scores.
+                top = max(score for _, score in scores)
+                denom = max(1.0, abs(top))
+                scores = [
+                    (
+                        move,
+                        search.paranoid_root(move, depth)
+                        if move in bounded and (top - score) / denom <= config.TIE_MARGIN
+                        else score,
+                    )
+                    for move, score in scores
+                ]
+        except SearchTimeout:
+            result.deadline_hit = True
+            break
+        result.scores = scores
+        result.depth = depth
+        order = [move for move, _ in sorted(scores, key=lambda item: item[1], reverse=True)]
+        if len(moves) <= 1:
+            break
+    result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+    result.table_stats = table.stats()
+    return result
+
+
+class _Search:
+    """
+    One fixed-depth pass. Moves for a round are chosen against the position at the start
+    of the round and applied together with apply_moves, then undone on the way back.
+    """
+
+    def __init__(
+        self,
+        state: GameState,
+        weights,
+        deadline: Optional[float],
+        opp_topk: int,
+        table: Optional[TranspositionTable],
+        bounds: Dict[int, Tuple[int, int, float, Optional[str]]],
+        killers: Dict[Tuple[int, str], str],
+    ) -> None:
+        self.state = state
+        self.me_id = state.me_id
+        self.weights = weights
+        self.deadline = deadline
+        self.opp_topk = max(1, opp_topk)
+        self.table = table
+        # Round-start positions by Zobrist key: (depth, bound kind, value, best move).
+        # Kept across iterations so deeper passes try the previous best move first.
+        self.bounds = bounds
+        # Killer moves: the last move that caused a cutoff, per (remaining depth, snake id).
+        self.killers = killers
+
+    # Paranoid search -------------------------------------------------------------------
+
+    def paranoid_root(self, root_move: str, depth: int, alpha: float = -INF) -> float:
+        plan = self._opponent_plan(depth)
+        return self._paranoid_opponents(depth, plan, 0, {self.me_id: root_move}, alpha, INF)
+
+    def _paranoid_me(self, depth: int, alpha: float, beta: float) -> float:
+        check_deadline(self.deadline)
+        counters.nodes += 1
+        key = self.state.zobrist
+        entry = self.bounds.get(key)
+        hash_move = None
+        if entry is not None:
+            stored_depth, kind, stored, hash_move = entry
+            if stored_depth >= depth and (
+                kind == EXACT
+                or (kind == LOWER and stored >= beta)
+                or (kind == UPPER and stored <= alpha)
+            ):
+                return stored
+        me = self.state.snakes[self.me_id]
+        moves = self._ordered_moves(me, depth, 4, hash_move)
+        if not moves:
+            return LOSS - depth
+        plan = self._opponent_plan(depth)
+        original_alpha = alpha
+        best = -INF
+        best_move = moves[0]
+        for move in moves:
+            value = self._paranoid_opponents(depth, plan, 0, {self.me_id: move}, alpha, beta)
+            if value > best:
+                best = value
+                best_move = move
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                self.killers[(depth, self.me_id)] = move
+                break
+        if best <= original_alpha:
+            kind = UPPER
+        elif best >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.bounds[key] = (depth, kind, best, best_move)
+        return best
+
+    def _paranoid_opponents(
+        self,
+        depth: int,
+        plan: List[Tuple[str, List[str]]],
+        index: int,
+        move_map: Dict[str, str],
+        alpha: float,
+        beta: float,
+    ) -> float:
+        if index == len(plan):
+            record = apply_moves(self.state, move_map)
+            try:
+                return self._paranoid_after_round(depth, alpha, beta)
+            finally:
+                undo(self.state, record)
+        snake_id, moves = plan[index]
+        if not moves:
+            # No legal move: the snake is eliminated when the round is applied.
+            return self._paranoid_opponents(depth, plan, index + 1, move_map, alpha, beta)
+        best = INF
+        for move in moves:
+            move_map[snake_id] = move
+            value = self._paranoid_opponents(depth, plan, index + 1, move_map, alpha, beta)
+            if value < best:
+                best = value
+            if best < beta:
+                beta = best
+            if alpha >= beta:
+                self.killers[(depth, snake_id)] = move
+                break
+        del move_map[snake_id]
+        return best
+
+    def _paranoid_after_round(self, depth: int, alpha: float, beta: float) -> float:
+        state = self.state
+        if state.snakes[self.me_id].eliminated:
+            return LOSS - depth
+        if not state.opponents:
+            return WIN + depth
+        if depth <= 0:
+            return leaf_score(state, self.weights, self.table)
+        return self._paranoid_me(depth - 1, alpha, beta)
+
+    # Max-n search ----------------------------------------------------------------------
+
+    def maxn_root(self, root_move: str, depth: int) -> float:
+        plan = self._opponent_plan(depth)
+        values = self._maxn_players(depth, plan, 0, {self.me_id: root_move})
+        return values[self.me_id]
+
+    def _maxn_round(self, depth: int) -> Dict[str, float]:
+        check_deadline(self.deadline)
+        counters.nodes += 1
+        me = self.state.snakes[self.me_id]
+        plan = [(self.me_id, self._ordered_moves(me, depth, 4))] + self._opponent_plan(depth)
+        return self._maxn_players(depth, plan, 0, {})
+
+    def _maxn_players(
+        self,
+        depth: int,
+        plan: List[Tuple[str, List[str]]],
+        index: int,
+        move_map: Dict[str, str],
+    ) -> Dict[str, float]:
+        if index == len(plan):
+            record = apply_moves(self.state, move_map)
+            try:
+                return self._maxn_after_round(depth)
+            finally:
+                undo(self.state, record)
+        snake_id, moves = plan[index]
+        if not moves:
+            return self._maxn_players(depth, plan, index + 1, move_map)
+        best: Optional[Dict[str, float]] = None
+        for move in moves:
+            move_map[snake_id] = move
+            values = self._maxn_players(depth, plan, index + 1, move_map)
+            if best is None or values[snake_id] > best[snake_id]:
+                best = values
+        del move_map[snake_id]
+        return best
+
+    def _maxn_after_round(self, depth: int) -> Dict[str, float]:
+        state = self.state
+        alive = state.active_snakes
+        if depth > 0 and len(alive) > 1 and not state.snakes[self.me_id].eliminated:
+            return self._maxn_round(depth - 1)
+        values: Dict[str, float] = {}
+        for snake_id, snake in state.snakes.items():
+            if snake.eliminated:
+                values[snake_id] = LOSS - depth
+            elif len(alive) == 1:
+                values[snake_id] = WIN + depth
+            else:
+                values[snake_id] = self._score_for(snake_id)
+        return values
+
+    def _score_for(self, snake_id: str) -> float:
+        if snake_id == self.me_id:
+            return leaf_score(self.state, self.weights, self.table)
+        # Other perspectives are not cached: table keys do not include the viewpoint.
+        state = self.state
+        state.me_id = snake_id
+        try:
+            return score_state(state, self.weights)
+        finally:
+            state.me_id = self.me_id
+
+    # Move generation and ordering --------------------------------------------------------
+
+    def _opponent_plan(self, depth: int) -> List[Tuple[str, List[str]]]:
+        """
+        Moves each opponent may try this round, best first: up to `opp_topk` for opponents
+        within ALPHABETA_RADIUS of our head (or close enough to reach us in the remaining
+        rounds, if that is nearer), only the top move for the rest.
+        """
+        state = self.state
+        me = state.snakes[self.me_id]
+        reach = min(config.ALPHABETA_RADIUS, 2 * (depth + 1))
+        plan: List[Tuple[str, List[str]]] = []
+        for opponent in state.opponents:
+            limit = self.opp_topk if distance(state, opponent.head, me.head) <= reach else 1
+            plan.append((opponent.id, self._ordered_moves(opponent, depth, limit)))
+        return plan
+
+    def _ordered_moves(
+        self, snake: Snake, depth: int, limit: int, first: Optional[str] = None
+    ) -> List[str]:
+        """
+        The `limit` legal moves for `snake` that leave the most safe moves afterwards, tried
+        in the order `first` (the stored best move), the killer move, then the rest. Which
+        moves are kept depends only on the position, never on search history, so a
+        position's value does not change with the order it was reached in.
+        """
+        state = self.state
+        moves = legal_moves_for_snake(state, snake)
+        if len(moves) <= 1:
+            return moves
+        targets = move_targets(state, snake.head)
+        occupancy = state.occupancy()
+        scored = sorted(
+            moves, key=lambda move: follow_up_degree(state, snake, targets[move], occupancy), reverse=True
+        )[:limit]
+        killer = self.killers.get((depth, snake.id))
+        scored.sort(key=lambda move: 0 if move == first else 1 if move == killer else 2)
+        return scored
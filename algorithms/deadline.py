@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+
+class SearchTimeout(Exception):
+    """
+    Raised from inside a search tree once the move deadline has passed.
+    """
+
+
+def deadline_after(budget_ms: float, start: Optional[float] = None) -> float:
+    base = time.perf_counter() if start is None else start
+    return base + budget_ms / 1000.0
+
+
+def check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Container, Dict, Iterable, Optional
+
+from state import GameState, Point
+from tables import BoardTables
+
+
+class DistanceField:
+    """
+    One breadth-first search from `origin` through cells not in `blocked` (the origin
+    itself may be blocked, e.g. a head). Afterwards every question is a dict lookup:
+    the distance to a cell, whether it is reachable, and the first move of a shortest
+    path to it. Ties between equally short paths go to the earlier direction in DELTAS.
+    """
+
+    __slots__ = ("origin", "distances", "first_moves")
+
+    def __init__(self, origin: Point, blocked: Container[Point], tables: BoardTables) -> None:
+        self.origin = origin
+        distances: Dict[Point, int] = {origin: 0}
+        first_moves: Dict[Point, str] = {}
+        moves = tables.moves
+        neighbors = tables.neighbors
+        queue = deque()
+        for direction, target in moves.get(origin, {}).items():
+            if target in distances or target in blocked or target not in neighbors:
+                continue
+            distances[target] = 1
+            first_moves[target] = direction
+            queue.append(target)
+        while queue:
+            point = queue.popleft()
+            next_distance = distances[point] + 1
+            first = first_moves[point]
+            for nbr in neighbors[point]:
+                if nbr in distances or nbr in blocked:
+                    continue
+                distances[nbr] = next_distance
+                first_moves[nbr] = first
+                queue.append(nbr)
+        self.distances = distances
+        self.first_moves = first_moves
+
+    def distance(self, point: Point) -> Optional[int]:
+        return self.distances.get(point)
+
+    def reachable(self, point: Point) -> bool:
+        return point in self.distances
+
+    def first_step(self, point: Point) -> Optional[str]:
+        """
+        Direction to move from the origin to get closer to `point`, None if unreachable.
+        """
+        return self.first_moves.get(point)
+
+    def nearest(self, targets: Iterable[Point]) -> Optional[int]:
+        """
+        Distance to the closest reachable target, None when none is reachable.
+        """
+        distances = self.distances
+        best: Optional[int] = None
+        for target in targets:
+            value = distances.get(target)
+            if value is not None and (best is None or value < best):
+                best = value
+        return best
+
+
+def distance_field(state: GameState, origin: Point) -> DistanceField:
+    """
+    The field from `origin` around every active body, cached on `state` until its bodies
+    move (the same lifetime as the occupancy index).
+    """
+    cache = state.derived()
+    field = cache.get(origin)
+    if field is None:
+        field = cache[origin] = DistanceField(origin, state.occupancy(), state.tables)
+    return field
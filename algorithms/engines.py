@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+from algorithms.alphabeta import alphabeta_deepening
+from algorithms.mcts import mcts_search
+from algorithms.search import SearchResult, iterative_deepening
+from algorithms.transposition import TranspositionTable
+from config import SEARCH_ENGINE
+from state import GameState
+
+ENGINES = ("beam", "paranoid", "maxn", "mcts")
+
+
+def search_moves(
+    state: GameState,
+    moves: Sequence[str],
+    weights,
+    deadline: Optional[float],
+    max_depth: int,
+    beam_width: int,
+    opp_topk: int,
+    table: Optional[TranspositionTable] = None,
+    engine: str = SEARCH_ENGINE,
+) -> SearchResult:
+    """
+    Runs the configured search engine; every engine returns the same SearchResult shape.
+    """
+    if engine == "beam":
+        return iterative_deepening(
+            state, moves, weights, deadline, max_depth, beam_width, opp_topk, table
+        )
+    if engine in ("paranoid", "maxn"):
+        return alphabeta_deepening(
+            state, moves, weights, deadline, max_depth, opp_topk, table, mode=engine
+        )
+    if engine == "mcts":
+        return mcts_search(state, moves, weights, deadline, max_depth, table)
+    raise ValueError(f"Unknown search engine {engine!r}; expected one of {ENGINES}")
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from board import manhattan
-from state import GameState
+from typing import Optional, Sequence
 
+from board import distance as grid_distance
+from state import GameState, Snake
 
-def h2h_term(state: GameState) -> float:
+
+def h2h_term(state: GameState, opponents: Optional[Sequence[Snake]] = None) -> float:
     """
     Lightweight head-to-head heuristic.
     - Returns -1 when an equal/longer opponent can challenge our head next turn.
@@ -13,8 +15,8 @@ def h2h_term(state: GameState) -> float:
     me = state.me
     losing = False
     winning = False
-    for opponent in state.opponents:
-        distance = manhattan(me.head, opponent.head)
+    for opponent in state.opponents if opponents is None else opponents:
+        distance = grid_distance(state, me.head, opponent.head)
         if distance != 1:
             continue
         if opponent.length >= me.length:
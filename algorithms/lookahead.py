@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import itertools
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from config import LOW_HEALTH
+from algorithms.deadline import check_deadline
+from algorithms.opponent_model import rank_opponent_moves
+from algorithms.transposition import TranspositionTable
 from evaluation import score_state
-from policy import legal_moves, legal_moves_for_snake
-from simulate import simulate_turn, hypothetical_after_move_for_snake
+from metrics import counters
+from policy import legal_moves
+from simulate import apply_moves, undo
 from state import GameState
+from zobrist import ensure_hash
 
 
 def beam_search(
@@ -17,19 +21,34 @@ def beam_search(
     beam_width: int,
     opp_topk: int,
     weights,
+    deadline: Optional[float] = None,
+    table: Optional[TranspositionTable] = None,
 ) -> float:
     """
     Evaluate a root move using a simple depth-limited beam search.
+    The tree is walked with make/unmake on `state`, which is restored before returning.
+    Raises SearchTimeout once `deadline` (a perf_counter timestamp) has passed.
+    When `table` is given, node values are shared across root moves and repeated positions.
     """
-    root_children = _expand_with_opponents(state, root_move, beam_width, opp_topk, weights)
+    if table is not None:
+        ensure_hash(state)
+    root_children = _expand_with_opponents(
+        state, root_move, beam_width, opp_topk, weights, deadline, table
+    )
     if not root_children:
         return score_state(state, weights) - 100.0
     if depth <= 0:
-        return _average([score_state(child, weights) for child in root_children])
+        return _average([score for score, _ in root_children])
 
     child_scores: List[float] = []
-    for child in root_children:
-        value = _max_future_score(child, depth - 1, beam_width, opp_topk, weights)
+    for _, move_map in root_children:
+        record = apply_moves(state, move_map)
+        try:
+            value = _max_future_score(
+                state, depth - 1, beam_width, opp_topk, weights, deadline, table
+            )
+        finally:
+            undo(state, record)
         child_scores.append(value)
     return _average(child_scores)
 
@@ -40,72 +59,95 @@ def _max_future_score(
     beam_width: int,
     opp_topk: int,
     weights,
+    deadline: Optional[float] = None,
+    table: Optional[TranspositionTable] = None,
 ) -> float:
     if depth <= 0:
-        return score_state(state, weights)
+        return leaf_score(state, weights, table)
+    if table is not None:
+        cached = table.probe(state.zobrist, depth)
+        if cached is not None:
+            return cached
 
     moves = legal_moves(state)
     if not moves:
-        return score_state(state, weights) - 100.0
+        return leaf_score(state, weights, table) - 100.0
 
     scored_moves: List[Tuple[str, float]] = []
     for move in moves:
-        children = _expand_with_opponents(state, move, beam_width, opp_topk, weights)
+        children = _expand_with_opponents(
+            state, move, beam_width, opp_topk, weights, deadline, table
+        )
         if not children:
-            scored_moves.append((move, score_state(state, weights) - 100.0))
+            scored_moves.append((move, leaf_score(state, weights, table) - 100.0))
             continue
-        child_scores = [
-            score_state(child, weights) if depth == 1 else _max_future_score(child, depth - 1, beam_width, opp_topk, weights)
-            for child in children
-        ]
+        if depth == 1:
+            child_scores = [score for score, _ in children]
+        else:
+            child_scores = []
+            for _, move_map in children:
+                record = apply_moves(state, move_map)
+                try:
+                    child_scores.append(
+                        _max_future_score(
+                            state, depth - 1, beam_width, opp_topk, weights, deadline, table
+                        )
+                    )
+                finally:
+                    undo(state, record)
         scored_moves.append((move, _average(child_scores)))
 
     scored_moves.sort(key=lambda item: item[1], reverse=True)
     trimmed = scored_moves[:beam_width]
+    if table is not None:
+        table.store(state.zobrist, depth, trimmed[0][1])
     return trimmed[0][1]
 
 
+def leaf_score(state: GameState, weights, table: Optional[TranspositionTable]) -> float:
+    """
+    score_state for a search leaf, memoised in `table` as a depth-0 entry when given.
+    """
+    if table is None:
+        return score_state(state, weights)
+    cached = table.probe(state.zobrist, 0)
+    if cached is not None:
+        return cached
+    value = score_state(state, weights)
+    table.store(state.zobrist, 0, value)
+    return value
+
+
 def _expand_with_opponents(
     state: GameState,
     my_move: str,
     beam_width: int,
     opp_topk: int,
     weights,
-) -> List[GameState]:
-    opponent_move_ranking = _rank_opponent_moves(state, opp_topk)
+    deadline: Optional[float] = None,
+    table: Optional[TranspositionTable] = None,
+) -> List[Tuple[float, Dict[str, str]]]:
+    """
+    Scores each opponent combination for `my_move` and returns the best
+    (score, move_map) pairs; children are applied and undone rather than copied.
+    """
+    check_deadline(deadline)
+    counters.nodes += 1
+    opponent_move_ranking = rank_opponent_moves(state, opp_topk)
     combos = _top_combinations(opponent_move_ranking, beam_width)
     if not combos:
         combos = [{}]
-    children: List[Tuple[float, GameState]] = []
+    children = []
     for combo in combos:
         move_map = {state.me_id: my_move}
         move_map.update(combo)
-        child_state = simulate_turn(state, move_map)
-        children.append((score_state(child_state, weights), child_state))
+        record = apply_moves(state, move_map)
+        try:
+            children.append((leaf_score(state, weights, table), move_map))
+        finally:
+            undo(state, record)
     children.sort(key=lambda item: item[0], reverse=True)
-    return [child for _, child in children[:beam_width]]
-
-
-def _rank_opponent_moves(state: GameState, opp_topk: int) -> Dict[str, List[Tuple[str, float]]]:
-    rankings: Dict[str, List[Tuple[str, float]]] = {}
-    for opponent in state.opponents:
-        moves = legal_moves_for_snake(state, opponent)
-        scored: List[Tuple[str, float]] = []
-        for move in moves:
-            hypo_state, _ = hypothetical_after_move_for_snake(state, opponent.id, move)
-            updated = hypo_state.snakes[opponent.id]
-            degree = len(legal_moves_for_snake(hypo_state, updated))
-            toward_food = 0.0
-            if opponent.health < LOW_HEALTH and hypo_state.food:
-                distances = [abs(updated.head[0] - fx) + abs(updated.head[1] - fy) for fx, fy in hypo_state.food]
-                if distances:
-                    toward_food = 1.0 / (min(distances) + 1.0)
-            area_hint = len(updated.body)
-            score = degree + toward_food + 0.1 * area_hint
-            scored.append((move, score))
-        scored.sort(key=lambda item: item[1], reverse=True)
-        rankings[opponent.id] = scored[: max(1, opp_topk)]
-    return rankings
+    return children[:beam_width]
 
 
 def _top_combinations(
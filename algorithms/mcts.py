@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.lookahead import leaf_score
+from algorithms.search import SearchResult
+from algorithms.transposition import TranspositionTable
+from board import is_body_collision, move_targets
+import config
+from metrics import counters
+from policy import legal_moves_for_snake
+from simulate import TurnUndo, apply_moves, undo
+from state import GameState, Snake
+from zobrist import ensure_hash
+
+# Score difference (in score_state units) that moves a rollout reward from 0.5 to ~0.73.
+REWARD_SCALE = 1.0
+
+
+class _Node:
+    """
+    One position in the tree. Each alive snake keeps its own visit/value statistics per
+    move (decoupled UCT), and children are keyed by the joint move that led to them.
+    """
+
+    __slots__ = ("order", "moves", "stats", "children", "visits")
+
+    def __init__(
+        self, state: GameState, rng: random.Random, root_moves: Optional[Sequence[str]] = None
+    ) -> None:
+        self.order: List[str] = []
+        self.moves: List[List[str]] = []
+        for snake in state.active_snakes:
+            if root_moves is not None and snake.id == state.me_id:
+                moves = list(root_moves)
+            else:
+                # Risky head-to-heads are still better than certain death.
+                moves = legal_moves_for_snake(state, snake) or _safe_moves(state, snake)
+            if not moves:
+                # No legal move: leaving the snake out of the joint move eliminates it.
+                continue
+            rng.shuffle(moves)
+            self.order.append(snake.id)
+            self.moves.append(moves)
+        # stats[i][move] = [visits, summed reward] for snake order[i].
+        self.stats: List[Dict[str, List[float]]] = [{} for _ in self.order]
+        self.children: Dict[Tuple[str, ...], _Node] = {}
+        self.visits = 0
+
+    def select(self, exploration: float) -> Tuple[str, ...]:
+        joint: List[str] = []
+        log_visits = math.log(self.visits) if self.visits else 0.0
+        for moves, stats in zip(self.moves, self.stats):
+            choice = None
+            best = -1.0
+            for move in moves:
+                entry = stats.get(move)
+                if entry is None:
+                    # Every move is tried once before UCT comparisons start.
+                    choice = move
+                    break
+                value = entry[1] / entry[0] + exploration * math.sqrt(log_visits / entry[0])
+                if value > best:
+                    best = value
+                    choice = move
+            joint.append(choice)
+        return tuple(joint)
+
+    def update(self, joint: Tuple[str, ...], rewards: Dict[str, float]) -> None:
+        self.visits += 1
+        for snake_id, move, stats in zip(self.order, joint, self.stats):
+            entry = stats.get(move)
+            if entry is None:
+                entry = stats[move] = [0.0, 0.0]
+            entry[0] += 1
+            entry[1] += rewards[snake_id]
+
+
+def mcts_search(
+    state: GameState,
+    moves: Sequence[str],
+    weights,
+    deadline: Optional[float],
+    max_depth: int,
+    table: Optional[TranspositionTable] = None,
+    iterations: Optional[int] = None,
+    rollout_depth: Optional[int] = None,
+    exploration: Optional[float] = None,
+) -> SearchResult:
+    """
+    Monte Carlo tree search over simultaneous rounds with decoupled UCT: every snake picks
+    its own move at each node from its own statistics, and the joint move selects the
+    child. New leaves are valued by a short random rollout followed by score_state, mapped
+    to a [0, 1] reward for us; opponents are rewarded with the complement (paranoid), and
+    elimination is 0 and sole survival 1 for everyone.
+    Runs until the deadline or `iterations`, but always visits each root move once, and
+    scores each root move by its visit count (plus its mean reward as a tie-break).
+    The tree is at most `max_depth + 1` rounds deep, matching beam_search's numbering.
+    `iterations`, `rollout_depth` and `exploration` default to the MCTS_* config knobs.
+    """
+    start = time.perf_counter()
+    if iterations is None:
+        iterations = config.MCTS_ITERATIONS
+    if rollout_depth is None:
+        rollout_depth = config.MCTS_ROLLOUT_DEPTH
+    if exploration is None:
+        exploration = config.MCTS_EXPLORATION
+    if table is None:
+        table = TranspositionTable(config.TT_BITS)
+    table.new_search()
+    ensure_hash(state)
+    rng = random.Random(state.zobrist)
+    search = _Search(state, weights, table, rng, max(0, max_depth) + 1, rollout_depth)
+    root = _Node(state, rng, moves)
+    result = SearchResult()
+    count = 0
+    while count < iterations and (
+        count < len(moves) or deadline is None or time.perf_counter() < deadline
+    ):
+        search.iterate(root, exploration)
+        count += 1
+    result.deadline_hit = count < iterations
+    me_index = root.order.index(state.me_id) if state.me_id in root.order else -1
+    if me_index >= 0:
+        stats = root.stats[me_index]
+        for move in moves:
+            visits, total = stats.get(move, (0.0, 0.0))
+            result.scores.append((move, visits + (total / visits if visits else 0.0)))
+    result.depth = search.deepest
+    result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+    result.table_stats = table.stats()
+    return result
+
+
+class _Search:
+    def __init__(
+        self,
+        state: GameState,
+        weights,
+        table: TranspositionTable,
+        rng: random.Random,
+        max_rounds: int,
+        rollout_depth: int,
+    ) -> None:
+        self.state = state
+        self.me_id = state.me_id
+        self.weights = weights
+        self.table = table
+        self.rng = rng
+        self.max_rounds = max_rounds
+        self.rollout_depth = rollout_depth
+        self.baseline = leaf_score(state, weights, table)
+        self.deepest = 0
+
+    def iterate(self, root: _Node, exploration: float) -> None:
+        """
+        One selection / expansion / rollout / backup pass; the state is restored on return.
+        """
+        state = self.state
+        path: List[Tuple[_Node, Tuple[str, ...]]] = []
+        records: List[TurnUndo] = []
+        node = root
+        try:
+            while True:
+                joint = node.select(exploration)
+                records.append(apply_moves(state, dict(zip(node.order, joint))))
+                path.append((node, joint))
+                if self._finished() or len(path) >= self.max_rounds:
+                    rewards = self._rewards()
+                    break
+                child = node.children.get(joint)
+                if child is None:
+                    counters.nodes += 1
+                    node.children[joint] = _Node(state, self.rng)
+                    rewards = self._rollout()
+                    break
+                node = child
+        finally:
+            for record in reversed(records):
+                undo(state, record)
+        self.deepest = max(self.deepest, len(path) - 1)
+        for visited, joint in path:
+            visited.update(joint, rewards)
+
+    def _rollout(self) -> Dict[str, float]:
+        state = self.state
+        rng = self.rng
+        records: List[TurnUndo] = []
+        try:
+            for _ in range(self.rollout_depth):
+                if self._finished():
+                    break
+                move_map: Dict[str, str] = {}
+                for snake in state.active_snakes:
+                    safe = _safe_moves(state, snake)
+                    if safe:
+                        move_map[snake.id] = rng.choice(safe)
+                records.append(apply_moves(state, move_map))
+            return self._rewards()
+        finally:
+            for record in reversed(records):
+                undo(state, record)
+
+    def _finished(self) -> bool:
+        state = self.state
+        return state.snakes[self.me_id].eliminated or not state.opponents
+
+    def _rewards(self) -> Dict[str, float]:
+        state = self.state
+        alive = state.active_snakes
+        if state.snakes[self.me_id].eliminated:
+            mine = 0.0
+        elif len(alive) == 1:
+            mine = 1.0
+        else:
+            value = leaf_score(state, self.weights, self.table) - self.baseline
+            mine = 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, value / REWARD_SCALE))))
+        rewards = {self.me_id: mine}
+        for snake_id, snake in state.snakes.items():
+            if snake_id != self.me_id:
+                rewards[snake_id] = 0.0 if snake.eliminated else 1.0 - mine
+        return rewards
+
+
+def _safe_moves(state: GameState, snake: Snake) -> List[str]:
+    """
+    Moves that avoid walls and bodies; head-to-head risk is left to chance, which keeps
+    rollouts much cheaper than legal_moves_for_snake.
+    """
+    return [
+        move
+        for move, target in move_targets(state, snake.head).items()
+        if not is_body_collision(state, target, snake, target in state.food)
+    ]
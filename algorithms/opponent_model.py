@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from board import move_targets
+import config
+from policy import legal_moves_for_snake
+from state import GameState, Occupant, Point, Snake
+
+
+def rank_opponent_moves(state: GameState, opp_topk: int) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    The `opp_topk` most plausible moves per opponent, scored by the safe moves left after
+    them, closeness to food when hungry and length. Every signal is read from the current
+    occupancy index as if only that opponent had moved, so no state is copied or mutated.
+    """
+    occupancy = state.occupancy()
+    rankings: Dict[str, List[Tuple[str, float]]] = {}
+    for opponent in state.opponents:
+        hungry = opponent.health < config.LOW_HEALTH
+        targets = move_targets(state, opponent.head)
+        scored: List[Tuple[str, float]] = []
+        for move in legal_moves_for_snake(state, opponent):
+            target = targets[move]
+            eats = target in state.food
+            degree = follow_up_degree(state, opponent, target, occupancy)
+            toward_food = 0.0
+            if hungry:
+                # Food eaten on this move is gone afterwards.
+                distances = [
+                    abs(target[0] - fx) + abs(target[1] - fy) for fx, fy in state.food if (fx, fy) != target
+                ]
+                if distances:
+                    toward_food = 1.0 / (min(distances) + 1.0)
+            length = opponent.length + (1 if eats else 0)
+            scored.append((move, degree + toward_food + 0.1 * length))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        rankings[opponent.id] = scored[: max(1, opp_topk)]
+    return rankings
+
+
+def follow_up_degree(
+    state: GameState,
+    snake: Snake,
+    target: Point,
+    occupancy: Optional[Dict[Point, Occupant]] = None,
+) -> int:
+    """
+    len(legal_moves_for_snake) for `snake` once it has moved to `target` with everyone
+    else standing still, i.e. what apply_snake_move + legal_moves_for_snake + undo returns.
+    """
+    if occupancy is None:
+        occupancy = state.occupancy()
+    eats = target in state.food
+    length = snake.length + (1 if eats else 0)
+    rivals = [opponent for opponent in state.opponents if opponent.id != snake.id]
+    count = 0
+    for point in move_targets(state, target).values():
+        if _collides_after(state, occupancy, snake, target, eats, snake, point):
+            continue
+        if any(
+            rival.length >= length
+            and any(
+                option == point
+                and not _collides_after(state, occupancy, snake, target, eats, rival, option)
+                for option in move_targets(state, rival.head).values()
+            )
+            for rival in rivals
+        ):
+            continue
+        count += 1
+    return count
+
+
+def _collides_after(
+    state: GameState,
+    occupancy: Dict[Point, Occupant],
+    mover: Snake,
+    target: Point,
+    eats: bool,
+    snake: Snake,
+    point: Point,
+) -> bool:
+    """
+    board.is_body_collision for `snake` entering `point`, evaluated on the position after
+    `mover` moved to `target`: the mover's head is on `target`, its tail has moved up
+    unless it ate, and the food on `target` is gone.
+    """
+    if not state.inside(point):
+        return True
+    if point == target:
+        return True
+    occupant = occupancy.get(point)
+    if occupant is None:
+        return False
+    owner, position, is_tail = occupant
+    if owner == mover.id:
+        tail = mover.length - 1
+        if not eats and position == tail:
+            return False
+        # The index reports the first segment on a cell, so a stacked tail is not a tail.
+        is_tail = position == (tail if eats else tail - 1)
+    if not (is_tail and owner == snake.id):
+        return True
+    return point in state.food
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.deadline import SearchTimeout
+from algorithms.lookahead import beam_search
+from algorithms.transposition import TranspositionTable
+import config
+from state import GameState
+
+
+@dataclass(slots=True)
+class SearchResult:
+    scores: List[Tuple[str, float]] = field(default_factory=list)
+    depth: int = -1
+    deadline_hit: bool = False
+    elapsed_ms: float = 0.0
+    table_stats: Dict[str, float] = field(default_factory=dict)
+
+
+def iterative_deepening(
+    state: GameState,
+    moves: Sequence[str],
+    weights,
+    deadline: Optional[float],
+    max_depth: int,
+    beam_width: int,
+    opp_topk: int,
+    table: Optional[TranspositionTable] = None,
+) -> SearchResult:
+    """
+    Scores every root move at depth 0, 1, 2, ... up to `max_depth` and keeps the
+    last iteration that finished for all moves. Depth 0 always runs to completion
+    so a full answer exists even when the deadline is already gone.
+    Iterations share one transposition table, so deeper passes reuse shallower values.
+    """
+    start = time.perf_counter()
+    if table is None:
+        table = TranspositionTable(config.TT_BITS)
+    table.new_search()
+    result = SearchResult()
+    for depth in range(0, max(0, max_depth) + 1):
+        iteration_deadline = None if depth == 0 else deadline
+        scores: List[Tuple[str, float]] = []
+        try:
+            for move in moves:
+                score = beam_search(
+                    state=state,
+                    root_move=move,
+                    depth=depth,
+                    beam_width=beam_width,
+                    opp_topk=opp_topk,
+                    weights=weights,
+                    deadline=iteration_deadline,
+                    table=table,
+                )
+                scores.append((move, score))
+        except SearchTimeout:
+            result.deadline_hit = True
+            break
+        result.scores = scores
+        result.depth = depth
+        if len(moves) <= 1:
+            break
+    result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+    result.table_stats = table.stats()
+    return result
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bitboard import dilate, flood_fill_mask, geometry, mask_from_points, point_bit
+from board import step
+from state import GameState, Point, Snake
+from tables import DELTAS
+
+
+class SpaceAnalysis:
+    """
+    Connected components of the free cells of a state, labelled with bitboard flood fills,
+    and on demand their articulation points ("chokes") from Tarjan's lowlink DFS. A free
+    cell is a choke when filling it splits its component; `pieces` records the sizes of
+    the parts it separates. Reachable areas from any head, before or after a move, are
+    then unions of component masks instead of fresh flood fills per move.
+    """
+
+    __slots__ = ("state", "tables", "geo", "occupied", "components", "sizes", "_pieces")
+
+    def __init__(self, state: GameState) -> None:
+        self.state = state
+        self.tables = state.tables
+        self.geo = geometry(state.width, state.height, state.wrapped)
+        self.occupied = state.occupancy()
+        self.components: List[int] = []
+        self.sizes: List[int] = []
+        self._pieces: Optional[Dict[Point, List[int]]] = None
+        free = self.geo.full & ~mask_from_points(self.occupied, state.width, state.height)
+        while free:
+            component = flood_fill_mask(free & -free, free, self.geo)
+            self.components.append(component)
+            self.sizes.append(component.bit_count())
+            free &= ~component
+
+    @property
+    def pieces(self) -> Dict[Point, List[int]]:
+        """
+        Choke -> sizes of the parts filling it separates, found on first use.
+        """
+        if self._pieces is None:
+            self._pieces = {}
+            width = self.state.width
+            for component, size in zip(self.components, self.sizes):
+                index = (component & -component).bit_length() - 1
+                self._cut_points((index % width, index // width), size)
+        return self._pieces
+
+    def _cut_points(self, root: Point, size: int) -> None:
+        """
+        Iterative Tarjan DFS over the component holding `root`, which has `size` cells.
+        """
+        neighbors = self.tables.neighbors
+        occupied = self.occupied
+        order: Dict[Point, int] = {root: 0}
+        low: Dict[Point, int] = {root: 0}
+        subtree: Dict[Point, int] = {root: 1}
+        cut: Dict[Point, List[int]] = {}
+        # [cell, parent, neighbour iterator]; the parent edge is skipped once so the
+        # duplicate neighbours of tiny wrapped boards still count as a second path.
+        stack: List[List] = [[root, None, iter(neighbors[root])]]
+        while stack:
+            frame = stack[-1]
+            cell = frame[0]
+            for nbr in frame[2]:
+                if nbr in occupied:
+                    continue
+                seen = order.get(nbr)
+                if seen is None:
+                    order[nbr] = low[nbr] = len(order)
+                    subtree[nbr] = 1
+                    stack.append([nbr, cell, iter(neighbors[nbr])])
+                    break
+                if nbr == frame[1]:
+                    frame[1] = None
+                elif seen < low[cell]:
+                    low[cell] = seen
+            else:
+                stack.pop()
+                if stack:
+                    above = stack[-1][0]
+                    subtree[above] += subtree[cell]
+                    if low[cell] < low[above]:
+                        low[above] = low[cell]
+                    if low[cell] >= order[above]:
+                        cut.setdefault(above, []).append(subtree[cell])
+        for cell, parts in cut.items():
+            if cell == root:
+                # The root only separates anything when it has several DFS children.
+                if len(parts) > 1:
+                    self._pieces[cell] = parts
+                continue
+            rest = size - 1 - sum(parts)
+            self._pieces[cell] = parts + [rest] if rest else parts
+
+    def component_size(self, point: Point) -> int:
+        if not self.state.inside(point):
+            return 0
+        bit = point_bit(point, self.state.width)
+        for component, size in zip(self.components, self.sizes):
+            if component & bit:
+                return size
+        return 0
+
+    def is_choke(self, point: Point) -> bool:
+        return point in self.pieces
+
+    def reach(self, start: Point, opened: Iterable[Point] = ()) -> int:
+        """
+        Tiles a flood fill from `start` would count (the start always counts) if `start`
+        and the occupied cells in `opened` were free.
+        """
+        state = self.state
+        if not state.inside(start):
+            return 1
+        geo = self.geo
+        region = point_bit(start, state.width)
+        extra = mask_from_points(
+            [point for point in opened if point in self.occupied], state.width, state.height
+        )
+        while True:
+            near = region | dilate(region, geo)
+            for component in self.components:
+                if component & near:
+                    region |= component
+            grown = dilate(region, geo) & extra
+            if not grown:
+                return region.bit_count()
+            region |= grown
+
+    def head_area(self, snake: Snake) -> Tuple[int, float]:
+        """
+        Reachable tiles from the snake's head where it stands and that count over the
+        empty tiles, as in flood_fill.area_from_state.
+        """
+        head = snake.head
+        reachable = self.reach(head)
+        blocked = len(self.occupied) - (1 if head in self.occupied else 0)
+        return reachable, reachable / max(1, self.tables.tiles - blocked)
+
+    def move_area(self, snake: Snake, move: str) -> Tuple[int, float]:
+        """
+        flood_fill.area_after_move for `snake`: its head moves to the target and its tail
+        is freed unless it eats there or the tail is stacked; everyone else stands still.
+        """
+        target = step(self.state, snake.head, move)
+        tail = snake.tail
+        freed = (
+            target not in self.state.food
+            and target != tail
+            and snake.body.counts.get(tail) == 1
+        )
+        reachable = self.reach(target, (tail,) if freed else ())
+        blocked = len(self.occupied) - (1 if target in self.occupied else 0) - (1 if freed else 0)
+        return reachable, reachable / max(1, self.tables.tiles - blocked)
+
+    def move_areas(self, snake: Snake) -> Dict[str, Tuple[int, float]]:
+        return {move: self.move_area(snake, move) for move in DELTAS}
+
+
+def space_analysis(state: GameState) -> SpaceAnalysis:
+    """
+    The analysis of `state`, cached until its bodies move.
+    """
+    cache = state.derived()
+    analysis = cache.get(SpaceAnalysis)
+    if analysis is None:
+        analysis = cache[SpaceAnalysis] = SpaceAnalysis(state)
+    return analysis
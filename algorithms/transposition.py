@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+# (key, depth, value, generation)
+Entry = Tuple[int, int, float, int]
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of depth-qualified position values indexed by Zobrist hash.
+    A slot is overwritten when it is empty, holds the same position, was written by an
+    older search, or holds a result searched no deeper than the new one.
+    """
+
+    __slots__ = ("_mask", "_entries", "generation", "probes", "hits", "stores", "collisions")
+
+    def __init__(self, size_bits: int = 16) -> None:
+        self._mask = (1 << size_bits) - 1
+        self._entries: List[Optional[Entry]] = [None] * (1 << size_bits)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def new_search(self) -> None:
+        """
+        Ages existing entries so the next search prefers replacing them.
+        """
+        self.generation += 1
+
+    def probe(self, key: int, depth: int) -> Optional[float]:
+        self.probes += 1
+        entry = self._entries[key & self._mask]
+        if entry is None or entry[0] != key or entry[1] < depth:
+            return None
+        self.hits += 1
+        return entry[2]
+
+    def store(self, key: int, depth: int, value: float) -> None:
+        index = key & self._mask
+        entry = self._entries[index]
+        if entry is not None:
+            if entry[0] == key:
+                if entry[1] > depth:
+                    return
+            elif entry[3] == self.generation and entry[1] > depth:
+                return
+            else:
+                self.collisions += 1
+        self._entries[index] = (key, depth, value, self.generation)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self._entries = [None] * len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.probes:
+            return 0.0
+        return self.hits / self.probes
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "stores": self.stores,
+            "collisions": self.collisions,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from algorithms.transposition import TranspositionTable
+from board import direction_between
+import config
+from simulate import apply_moves, undo
+from state import GameState
+from zobrist import ensure_hash
+
+
+@dataclass(slots=True)
+class GameMemory:
+    """
+    What one game's previous search left behind: its root position and the table holding
+    every node value it expanded. Table entries are keyed by position and remaining depth,
+    so when this turn's root is a child the last search already explored, its subtree
+    values are hits for the new search.
+    """
+
+    table: TranspositionTable = field(default_factory=lambda: TranspositionTable(config.TT_BITS))
+    last_root: Optional[GameState] = None
+    turns: int = 0
+    matched_turns: int = 0
+
+    def observe(self, state: GameState) -> bool:
+        """
+        Replays the moves each snake was seen to make from the last root and reports whether
+        the result is exactly `state` (no food spawned, nothing unexpected). On a mismatch
+        the old values can no longer be reached and the table is cleared.
+        """
+        self.turns += 1
+        matched = False
+        previous = self.last_root
+        if previous is not None and previous.turn + 1 == state.turn:
+            moves = observed_moves(previous, state)
+            if moves is not None:
+                ensure_hash(previous)
+                record = apply_moves(previous, moves)
+                matched = previous.zobrist == ensure_hash(state)
+                undo(previous, record)
+        if matched:
+            self.matched_turns += 1
+        else:
+            self.table.clear()
+        self.table.new_search()
+        return matched
+
+    def remember(self, state: GameState) -> None:
+        self.last_root = state
+
+
+def observed_moves(previous: GameState, current: GameState) -> Optional[Dict[str, str]]:
+    """
+    Direction each snake moved between two consecutive turns; snakes missing from
+    `current` get no entry (they were eliminated). None when a head jumped impossibly.
+    """
+    moves: Dict[str, str] = {}
+    for snake in previous.active_snakes:
+        now = current.snakes.get(snake.id)
+        if now is None or now.eliminated:
+            continue
+        direction = direction_between(previous, snake.head, now.head)
+        if direction is None:
+            return None
+        moves[snake.id] = direction
+    return moves
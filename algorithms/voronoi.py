@@ -1,34 +1,121 @@
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
-from board import manhattan
-from state import GameState
+from bitboard import dilate, geometry, point_bit, points_from_mask
+from state import GameState, Point
+
+
+@dataclass(slots=True)
+class VoronoiResult:
+    """
+    Territory from a simultaneous BFS out of every head. `regions` holds one bitboard per
+    snake (head excluded); cells reached by several snakes on the same step are `contested`.
+    """
+
+    width: int
+    height: int
+    snake_ids: List[str]
+    regions: List[int]
+    contested: int
+    free_tiles: int
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {sid: region.bit_count() for sid, region in zip(self.snake_ids, self.regions)}
+
+    def count(self, snake_id: str) -> int:
+        if snake_id not in self.snake_ids:
+            return 0
+        return self.regions[self.snake_ids.index(snake_id)].bit_count()
+
+    def owner_grid(self) -> List[int]:
+        """
+        Flat y * width + x grid of snake indices into `snake_ids`; -1 for unowned cells.
+        """
+        grid = [-1] * (self.width * self.height)
+        for index, region in enumerate(self.regions):
+            for x, y in points_from_mask(region, self.width):
+                grid[y * self.width + x] = index
+        return grid
+
+    def owner_of(self, point: Point) -> Optional[str]:
+        bit = point_bit(point, self.width)
+        for sid, region in zip(self.snake_ids, self.regions):
+            if region & bit:
+                return sid
+        return None
+
+
+def voronoi_regions(state: GameState, tail_timing: bool = False) -> VoronoiResult:
+    """
+    Multi-source BFS from all active heads at once, blocked by bodies. Each step dilates
+    every snake's frontier as one bitboard operation, so the whole board advances together.
+    With `tail_timing`, a segment becomes passable on the step its owner's tail leaves it.
+    """
+    geo = geometry(state.width, state.height, state.wrapped)
+    width = state.width
+    snakes = state.active_snakes
+    snake_ids = [snake.id for snake in snakes]
+
+    blocked = 0
+    vacate_at: Dict[Point, int] = {}
+    for snake in snakes:
+        length = snake.length
+        for index, segment in enumerate(snake.body):
+            if not state.inside(segment):
+                continue
+            blocked |= point_bit(segment, width)
+            turns = length - index
+            if turns > vacate_at.get(segment, 0):
+                vacate_at[segment] = turns
+    released: Dict[int, int] = {}
+    if tail_timing:
+        for segment, turns in vacate_at.items():
+            released[turns] = released.get(turns, 0) | point_bit(segment, width)
+    free = geo.full & ~blocked
+    free_tiles = free.bit_count()
+
+    frontiers = [point_bit(snake.head, width) if state.inside(snake.head) else 0 for snake in snakes]
+    claimed = 0
+    for frontier in frontiers:
+        claimed |= frontier
+    regions = [0] * len(snakes)
+    contested = 0
+    step = 0
+    while any(frontiers):
+        step += 1
+        if tail_timing:
+            free |= released.get(step, 0)
+        open_cells = free & ~claimed
+        seen = 0
+        duplicated = 0
+        grown = []
+        for frontier in frontiers:
+            reach = dilate(frontier, geo) & open_cells
+            duplicated |= seen & reach
+            seen |= reach
+            grown.append(reach)
+        for index, reach in enumerate(grown):
+            reach &= ~duplicated
+            frontiers[index] = reach
+            regions[index] |= reach
+        claimed |= seen
+        contested |= duplicated
+    return VoronoiResult(width, state.height, snake_ids, regions, contested, free_tiles)
 
 
 def voronoi_control(state: GameState) -> float:
     """
-    Approximate Voronoi control by counting cells where our head is closer than any opponent.
-    Uses Manhattan distance for speed; adequate for heuristic scoring.
+    Share of free cells our head reaches strictly before every opponent, walking around bodies.
     """
-    me = state.me
-    opponents = state.opponents
-    if not opponents:
+    if not state.opponents:
         return 1.0
-    total = 0
-    controlled = 0
-    occupied = {seg for snake in state.active_snakes for seg in snake.body}
-    for x in range(state.width):
-        for y in range(state.height):
-            cell = (x, y)
-            if cell in occupied:
-                continue
-            total += 1
-            my_dist = manhattan(me.head, cell)
-            opp_dist = min(manhattan(opp.head, cell) for opp in opponents)
-            if my_dist < opp_dist:
-                controlled += 1
-    if total == 0:
-        return 0.0
-    return controlled / total
+    return control_share(voronoi_regions(state), state.me_id)
 
+
+def control_share(result: VoronoiResult, snake_id: str) -> float:
+    if result.free_tiles == 0:
+        return 0.0
+    return result.count(snake_id) / result.free_tiles
@@ -0,0 +1,125 @@
+"""
+Big-int bitboards over a width x height board: bit y * width + x is cell (x, y).
+
+GameState stays the one state the search mutates; masks are derived from it per state
+(FeatureContext's occupancy and BFS rings, Voronoi regions, SpaceAnalysis components)
+rather than kept as a second board representation that make/unmake would have to update.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List
+
+from state import Point
+
+
+@dataclass(frozen=True, slots=True)
+class Geometry:
+    """
+    Precomputed masks for a width x height board. Bit index is y * width + x.
+    On wrapped boards `dilate` also carries edge cells across to the opposite edge.
+    """
+
+    width: int
+    height: int
+    full: int
+    not_first_col: int
+    not_last_col: int
+    wrapped: bool = False
+    first_col: int = 0
+    last_col: int = 0
+    last_row: int = 0
+
+
+@lru_cache(maxsize=None)
+def geometry(width: int, height: int, wrapped: bool = False) -> Geometry:
+    full = (1 << (width * height)) - 1
+    first_col = 0
+    last_col = 0
+    for y in range(height):
+        first_col |= 1 << (y * width)
+        last_col |= 1 << (y * width + width - 1)
+    last_row = ((1 << width) - 1) << (width * (height - 1))
+    return Geometry(
+        width,
+        height,
+        full,
+        full & ~first_col,
+        full & ~last_col,
+        wrapped,
+        first_col,
+        last_col,
+        last_row,
+    )
+
+
+def bit_index(point: Point, width: int) -> int:
+    return point[1] * width + point[0]
+
+
+def point_bit(point: Point, width: int) -> int:
+    return 1 << (point[1] * width + point[0])
+
+
+def mask_from_points(points: Iterable[Point], width: int, height: int) -> int:
+    mask = 0
+    for x, y in points:
+        if 0 <= x < width and 0 <= y < height:
+            mask |= 1 << (y * width + x)
+    return mask
+
+
+def points_from_mask(mask: int, width: int) -> List[Point]:
+    points: List[Point] = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        points.append((index % width, index // width))
+        mask ^= low
+    return points
+
+
+def dilate(mask: int, geo: Geometry) -> int:
+    """
+    Returns every cell orthogonally adjacent to a set bit in `mask` (excluding `mask` itself).
+    """
+    grown = (
+        ((mask << 1) & geo.not_first_col)
+        | ((mask >> 1) & geo.not_last_col)
+        | (mask << geo.width)
+        | (mask >> geo.width)
+    )
+    if geo.wrapped:
+        width = geo.width
+        grown |= (
+            ((mask & geo.last_col) >> (width - 1))
+            | ((mask & geo.first_col) << (width - 1))
+            | ((mask & geo.last_row) >> (width * (geo.height - 1)))
+            | ((mask & ((1 << width) - 1)) << (width * (geo.height - 1)))
+        )
+    return grown & geo.full & ~mask
+
+
+def flood_fill_mask(seed: int, free: int, geo: Geometry) -> int:
+    """
+    Expands `seed` through `free` cells by repeated shift-and-mask dilation.
+    The seed bits are always part of the result even when they are not free.
+    """
+    region = seed
+    frontier = seed
+    while frontier:
+        frontier = dilate(frontier, geo) & free & ~region
+        region |= frontier
+    return region
+
+
+def flood_fill_count(
+    start: Point, blocked: Iterable[Point], width: int, height: int, wrapped: bool = False
+) -> int:
+    x, y = start
+    if not (0 <= x < width and 0 <= y < height):
+        return 1
+    geo = geometry(width, height, wrapped)
+    free = geo.full & ~mask_from_points(blocked, width, height)
+    return flood_fill_mask(point_bit(start, width), free, geo).bit_count()
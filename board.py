@@ -1,15 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from state import GameState, Point, Snake
-
-DELTAS: Dict[str, Point] = {
-    "up": (0, 1),
-    "down": (0, -1),
-    "left": (-1, 0),
-    "right": (1, 0),
-}
+from tables import DELTAS, wrapped_distance
 
 
 def add_points(a: Point, b: Point) -> Point:
@@ -24,6 +18,15 @@ def manhattan(a: Point, b: Point) -> int:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
+def distance(state: GameState, a: Point, b: Point) -> int:
+    """
+    Grid distance under the board's topology: Manhattan, or the shorter way around when wrapped.
+    """
+    if state.wrapped:
+        return wrapped_distance(a, b, state.width, state.height)
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
 def direction_to_delta(direction: str) -> Point:
     return DELTAS[direction]
 
@@ -35,6 +38,30 @@ def delta_to_direction(delta: Point) -> str:
     raise ValueError(f"Unknown delta {delta}")
 
 
+def step(state: GameState, point: Point, direction: str) -> Point:
+    """
+    Cell reached by moving from `point`, following the board's topology (wrapping if enabled).
+    """
+    targets = state.tables.moves.get(point)
+    if targets is None:
+        return add_points(point, DELTAS[direction])
+    return targets[direction]
+
+
+def move_targets(state: GameState, point: Point) -> Dict[str, Point]:
+    targets = state.tables.moves.get(point)
+    if targets is None:
+        return {direction: add_points(point, delta) for direction, delta in DELTAS.items()}
+    return targets
+
+
+def direction_between(state: GameState, start: Point, end: Point) -> Optional[str]:
+    for direction, target in move_targets(state, start).items():
+        if target == end:
+            return direction
+    return None
+
+
 def within_bounds(state: GameState, point: Point) -> bool:
     return state.inside(point)
 
@@ -47,20 +74,19 @@ def is_body_collision(state: GameState, point: Point, snake: Snake, will_eat: bo
     if not state.inside(point):
         return True
 
-    for other in state.active_snakes:
-        for index, segment in enumerate(other.body):
-            if segment != point:
-                continue
-            tail_index = len(other.body) - 1
-            if other.id == snake.id and not will_eat and index == tail_index:
-                continue
-            return True
-    return False
+    occupant = state.occupancy().get(point)
+    if occupant is None:
+        return False
+    owner, _, is_tail = occupant
+    return not (is_tail and owner == snake.id and not will_eat)
 
 
 def board_center(state: GameState) -> Point:
-    return (state.width - 1) // 2, (state.height - 1) // 2
+    return state.tables.center
 
 
 def legal_neighbor_tiles(state: GameState, point: Point) -> List[Point]:
-    return [nbr for nbr in neighbors(point) if state.inside(nbr)]
+    adjacent = state.tables.neighbors.get(point)
+    if adjacent is None:
+        return [nbr for nbr in neighbors(point) if state.inside(nbr)]
+    return list(adjacent)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Point = Tuple[int, int]
+
+
+class Body:
+    """
+    Snake body as a ring buffer, head first: pushing a new head and popping the tail (and
+    the reverse, for undo) are O(1) whatever the length. `counts` tracks how many segments
+    sit on each cell, so membership and stacked-tail checks are O(1) as well.
+    Reads behave like the list it replaces: indexing, slicing, len, iteration, equality.
+    """
+
+    __slots__ = ("_cells", "_start", "_size", "counts", "head", "tail")
+
+    def __init__(self, points: Iterable[Point] = ()) -> None:
+        cells = list(points)
+        self._size = len(cells)
+        self._start = 0
+        # Room to grow before the first resize; eating adds one segment per food.
+        cells.extend([None] * max(8, len(cells)))
+        self._cells: List = cells
+        counts: Dict[Point, int] = dict.fromkeys(cells[: self._size], 1)
+        if len(counts) != self._size:
+            # Stacked segments (just ate, or the start of a game) need real counts.
+            counts = {}
+            for point in cells[: self._size]:
+                counts[point] = counts.get(point, 0) + 1
+        self.counts = counts
+        # The two ends are kept as plain attributes: they are read far more than written.
+        self.head: Optional[Point] = cells[0] if self._size else None
+        self.tail: Optional[Point] = cells[self._size - 1] if self._size else None
+
+    def push_head(self, point: Point) -> None:
+        if self._size == len(self._cells):
+            self._grow()
+        self._start = (self._start - 1) % len(self._cells)
+        self._cells[self._start] = point
+        if not self._size:
+            self.tail = point
+        self._size += 1
+        self.head = point
+        counts = self.counts
+        counts[point] = counts.get(point, 0) + 1
+
+    def pop_tail(self) -> Point:
+        cells = self._cells
+        self._size -= 1
+        index = (self._start + self._size) % len(cells)
+        point = cells[index]
+        cells[index] = None
+        self.tail = cells[(index - 1) % len(cells)] if self._size else None
+        if not self._size:
+            self.head = None
+        self._forget(point)
+        return point
+
+    def push_tail(self, point: Point) -> None:
+        if self._size == len(self._cells):
+            self._grow()
+        self._cells[(self._start + self._size) % len(self._cells)] = point
+        if not self._size:
+            self.head = point
+        self._size += 1
+        self.tail = point
+        counts = self.counts
+        counts[point] = counts.get(point, 0) + 1
+
+    def pop_head(self) -> Point:
+        cells = self._cells
+        point = cells[self._start]
+        cells[self._start] = None
+        self._start = (self._start + 1) % len(cells)
+        self._size -= 1
+        self.head = cells[self._start] if self._size else None
+        if not self._size:
+            self.tail = None
+        self._forget(point)
+        return point
+
+    def copy(self) -> "Body":
+        clone = Body.__new__(Body)
+        clone._cells = self._cells[:]
+        clone._start = self._start
+        clone._size = self._size
+        clone.counts = self.counts.copy()
+        clone.head = self.head
+        clone.tail = self.tail
+        return clone
+
+    def _forget(self, point: Point) -> None:
+        counts = self.counts
+        remaining = counts[point] - 1
+        if remaining:
+            counts[point] = remaining
+        else:
+            del counts[point]
+
+    def _grow(self) -> None:
+        cells = list(self)
+        cells.extend([None] * max(8, len(cells)))
+        self._cells = cells
+        self._start = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Point]:
+        cells = self._cells
+        start = self._start
+        end = start + self._size
+        if end <= len(cells):
+            return iter(cells[start:end])
+        return chain(cells[start:], cells[: end - len(cells)])
+
+    def __reversed__(self) -> Iterator[Point]:
+        return reversed(list(self))
+
+    def __contains__(self, point: object) -> bool:
+        return point in self.counts
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self)[index]
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("body index out of range")
+        cells = self._cells
+        return cells[(self._start + index) % len(cells)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Body, list, tuple)):
+            return len(other) == self._size and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return Body, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"Body({list(self)!r})"
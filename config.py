@@ -33,10 +33,24 @@ W_VORONOI = float(os.environ.get("W_VORONOI", 0.8))  # Bonus for territory contr
 TOPK_RANDOM = int(os.environ.get("TOPK_RANDOM", 2))  # Candidate count kept for tie randomisation.
 TIE_MARGIN = float(os.environ.get("TIE_MARGIN", 0.02))  # Normalised score gap treated as a tie.
 SEED = int(os.environ.get("SEED", 42))  # Base deterministic seed (mixed with game state).
-FALLBACK_MS = int(os.environ.get("FALLBACK_MS", 250))  # Time budget per move before falling back.
-LOOKAHEAD_DEPTH = int(os.environ.get("LOOKAHEAD_DEPTH", 2))  # Beam search ply depth (0-2 supported).
+FALLBACK_MS = int(os.environ.get("FALLBACK_MS", 250))  # Search deadline per move; deepest finished iteration wins.
+LOOKAHEAD_DEPTH = int(os.environ.get("LOOKAHEAD_DEPTH", 6))  # Deepest ply iterative deepening may attempt.
 BEAM_WIDTH = int(os.environ.get("BEAM_WIDTH", 3))  # States retained per layer of the beam.
 OPP_TOPK = int(os.environ.get("OPP_TOPK", 2))  # Opponent move options considered at each branch.
+TT_BITS = int(os.environ.get("TT_BITS", 16))  # Transposition table holds 2**TT_BITS positions.
+MAX_SESSIONS = int(os.environ.get("MAX_SESSIONS", 32))  # Live game sessions kept before LRU eviction.
+POOL_SIZE = int(os.environ.get("POOL_SIZE", 0))  # Worker processes for parallel root moves (0 = in-process).
+SEARCH_ENGINE = os.environ.get("SEARCH_ENGINE", "beam")  # "beam", "paranoid", "maxn" (alpha-beta) or "mcts".
+ALPHABETA_RADIUS = int(os.environ.get("ALPHABETA_RADIUS", 4))  # Opponents farther from our head play only their best move.
+MCTS_EXPLORATION = float(os.environ.get("MCTS_EXPLORATION", 0.7))  # UCT exploration constant (rewards are in [0, 1]).
+MCTS_ROLLOUT_DEPTH = int(os.environ.get("MCTS_ROLLOUT_DEPTH", 4))  # Random turns played out from each new tree node.
+MCTS_ITERATIONS = int(os.environ.get("MCTS_ITERATIONS", 20000))  # Iteration cap, also the budget when there is no deadline.
+METRICS_TERM_EVERY = int(os.environ.get("METRICS_TERM_EVERY", 64))  # Time evaluation terms on every Nth score_state (0 = never).
+JOURNAL_PATH = os.environ.get("JOURNAL_PATH", "")  # Binary decision journal file; "{pid}" expands per process, empty disables.
+JOURNAL_EVERY = int(os.environ.get("JOURNAL_EVERY", 1))  # Journal every Nth move.
+JOURNAL_SLOW_MS = float(os.environ.get("JOURNAL_SLOW_MS", 0))  # Always journal moves at least this slow (0 = off).
+JOURNAL_CAPACITY = int(os.environ.get("JOURNAL_CAPACITY", 4096))  # Unwritten entries kept before the oldest is dropped.
+JOURNAL_FLUSH_S = float(os.environ.get("JOURNAL_FLUSH_S", 1.0))  # Background flush interval in seconds.
 
 
 def get_weights() -> Weights:
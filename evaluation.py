@@ -1,69 +1,113 @@
 from __future__ import annotations
 
-from math import inf
-from typing import Tuple
+from typing import Callable, Dict, Optional, Tuple
 
-from algorithms.flood_fill import area_from_state
 from algorithms.h2h import h2h_term
-from algorithms.voronoi import voronoi_control
-from board import manhattan
-from config import LOW_HEALTH, Weights
-from policy import count_safe_moves
+from algorithms.voronoi import control_share
+from board import distance
+import config
+from config import Weights
+from features.context import FeatureContext
+from metrics import counters, term_timings
 from state import GameState
 
 
-def score_state(state: GameState, weights: Weights) -> float:
+def score_state(
+    state: GameState,
+    weights: Weights,
+    timings: Optional[Dict[str, float]] = None,
+) -> float:
     """
     Computes the heuristic score for a fully simulated game state.
+    Terms share one FeatureContext; pass `timings` to accumulate seconds per term.
+    Without `timings`, a sample of calls feeds the per-term timing metrics.
     """
-    me = state.me
-    area_count, area_norm = area_from_state(state)
-    low_hp = 1 if me.health < LOW_HEALTH else 0
-    inv_food = _inv_food_distance(state)
-    corridor_penalty = _corridor_penalty_from_state(state)
-    hazard_cost = 1.0 if me.head in state.hazards else 0.0
-    h2h_value = h2h_term(state)
-    longest = max((opp.length for opp in state.opponents), default=0)
-    if longest <= 0:
-        h2h_eff = h2h_value
-    else:
-        h2h_eff = h2h_value * min(1.0, me.length / (longest + 1e-9))
-    to_center = -float(manhattan(me.head, ((state.width - 1) // 2, (state.height - 1) // 2)))
-    safe_degree = float(count_safe_moves(state, me))
-    longer_term = _longer_proximity_term(state)
-    stability = _area_stability(state, area_count)
-    voronoi = voronoi_control(state)
-
-    score = (
-        weights.area * area_norm
-        + weights.food * low_hp * inv_food
-        + weights.corridor * (-corridor_penalty)
-        + weights.hazard * (-hazard_cost)
-        + weights.h2h * h2h_eff
-        + weights.center * to_center
-        + weights.degree * safe_degree
-        + weights.longer * longer_term
-        + weights.stability * stability
-        + weights.voronoi * voronoi
-    )
+    counters.evaluations += 1
+    ctx = FeatureContext(state, term_timings() if timings is None else timings)
+    score = 0.0
+    for name, term in TERMS:
+        score += getattr(weights, name) * ctx.timed(name, term)
     return score
 
 
-def _inv_food_distance(state: GameState) -> float:
-    me = state.me
-    if not state.food:
+def _area_term(ctx: FeatureContext) -> float:
+    return ctx.area[1]
+
+
+def _food_term(ctx: FeatureContext) -> float:
+    if ctx.me.health >= config.LOW_HEALTH:
+        return 0.0
+    return _inv_food_distance(ctx)
+
+
+def _corridor_term(ctx: FeatureContext) -> float:
+    return -float(_corridor_penalty(ctx.safe_moves))
+
+
+def _hazard_term(ctx: FeatureContext) -> float:
+    return -1.0 if ctx.me.head in ctx.state.hazards else 0.0
+
+
+def _h2h_term(ctx: FeatureContext) -> float:
+    me = ctx.me
+    h2h_value = h2h_term(ctx.state, ctx.opponents)
+    longest = max((opp.length for opp in ctx.opponents), default=0)
+    if longest <= 0:
+        return h2h_value
+    return h2h_value * min(1.0, me.length / (longest + 1e-9))
+
+
+def _center_term(ctx: FeatureContext) -> float:
+    return -float(ctx.center_distance)
+
+
+def _degree_term(ctx: FeatureContext) -> float:
+    return float(ctx.safe_moves)
+
+
+def _longer_term(ctx: FeatureContext) -> float:
+    me = ctx.me
+    longer = [opp for opp in ctx.opponents if opp.length >= me.length]
+    if not longer:
         return 0.0
-    min_dist = inf
-    for food in state.food:
-        dist = manhattan(me.head, food)
-        min_dist = min(min_dist, dist)
-    if min_dist == inf:
+    dist = min(distance(ctx.state, me.head, opp.head) for opp in longer)
+    return -1.0 / (dist + 1.0)
+
+
+def _stability_term(ctx: FeatureContext) -> float:
+    return _area_stability(ctx.state, ctx.area[0])
+
+
+def _voronoi_term(ctx: FeatureContext) -> float:
+    if not ctx.opponents:
+        return 1.0
+    return control_share(ctx.voronoi, ctx.state.me_id)
+
+
+# Evaluated in this order; each name is also the Weights field that scales the term.
+TERMS: Tuple[Tuple[str, Callable[[FeatureContext], float]], ...] = (
+    ("area", _area_term),
+    ("food", _food_term),
+    ("corridor", _corridor_term),
+    ("hazard", _hazard_term),
+    ("h2h", _h2h_term),
+    ("center", _center_term),
+    ("degree", _degree_term),
+    ("longer", _longer_term),
+    ("stability", _stability_term),
+    ("voronoi", _voronoi_term),
+)
+
+
+def _inv_food_distance(ctx: FeatureContext) -> float:
+    # Path distance around bodies, read off the BFS rings the area term already built.
+    nearest = ctx.nearest_distance(ctx.state.food)
+    if nearest is None:
         return 0.0
-    return 1.0 / (min_dist + 1.0)
+    return 1.0 / (nearest + 1.0)
 
 
-def _corridor_penalty_from_state(state: GameState) -> int:
-    degree = count_safe_moves(state, state.me)
+def _corridor_penalty(degree: int) -> int:
     if degree <= 1:
         return 2
     if degree == 2:
@@ -71,15 +115,7 @@ def _corridor_penalty_from_state(state: GameState) -> int:
     return 0
 
 
-def _longer_proximity_term(state: GameState) -> float:
-    longer = [opp for opp in state.opponents if opp.length >= state.me.length]
-    if not longer:
-        return 0.0
-    dist = min(manhattan(state.me.head, opp.head) for opp in longer)
-    return -1.0 / (dist + 1.0)
-
-
 def _area_stability(state: GameState, area_now: int) -> float:
     # Without historical context we approximate stability via relative area.
-    max_area = state.width * state.height
+    max_area = state.tables.tiles
     return area_now / max(1, max_area)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from algorithms.voronoi import VoronoiResult, voronoi_regions
+from bitboard import dilate, geometry, mask_from_points, point_bit
+from policy import count_safe_moves
+from state import GameState, Point, Snake
+
+
+class FeatureContext:
+    """
+    Per-state cache of the intermediates evaluation terms share: active snakes, the
+    occupancy bitboard, our safe-move count, BFS distance layers from our head (which
+    also give the flood-fill area) and Voronoi regions. Each is computed on first use.
+    When `timings` is given, `timed` accumulates seconds per term name into it.
+    """
+
+    __slots__ = (
+        "state",
+        "me",
+        "timings",
+        "_active",
+        "_opponents",
+        "_occupied",
+        "_safe_moves",
+        "_layers",
+        "_voronoi",
+    )
+
+    def __init__(self, state: GameState, timings: Optional[Dict[str, float]] = None) -> None:
+        self.state = state
+        self.me = state.me
+        self.timings = timings
+        self._active: Optional[List[Snake]] = None
+        self._opponents: Optional[List[Snake]] = None
+        self._occupied: Optional[int] = None
+        self._safe_moves: Optional[int] = None
+        self._layers: Optional[List[int]] = None
+        self._voronoi: Optional[VoronoiResult] = None
+
+    def timed(self, name: str, fn: Callable[["FeatureContext"], float]) -> float:
+        if self.timings is None:
+            return fn(self)
+        start = time.perf_counter()
+        value = fn(self)
+        self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start)
+        return value
+
+    @property
+    def active_snakes(self) -> List[Snake]:
+        if self._active is None:
+            self._active = self.state.active_snakes
+        return self._active
+
+    @property
+    def opponents(self) -> List[Snake]:
+        if self._opponents is None:
+            me_id = self.state.me_id
+            self._opponents = [snake for snake in self.active_snakes if snake.id != me_id]
+        return self._opponents
+
+    @property
+    def occupied(self) -> int:
+        """
+        Bitboard of every active body segment.
+        """
+        if self._occupied is None:
+            state = self.state
+            mask = 0
+            for snake in self.active_snakes:
+                mask |= mask_from_points(snake.body, state.width, state.height)
+            self._occupied = mask
+        return self._occupied
+
+    @property
+    def safe_moves(self) -> int:
+        if self._safe_moves is None:
+            self._safe_moves = count_safe_moves(self.state, self.me)
+        return self._safe_moves
+
+    @property
+    def distance_layers(self) -> List[int]:
+        """
+        BFS rings from our head through free cells: layers[d] holds the cells at distance d.
+        """
+        if self._layers is None:
+            state = self.state
+            geo = geometry(state.width, state.height, state.wrapped)
+            layers: List[int] = []
+            if state.inside(self.me.head):
+                start = point_bit(self.me.head, state.width)
+                free = geo.full & ~self.occupied & ~start
+                seen = start
+                frontier = start
+                while frontier:
+                    layers.append(frontier)
+                    frontier = dilate(frontier, geo) & free & ~seen
+                    seen |= frontier
+            self._layers = layers
+        return self._layers
+
+    def distance_to(self, point: Point) -> Optional[int]:
+        if not self.state.inside(point):
+            return None
+        bit = point_bit(point, self.state.width)
+        for distance, layer in enumerate(self.distance_layers):
+            if layer & bit:
+                return distance
+        return None
+
+    def nearest_distance(self, points: Iterable[Point]) -> Optional[int]:
+        """
+        BFS distance from our head to the closest of `points`, None if none is reachable.
+        """
+        state = self.state
+        targets = mask_from_points(points, state.width, state.height)
+        for distance, layer in enumerate(self.distance_layers):
+            if layer & targets:
+                return distance
+        return None
+
+    @property
+    def area(self) -> Tuple[int, float]:
+        """
+        Reachable tiles from our head and that count over the empty tiles, as in area_from_state.
+        """
+        state = self.state
+        reachable = max(1, sum(layer.bit_count() for layer in self.distance_layers))
+        blocked = self.occupied
+        if state.inside(self.me.head):
+            blocked &= ~point_bit(self.me.head, state.width)
+        total_empty = max(1, state.tables.tiles - blocked.bit_count())
+        return reachable, reachable / total_empty
+
+    @property
+    def voronoi(self) -> VoronoiResult:
+        if self._voronoi is None:
+            self._voronoi = voronoi_regions(self.state)
+        return self._voronoi
+
+    @property
+    def center(self) -> Point:
+        return self.state.tables.center
+
+    @property
+    def center_distance(self) -> int:
+        head = self.me.head
+        distance = self.state.tables.center_distance.get(head)
+        if distance is None:
+            center = self.center
+            distance = abs(head[0] - center[0]) + abs(head[1] - center[1])
+        return distance
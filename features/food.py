@@ -2,49 +2,47 @@ from __future__ import annotations
 
 from typing import Iterable, Set
 
-from algorithms.astar import shortest_path_length
-from board import manhattan
+from algorithms.distance_field import distance_field
+import config
 from simulate import hypothetical_after_move
 from state import GameState, Point
-from config import LOW_HEALTH
 
 
 def food_feature(state: GameState, move: str) -> tuple[int, float]:
     hypo_state, _ = hypothetical_after_move(state, move)
     me = hypo_state.me
-    low_hp = 1 if me.health < LOW_HEALTH else 0
+    low_hp = 1 if me.health < config.LOW_HEALTH else 0
 
     candidate_food = _filter_contested_food(hypo_state, hypo_state.food, me.length)
     if not candidate_food:
         return low_hp, 0.0
 
-    blocked: Set[Point] = set()
-    for snake in hypo_state.active_snakes:
-        blocked.update(snake.body)
-    blocked.discard(me.head)
-
-    distance = shortest_path_length(
-        start=me.head,
-        goals=candidate_food,
-        blocked=blocked,
-        width=hypo_state.width,
-        height=hypo_state.height,
-    )
-    if distance is None:
+    path_length = distance_field(hypo_state, me.head).nearest(candidate_food)
+    if path_length is None:
         return low_hp, 0.0
-    return low_hp, 1.0 / (distance + 1.0)
+    return low_hp, 1.0 / (path_length + 1.0)
 
 
 def _filter_contested_food(state: GameState, food: Iterable[Point], my_length: int) -> Set[Point]:
+    """
+    Food we can reach strictly before every opponent at least as long as us, measured
+    around bodies with one cached distance field per head.
+    """
+    mine = distance_field(state, state.me.head)
+    rivals = [
+        distance_field(state, opponent.head)
+        for opponent in state.opponents
+        if opponent.length >= my_length
+    ]
     candidates: Set[Point] = set()
     for pellet in food:
-        contested = False
-        for opponent in state.opponents:
-            if opponent.length >= my_length:
-                if manhattan(opponent.head, pellet) <= manhattan(state.me.head, pellet):
-                    contested = True
-                    break
-        if not contested:
-            candidates.add(pellet)
+        ours = mine.distance(pellet)
+        if ours is None:
+            continue
+        if any(
+            theirs is not None and theirs <= ours
+            for theirs in (rival.distance(pellet) for rival in rivals)
+        ):
+            continue
+        candidates.add(pellet)
     return candidates
-
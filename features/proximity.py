@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from board import manhattan
+from board import distance
 from simulate import hypothetical_after_move
 from state import GameState
 
@@ -11,6 +11,6 @@ def proximity_to_longer(state: GameState, move: str) -> float:
     longer = [opp for opp in hypo_state.opponents if opp.length >= me.length]
     if not longer:
         return 0.0
-    dist = min(manhattan(me.head, opp.head) for opp in longer)
+    dist = min(distance(hypo_state, me.head, opp.head) for opp in longer)
     return -1.0 / (dist + 1.0)
 
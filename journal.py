@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import JOURNAL_CAPACITY, JOURNAL_EVERY, JOURNAL_FLUSH_S, JOURNAL_PATH, JOURNAL_SLOW_MS
+
+MAGIC = b"BSJ1"
+MOVES = ("up", "down", "left", "right")
+# Record: u32 body length, then the body.
+_LENGTH = struct.Struct("<I")
+# Body header: unix time, elapsed ms, depth, flags, chosen move, TT hit rate,
+# nodes, simulated turns, evaluations, number of scored moves.
+_HEADER = struct.Struct("<dfhBBfIIIB")
+_SCORE = struct.Struct("<Bd")
+_FLAG_DEADLINE = 1
+
+# Pending entry: (time, request, move, scores, elapsed_ms, depth, deadline_hit, stats).
+Entry = Tuple[float, Dict, str, Sequence[Tuple[str, float]], float, int, bool, Tuple[float, int, int, int]]
+
+
+class Journal:
+    """
+    Decision journal: `record` only appends the live objects to a bounded in-memory ring,
+    and a background thread encodes them (zlib-compressed request JSON plus a fixed binary
+    header) and appends length-prefixed records to `path`. When the ring is full the oldest
+    unwritten entry is dropped and counted rather than blocking the move.
+    Every `every`-th move is kept, plus any move slower than `slow_ms` (0 disables).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = JOURNAL_CAPACITY,
+        every: int = JOURNAL_EVERY,
+        slow_ms: float = JOURNAL_SLOW_MS,
+        flush_s: float = JOURNAL_FLUSH_S,
+    ) -> None:
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.every = max(1, every)
+        self.slow_ms = slow_ms
+        self.flush_s = flush_s
+        self.dropped = 0
+        self.written = 0
+        self._ring: Deque[Entry] = deque(maxlen=max(1, capacity))
+        self._sequence = itertools.count()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="journal-flush", daemon=True)
+        self._thread.start()
+
+    def record(
+        self,
+        request: Dict,
+        move: str,
+        scores: Sequence[Tuple[str, float]],
+        elapsed_ms: float,
+        depth: int,
+        deadline_hit: bool,
+        stats: Tuple[float, int, int, int] = (0.0, 0, 0, 0),
+    ) -> bool:
+        """
+        Queues one decision if sampling keeps it; `stats` is (TT hit rate, nodes, simulated
+        turns, evaluations). The request dict must not be mutated afterwards.
+        """
+        sampled = next(self._sequence) % self.every == 0
+        if not sampled and not (self.slow_ms and elapsed_ms >= self.slow_ms):
+            return False
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self.dropped += 1
+        ring.append((time.time(), request, move, scores, elapsed_ms, depth, deadline_hit, stats))
+        return True
+
+    def flush(self) -> None:
+        """
+        Encodes and writes everything queued so far (also called by the background thread).
+        """
+        with self._write_lock:
+            chunks: List[bytes] = []
+            ring = self._ring
+            while True:
+                try:
+                    entry = ring.popleft()
+                except IndexError:
+                    break
+                chunks.append(encode(*entry))
+            if not chunks:
+                return
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "ab") as handle:
+                if new_file:
+                    handle.write(MAGIC)
+                handle.write(b"".join(chunks))
+            self.written += len(chunks)
+
+    def close(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                # Never let a full disk take the engine down; entries stay counted as dropped.
+                self.dropped += len(self._ring)
+                self._ring.clear()
+
+
+def encode(
+    timestamp: float,
+    request: Dict,
+    move: str,
+    scores: Sequence[Tuple[str, float]],
+    elapsed_ms: float,
+    depth: int,
+    deadline_hit: bool,
+    stats: Tuple[float, int, int, int],
+) -> bytes:
+    hit_rate, nodes, simulated, evaluations = stats
+    body = [
+        _HEADER.pack(
+            timestamp,
+            elapsed_ms,
+            depth,
+            _FLAG_DEADLINE if deadline_hit else 0,
+            _move_code(move),
+            hit_rate,
+            min(nodes, 0xFFFFFFFF),
+            min(simulated, 0xFFFFFFFF),
+            min(evaluations, 0xFFFFFFFF),
+            len(scores),
+        )
+    ]
+    body.extend(_SCORE.pack(_move_code(name), score) for name, score in scores)
+    body.append(zlib.compress(json.dumps(request, separators=(",", ":")).encode("utf-8"), 1))
+    payload = b"".join(body)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def read_journal(path: str) -> Iterator[Dict]:
+    """
+    Decodes a journal file record by record; a truncated final record is ignored.
+    """
+    with open(path, "rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a decision journal")
+        while True:
+            prefix = handle.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = handle.read(length)
+            if len(payload) < length:
+                return
+            yield decode(payload)
+
+
+def decode(payload: bytes) -> Dict:
+    (
+        timestamp,
+        elapsed_ms,
+        depth,
+        flags,
+        move,
+        hit_rate,
+        nodes,
+        simulated,
+        evaluations,
+        count,
+    ) = _HEADER.unpack_from(payload)
+    offset = _HEADER.size
+    scores = []
+    for _ in range(count):
+        code, score = _SCORE.unpack_from(payload, offset)
+        scores.append((_move_name(code), score))
+        offset += _SCORE.size
+    return {
+        "time": timestamp,
+        "elapsed_ms": elapsed_ms,
+        "depth": depth,
+        "deadline_hit": bool(flags & _FLAG_DEADLINE),
+        "move": _move_name(move),
+        "tt_hit_rate": hit_rate,
+        "nodes": nodes,
+        "simulated": simulated,
+        "evaluations": evaluations,
+        "scores": scores,
+        "request": json.loads(zlib.decompress(payload[offset:])),
+    }
+
+
+def _move_code(move: str) -> int:
+    return MOVES.index(move) if move in MOVES else 255
+
+
+def _move_name(code: int) -> str:
+    return MOVES[code] if code < len(MOVES) else "?"
+
+
+_journal: Optional[Journal] = None
+_journal_pid = 0
+
+
+def journal() -> Optional[Journal]:
+    """
+    The process's journal when JOURNAL_PATH is set. Each forked worker starts its own on
+    first use, since the flush thread does not survive a fork; put `{pid}` in the path to
+    give each worker its own file.
+    """
+    global _journal, _journal_pid
+    if not JOURNAL_PATH:
+        return None
+    if _journal is None or _journal_pid != os.getpid():
+        _journal = Journal(JOURNAL_PATH)
+        _journal_pid = os.getpid()
+        atexit.register(_journal.close)
+    return _journal
@@ -1,19 +1,29 @@
+import atexit
 import logging
+import os
+import threading
 import time
 import typing
 
-from algorithms.lookahead import beam_search
+from algorithms.deadline import deadline_after
+from algorithms.engines import search_moves
+from algorithms.search import SearchResult
+import metrics
+from journal import journal
 from config import (
     BEAM_WIDTH,
     FALLBACK_MS,
     LOOKAHEAD_DEPTH,
     OPP_TOPK,
+    POOL_SIZE,
+    SEARCH_ENGINE,
     TOPK_RANDOM,
     TIE_MARGIN,
     get_weights,
 )
+from parallel import RootPool
 from policy import legal_moves, select_with_topk_random
-from state import GameState
+from session import SessionStore
 
 
 logger = logging.getLogger("battlesnake")
@@ -21,6 +31,25 @@ if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
+_root_pool: typing.Optional[RootPool] = None
+_root_pool_lock = threading.Lock()
+# Per-game board tables and search memory; bounded by MAX_SESSIONS.
+sessions = SessionStore()
+
+
+def root_pool() -> typing.Optional[RootPool]:
+    """
+    Returns the shared worker pool when POOL_SIZE > 0, forking it on first use.
+    """
+    global _root_pool
+    if POOL_SIZE > 0 and _root_pool is None:
+        with _root_pool_lock:
+            if _root_pool is None:
+                _root_pool = RootPool(POOL_SIZE)
+                atexit.register(_root_pool.close)
+    return _root_pool
+
+
 def info() -> typing.Dict:
     print("INFO")
     return {
@@ -32,60 +61,126 @@ def info() -> typing.Dict:
     }
 
 
+def _game_id(game_state: typing.Dict) -> str:
+    return game_state.get("game", {}).get("id", "")
+
+
 def start(game_state: typing.Dict):
     print("GAME START")
+    sessions.start(game_state)
 
 
 def end(game_state: typing.Dict):
     print("GAME OVER\n")
+    sessions.end(_game_id(game_state))
 
 
 def move(game_state: typing.Dict) -> typing.Dict:
-    state = GameState.from_json(game_state)
-
-    players_snapshot = [
-        {
-            "id": snake.id,
-            "health": snake.health,
-            "length": snake.length,
-            "head": snake.head,
-            "body": list(snake.body),
-            "eliminated": snake.eliminated,
-        }
-        for snake in state.active_snakes
-    ]
-    logger.info("Turn %s state: %s", state.turn, players_snapshot)
+    return decide(game_state)[0]
+
+
+WARM_UP_GAME = "warm-up"
+
+
+def warm_up() -> None:
+    """
+    Decides one synthetic move so imports, caches and any search pool exist before
+    traffic. It skips the /metrics histograms and the decision journal, and its session
+    is dropped afterwards.
+    """
+    body = [{"x": 5, "y": 5}, {"x": 5, "y": 4}, {"x": 5, "y": 3}]
+    snake = {"id": "warm-up", "name": "warm-up", "health": 100, "body": body}
+    other = {"id": "warm-up-2", "name": "warm-up-2", "health": 100, "body": [{"x": 1, "y": 1}]}
+    payload = {
+        "game": {"id": WARM_UP_GAME},
+        "turn": 0,
+        "board": {"width": 11, "height": 11, "food": [], "hazards": [], "snakes": [snake, other]},
+        "you": snake,
+    }
+    metrics.begin_move()
+    try:
+        _decide(payload)
+    finally:
+        metrics.begin_move()
+        sessions.end(WARM_UP_GAME)
+
+
+def decide(game_state: typing.Dict) -> typing.Tuple[typing.Dict, typing.Optional[SearchResult]]:
+    """
+    The /move response together with the search result behind it (None when no search ran).
+    Per-move search counters are published to the /metrics histograms and, when
+    JOURNAL_PATH is set, the request and decision go to the binary decision journal.
+    """
+    started = time.perf_counter()
+    metrics.begin_move()
+    response, result = _decide(game_state)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    depth = result.depth if result is not None else -1
+    deadline_hit = result is not None and result.deadline_hit
+    metrics.finish_move(elapsed_ms, depth if result is not None else None, deadline_hit)
+    decisions = journal()
+    if decisions is not None:
+        counters = metrics.counters
+        decisions.record(
+            game_state,
+            response["move"],
+            result.scores if result is not None else (),
+            elapsed_ms,
+            depth,
+            deadline_hit,
+            (
+                result.table_stats.get("hit_rate", 0.0) if result is not None else 0.0,
+                counters.nodes,
+                counters.simulated,
+                counters.evaluations,
+            ),
+        )
+    return response, result
+
+
+def _decide(game_state: typing.Dict) -> typing.Tuple[typing.Dict, typing.Optional[SearchResult]]:
+    session = sessions.get(game_state)
+    state = session.decode(game_state)
 
     weights = get_weights()
     moves = legal_moves(state)
     if not moves:
         logger.warning("No legal moves available; defaulting to 'up'.")
-        return {"move": "up"}
+        return {"move": "up"}, None
 
     start_time = time.perf_counter()
-    scored_moves = []
-    for direction in moves:
-        score = beam_search(
-            state=state,
-            root_move=direction,
-            depth=max(0, LOOKAHEAD_DEPTH),
-            beam_width=max(1, BEAM_WIDTH),
-            opp_topk=max(1, OPP_TOPK),
-            weights=weights,
+    search_args = dict(
+        state=state,
+        moves=moves,
+        weights=weights,
+        deadline=deadline_after(FALLBACK_MS, start_time),
+        max_depth=max(0, LOOKAHEAD_DEPTH),
+        beam_width=max(1, BEAM_WIDTH),
+        opp_topk=max(1, OPP_TOPK),
+    )
+    # The root pool parallelises the beam engine only.
+    pool = root_pool() if SEARCH_ENGINE == "beam" else None
+    if pool is not None:
+        result = pool.search(**search_args)
+    else:
+        memory = session.memory
+        if memory.observe(state):
+            logger.debug("Turn %s reuses the previous search tree.", state.turn)
+        result = search_moves(table=memory.table, engine=SEARCH_ENGINE, **search_args)
+        memory.remember(state)
+    if result.deadline_hit:
+        logger.debug(
+            "Search hit the %s ms deadline after %.2f ms; using depth %s (tt hit rate %.2f).",
+            FALLBACK_MS,
+            result.elapsed_ms,
+            result.depth,
+            result.table_stats.get("hit_rate", 0.0),
         )
-        scored_moves.append((direction, score))
-        elapsed_ms = (time.perf_counter() - start_time) * 1000.0
-        if elapsed_ms > FALLBACK_MS:
-            logger.warning(
-                "Beam search exceeded fallback budget (%.2f ms > %s ms); stopping early.",
-                elapsed_ms,
-                FALLBACK_MS,
-            )
-            break
+    scored_moves = result.scores
 
     if not scored_moves:
         logger.warning("No scored moves after evaluation; falling back to first legal move.")
-        return {"move": moves[0]}
+        return {"move": moves[0]}, result
 
     seed = int(state.rng.random() * 1_000_000)
     chosen_move, chosen_score = select_with_topk_random(
@@ -94,18 +189,32 @@ def move(game_state: typing.Dict) -> typing.Dict:
         margin=TIE_MARGIN,
         seed=seed,
     )
-    ranked_moves = sorted(scored_moves, key=lambda item: item[1], reverse=True)
-    logger.info(
-        "Turn %s decision: move %s (score %.3f); candidates=%s",
-        state.turn,
-        chosen_move,
-        chosen_score,
-        ranked_moves,
-    )
-    return {"move": chosen_move}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Turn %s decision: move %s (score %.3f); candidates=%s",
+            state.turn,
+            chosen_move,
+            chosen_score,
+            sorted(scored_moves, key=lambda item: item[1], reverse=True),
+        )
+    return {"move": chosen_move}, result
 
 
 if __name__ == "__main__":
-    from server import run_server
-
-    run_server({"info": info, "start": start, "move": move, "end": end})
+    from server import run_prefork_server, run_server
+
+    handlers = {
+        "info": info,
+        "start": start,
+        "move": move,
+        "end": end,
+        "metrics": metrics.render,
+        "warm_up": warm_up,
+    }
+    if os.environ.get("SERVER", "dev") == "prefork":
+        # Each HTTP worker forks its own search pool while warming up.
+        run_prefork_server(handlers)
+    else:
+        # Fork search workers before the server starts any threads.
+        root_pool()
+        run_server(handlers)
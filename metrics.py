@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from multiprocessing.sharedctypes import RawArray
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import METRICS_TERM_EVERY
+
+
+class _Counters(threading.local):
+    """
+    Per-thread counters for the move being searched. The hot path only does `+= 1` on
+    these; `begin_move` resets them and `finish_move` folds them into the histograms.
+    """
+
+    nodes = 0
+    simulated = 0
+    evaluations = 0
+
+    def __init__(self) -> None:
+        self.term_seconds: Dict[str, float] = {}
+
+
+counters = _Counters()
+
+
+def term_timings() -> Optional[Dict[str, float]]:
+    """
+    Timings dict for score_state on every METRICS_TERM_EVERY-th evaluation, else None.
+    Sampling keeps the two perf_counter calls per term off almost every evaluation.
+    """
+    if METRICS_TERM_EVERY and counters.evaluations % METRICS_TERM_EVERY == 0:
+        return counters.term_seconds
+    return None
+
+
+class Histogram:
+    """
+    Prometheus-style histogram whose bucket counts live in shared memory, so every
+    process forked after it was created (prefork server workers) adds to the same series.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        labels: Tuple[Tuple[str, str], ...] = (),
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        # Per-bucket (non-cumulative) counts, then the +Inf bucket, the sum and the count.
+        self._values = RawArray("d", len(self.buckets) + 3)
+
+    def observe(self, value: float) -> None:
+        values = self._values
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with _LOCK:
+            values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def render(self) -> List[str]:
+        with _LOCK:
+            values = list(self._values)
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), values):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format(bound)
+            lines.append(f"{self.name}_bucket{_labels(self.labels + (('le', le),))} {_format(cumulative)}")
+        lines.append(f"{self.name}_sum{_labels(self.labels)} {_format(values[-2])}")
+        lines.append(f"{self.name}_count{_labels(self.labels)} {_format(values[-1])}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels: Tuple[Tuple[str, str], ...] = ()
+        self._value = RawArray("d", 1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with _LOCK:
+            self._value[0] += amount
+
+    def render(self) -> List[str]:
+        with _LOCK:
+            value = self._value[0]
+        return [f"{self.name} {_format(value)}"]
+
+
+def _labels(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def _format(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+_LOCK = multiprocessing.Lock()
+
+COUNT_BUCKETS = (10, 30, 100, 300, 1000, 3000, 10000, 30000, 100000)
+MS_BUCKETS = (5, 10, 25, 50, 100, 150, 200, 250, 300, 400, 500, 1000)
+TERM_BUCKETS = (0.0001, 0.0003, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3)
+
+MOVE_LATENCY = Histogram("battlesnake_move_latency_ms", "Time spent deciding one move.", MS_BUCKETS)
+NODES = Histogram("battlesnake_move_nodes", "Search nodes expanded per move.", COUNT_BUCKETS)
+SIMULATED = Histogram(
+    "battlesnake_move_states_simulated", "Turns simulated with apply_moves per move.", COUNT_BUCKETS
+)
+EVALUATIONS = Histogram("battlesnake_move_evaluations", "score_state calls per move.", COUNT_BUCKETS)
+DEPTH = Histogram("battlesnake_move_depth", "Deepest iteration completed per move.", range(0, 11))
+DEADLINE_HITS = Counter("battlesnake_deadline_hits_total", "Moves whose search stopped at FALLBACK_MS.")
+MOVES = Counter("battlesnake_moves_total", "Moves answered.")
+
+TERM_NAMES = (
+    "area",
+    "food",
+    "corridor",
+    "hazard",
+    "h2h",
+    "center",
+    "degree",
+    "longer",
+    "stability",
+    "voronoi",
+)
+TERM_SECONDS = {
+    name: Histogram(
+        "battlesnake_eval_term_seconds",
+        "Estimated seconds per move in each evaluation term (sampled, scaled up).",
+        TERM_BUCKETS,
+        labels=(("term", name),),
+    )
+    for name in TERM_NAMES
+}
+
+METRICS = [MOVE_LATENCY, NODES, SIMULATED, EVALUATIONS, DEPTH, DEADLINE_HITS, MOVES]
+METRICS.extend(TERM_SECONDS.values())
+
+
+def begin_move() -> None:
+    counters.nodes = 0
+    counters.simulated = 0
+    counters.evaluations = 0
+    counters.term_seconds = {}
+
+
+def finish_move(elapsed_ms: float, depth: Optional[int], deadline_hit: bool) -> None:
+    """
+    Publishes the current thread's counters for one answered move.
+    """
+    MOVES.inc()
+    MOVE_LATENCY.observe(elapsed_ms)
+    NODES.observe(counters.nodes)
+    SIMULATED.observe(counters.simulated)
+    EVALUATIONS.observe(counters.evaluations)
+    if depth is not None:
+        DEPTH.observe(depth)
+    if deadline_hit:
+        DEADLINE_HITS.inc()
+    scale = METRICS_TERM_EVERY or 1
+    for name, seconds in counters.term_seconds.items():
+        histogram = TERM_SECONDS.get(name)
+        if histogram is not None:
+            histogram.observe(seconds * scale)
+
+
+def render() -> str:
+    """
+    Every metric in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    described = set()
+    for metric in METRICS:
+        if metric.name not in described:
+            described.add(metric.name)
+            kind = "histogram" if isinstance(metric, Histogram) else "counter"
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
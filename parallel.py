@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.deadline import SearchTimeout
+from algorithms.lookahead import beam_search
+from algorithms.search import SearchResult, iterative_deepening
+from algorithms.transposition import TranspositionTable
+from config import TT_BITS
+from state import GameState
+
+# Extra wait past the deadline for a last result already on its way.
+RESULT_GRACE_S = 0.01
+# Workers stop this long before the parent's deadline so their results arrive in time.
+WORKER_MARGIN_S = 0.005
+
+# Each worker keeps its own table for the life of the process, and reports through the
+# pool's result queue.
+_WORKER_TABLE: Optional[TranspositionTable] = None
+_WORKER_RESULTS = None
+
+
+def _init_worker(results) -> None:
+    global _WORKER_TABLE, _WORKER_RESULTS
+    _WORKER_TABLE = TranspositionTable(TT_BITS)
+    _WORKER_RESULTS = results
+
+
+def _deepen_roots(
+    search_id: int,
+    compact: Tuple,
+    moves: Sequence[str],
+    weights,
+    deadline: float,
+    max_depth: int,
+    beam_width: int,
+    opp_topk: int,
+) -> None:
+    """
+    Worker task: deepens a group of root moves together, depth 1 for every move, then
+    depth 2, and so on until the absolute `deadline` (a perf_counter timestamp from the
+    parent; the clock is system-wide, so it means the same instant in every process).
+    Each (move, depth, score) is put on the result queue as soon as it completes, and a
+    final (move=None) message marks the group as finished.
+    """
+    results = _WORKER_RESULTS
+    state = GameState.from_compact(compact)
+    table = _WORKER_TABLE if _WORKER_TABLE is not None else TranspositionTable(TT_BITS)
+    table.new_search()
+    try:
+        for depth in range(1, max_depth + 1):
+            for move in moves:
+                score = beam_search(
+                    state=state,
+                    root_move=move,
+                    depth=depth,
+                    beam_width=beam_width,
+                    opp_topk=opp_topk,
+                    weights=weights,
+                    deadline=deadline,
+                    table=table,
+                )
+                results.put((search_id, move, depth, score))
+    except SearchTimeout:
+        pass
+    finally:
+        results.put((search_id, None, 0, 0.0))
+
+
+class RootPool:
+    """
+    Persistent pre-forked workers that deepen root moves in parallel. Depth 0 is scored
+    in-process first so a complete answer always exists. Root moves are split into one
+    group per worker; every worker stops at the parent's deadline and streams each depth
+    it completes, and the reported depth is the deepest one every root move finished.
+    Safe to call from several threads: a dispatcher thread routes each worker message to
+    the inbox of the search that owns its id.
+    """
+
+    def __init__(self, processes: int) -> None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self.processes = processes
+        self._results = context.Queue()
+        self._pool = context.Pool(processes, initializer=_init_worker, initargs=(self._results,))
+        self._search_ids = itertools.count(1)
+        self._inboxes: Dict[int, queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="root-pool-results", daemon=True)
+        self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        """
+        Moves worker messages to their search's inbox until close() sends None. Messages
+        for searches that already returned are dropped.
+        """
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            with self._lock:
+                inbox = self._inboxes.get(message[0])
+            if inbox is not None:
+                inbox.put(message[1:])
+
+    def search(
+        self,
+        state: GameState,
+        moves: Sequence[str],
+        weights,
+        deadline: float,
+        max_depth: int,
+        beam_width: int,
+        opp_topk: int,
+    ) -> SearchResult:
+        start = time.perf_counter()
+        result = iterative_deepening(state, moves, weights, deadline, 0, beam_width, opp_topk)
+        if len(moves) <= 1 or max_depth <= 0:
+            return result
+
+        inbox: queue.Queue = queue.Queue()
+        with self._lock:
+            search_id = next(self._search_ids)
+            self._inboxes[search_id] = inbox
+        try:
+            per_move = self._collect(
+                search_id, inbox, state, moves, weights, deadline, max_depth, beam_width, opp_topk
+            )
+        finally:
+            with self._lock:
+                del self._inboxes[search_id]
+
+        common = 0
+        while all(common + 1 in scores for scores in per_move.values()):
+            common += 1
+        if common > 0:
+            result.scores = [(move, per_move[move][common]) for move in moves]
+            result.depth = common
+        if common < max_depth:
+            result.deadline_hit = True
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return result
+
+    def _collect(
+        self,
+        search_id: int,
+        inbox: queue.Queue,
+        state: GameState,
+        moves: Sequence[str],
+        weights,
+        deadline: float,
+        max_depth: int,
+        beam_width: int,
+        opp_topk: int,
+    ) -> Dict[str, Dict[int, float]]:
+        """
+        Submits one task per root-move group and gathers move -> {depth: score} from the
+        inbox until every group finished or the deadline passed.
+        """
+        compact = state.to_compact()
+        groups = [list(moves[index :: self.processes]) for index in range(self.processes)]
+        groups = [group for group in groups if group]
+        worker_deadline = deadline - WORKER_MARGIN_S
+        for group in groups:
+            self._pool.apply_async(
+                _deepen_roots,
+                (search_id, compact, group, weights, worker_deadline, max_depth, beam_width, opp_topk),
+            )
+
+        per_move: Dict[str, Dict[int, float]] = {move: {} for move in moves}
+        finished = 0
+        while finished < len(groups):
+            remaining = deadline + RESULT_GRACE_S - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                move, depth, score = inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if move is None:
+                finished += 1
+            else:
+                per_move[move][depth] = score
+        return per_move
+
+    def close(self) -> None:
+        self._results.put(None)
+        self._dispatcher.join(timeout=1.0)
+        self._pool.terminate()
+        self._pool.join()
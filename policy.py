@@ -3,7 +3,7 @@ from __future__ import annotations
 import random
 from typing import Dict, Iterable, List, Sequence, Tuple
 
-from board import DELTAS, add_points, is_body_collision
+from board import is_body_collision, move_targets
 from config import SEED, TIE_MARGIN, TOPK_RANDOM
 from state import GameState, Point, Snake
 
@@ -16,8 +16,7 @@ def legal_moves(state: GameState) -> List[str]:
 def legal_moves_for_snake(state: GameState, snake: Snake) -> List[str]:
     moves: List[str] = []
     my_length = snake.length
-    for move, delta in DELTAS.items():
-        target = add_points(snake.head, delta)
+    for move, target in move_targets(state, snake.head).items():
         will_eat = target in state.food
         if is_body_collision(state, target, snake, will_eat):
             continue
@@ -33,8 +32,7 @@ def is_losing_head_to_head(state: GameState, snake: Snake, target: Point, my_len
             continue
         if opponent.eliminated:
             continue
-        for delta in DELTAS.values():
-            opp_target = add_points(opponent.head, delta)
+        for opp_target in move_targets(state, opponent.head).values():
             will_eat = opp_target in state.food
             if is_body_collision(state, opp_target, opponent, will_eat):
                 continue
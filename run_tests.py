@@ -9,6 +9,30 @@ TEST_MODULES = [
     "tests.test_food_logic",
     "tests.test_h2h",
     "tests.test_policy_eval",
+    "tests.test_bitboard",
+    "tests.test_make_unmake",
+    "tests.test_search",
+    "tests.test_transposition",
+    "tests.test_voronoi",
+    "tests.test_occupancy",
+    "tests.test_feature_context",
+    "tests.test_parallel",
+    "tests.test_server",
+    "tests.test_tree_reuse",
+    "tests.test_session",
+    "tests.test_topology",
+    "tests.test_arena",
+    "tests.test_bench",
+    "tests.test_replay",
+    "tests.test_metrics",
+    "tests.test_journal",
+    "tests.test_alphabeta",
+    "tests.test_mcts",
+    "tests.test_opponent_model",
+    "tests.test_body",
+    "tests.test_distance_field",
+    "tests.test_space",
+    "tests.test_loadtest",
 ]
 
 
@@ -1,10 +1,27 @@
+import json
 import logging
 import os
+import signal
+import socket
+import sys
 import typing
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
 from flask import Flask, request
 
+try:
+    import orjson
 
-def run_server(handlers: typing.Dict):
+    loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib decoder is the fallback.
+    loads = json.loads
+
+SERVER_HEADER = "battlesnake/github/starter-snake-python"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_app(handlers: typing.Dict):
     app = Flask("Battlesnake")
 
     @app.get("/")
@@ -19,7 +36,7 @@ def run_server(handlers: typing.Dict):
 
     @app.post("/move")
     def on_move():
-        game_state = request.get_json()
+        game_state = loads(request.get_data())
         return handlers["move"](game_state)
 
     @app.post("/end")
@@ -28,14 +45,146 @@ def run_server(handlers: typing.Dict):
         handlers["end"](game_state)
         return "ok"
 
+    @app.get("/metrics")
+    def on_metrics():
+        if "metrics" not in handlers:
+            return "not found", 404
+        return handlers["metrics"](), 200, {"Content-Type": METRICS_CONTENT_TYPE}
+
     @app.after_request
     def identify_server(response):
-        response.headers.set("server", "battlesnake/github/starter-snake-python")
+        response.headers.set("server", SERVER_HEADER)
         return response
 
+    return app
+
+
+def run_server(handlers: typing.Dict):
+    app = create_app(handlers)
     host = "0.0.0.0"
     port = int(os.environ.get("PORT", "5000"))
     logging.getLogger("werkzeug").setLevel(logging.ERROR)
     print(f"\nRunning Battlesnake at http://{host}:{port}")
     app.run(host=host, port=port)
 
+
+class BattlesnakeRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 keep-alive handler serving the same routes as the Flask app.
+    """
+
+    protocol_version = "HTTP/1.1"
+    handlers: typing.Dict = {}
+
+    def do_GET(self):
+        if self.path == "/":
+            self._send_json(self.handlers["info"]())
+        elif self.path == "/metrics" and "metrics" in self.handlers:
+            self._send(200, self.handlers["metrics"]().encode("utf-8"), METRICS_CONTENT_TYPE)
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        game_state = loads(self.rfile.read(length) or b"{}")
+        if self.path == "/move":
+            self._send_json(self.handlers["move"](game_state))
+        elif self.path in ("/start", "/end"):
+            self.handlers[self.path[1:]](game_state)
+            self._send(200, b"ok", "text/html; charset=utf-8")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _send_json(self, payload: typing.Dict):
+        self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def version_string(self):
+        return SERVER_HEADER
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _WorkerHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, listener: socket.socket, handler_class):
+        super().__init__(listener.getsockname()[:2], handler_class, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listener
+
+
+def warm_up(handlers: typing.Dict):
+    """
+    Runs the handlers' "warm_up" hook, if any, so imports, caches and any search pool
+    exist before traffic. The hook must not count as a real move in /metrics or the journal.
+    """
+    hook = handlers.get("warm_up")
+    if hook is not None:
+        hook()
+
+
+def run_prefork_server(handlers: typing.Dict, workers: typing.Optional[int] = None):
+    """
+    Pre-fork server: the parent binds one socket and forks `workers` processes that each
+    warm the engine and accept on it with a threaded HTTP/1.1 keep-alive server, so a slow
+    /move only holds its own thread and other games keep being served by other processes.
+    Dead workers are replaced until the parent receives SIGINT or SIGTERM.
+    """
+    host = "0.0.0.0"
+    port = int(os.environ.get("PORT", "5000"))
+    workers = workers or int(os.environ.get("WEB_WORKERS", os.cpu_count() or 1))
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(1024)
+
+    handler_class = type(
+        "BoundBattlesnakeRequestHandler", (BattlesnakeRequestHandler,), {"handlers": handlers}
+    )
+
+    def spawn() -> int:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            warm_up(handlers)
+            _WorkerHTTPServer(listener, handler_class).serve_forever()
+            os._exit(0)
+        return pid
+
+    children = {spawn() for _ in range(max(1, workers))}
+    print(f"\nRunning Battlesnake at http://{host}:{port} with {len(children)} workers")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            children.add(spawn())
+    listener.close()
+    sys.exit(0)
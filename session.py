@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from algorithms.tree_reuse import GameMemory
+from config import MAX_SESSIONS
+from state import GameState, Point, Snake, game_seed, turn_seed
+from tables import BoardTables, board_tables
+
+
+class GameSession:
+    """
+    Everything constant for one game: board tables for its size, the ruleset, the RNG
+    seed base, the last hazard layout (shared between turns while it does not change)
+    and the search memory.
+    """
+
+    __slots__ = (
+        "game_id",
+        "ruleset",
+        "width",
+        "height",
+        "wrapped",
+        "seed_base",
+        "tables",
+        "hazards",
+        "hazard_points",
+        "memory",
+    )
+
+    def __init__(self, game_id: str, width: int, height: int, ruleset: str) -> None:
+        self.game_id = game_id
+        self.ruleset = ruleset
+        self.width = width
+        self.height = height
+        self.wrapped = ruleset == "wrapped"
+        self.seed_base = game_seed(game_id)
+        self.tables: BoardTables = board_tables(width, height, self.wrapped)
+        self.hazards: FrozenSet[Point] = frozenset()
+        self.hazard_points: Tuple[Point, ...] = ()
+        self.memory = GameMemory()
+
+    @classmethod
+    def from_request(cls, game_state: Dict) -> "GameSession":
+        board = game_state.get("board", {})
+        return cls(
+            game_id=game_state.get("game", {}).get("id", ""),
+            width=int(board.get("width", 11)),
+            height=int(board.get("height", 11)),
+            ruleset=game_state.get("game", {}).get("ruleset", {}).get("name", "standard"),
+        )
+
+    def decode(self, game_state: Dict) -> GameState:
+        """
+        Fast /move decoding: builds the GameState straight from the payload, taking board
+        size, topology and the seed base from the session and reusing the hazard set while
+        the layout is unchanged. Equivalent to GameState.from_json followed by attach.
+        Each turn still gets a full GameState of its own, since the search mutates it in
+        place; only the per-board data above is carried between turns.
+        """
+        board = game_state["board"]
+        if board["width"] != self.width or board["height"] != self.height:
+            state = GameState.from_json(game_state)
+            self.attach(state)
+            return state
+        snakes = {}
+        for raw in board["snakes"]:
+            sid = raw["id"]
+            snakes[sid] = Snake(
+                sid,
+                raw.get("name", sid),
+                raw["health"],
+                [(point["x"], point["y"]) for point in raw["body"]],
+                raw.get("latency", ""),
+                raw.get("shout", ""),
+                raw.get("squad", ""),
+                raw.get("eliminated", False),
+            )
+        hazard_points = tuple((point["x"], point["y"]) for point in board.get("hazards", ()))
+        if hazard_points != self.hazard_points:
+            self.hazard_points = hazard_points
+            self.hazards = frozenset(hazard_points)
+        turn = game_state.get("turn", 0)
+        return GameState(
+            self.width,
+            self.height,
+            turn,
+            snakes,
+            game_state["you"]["id"],
+            {(point["x"], point["y"]) for point in board.get("food", ())},
+            self.hazards,
+            random.Random(turn_seed(self.seed_base, turn)),
+            self.wrapped,
+        )
+
+    def attach(self, state: GameState) -> None:
+        """
+        Points the state at the session's hazard set, replacing the shared set when the
+        layout moved (e.g. royale shrink).
+        """
+        if state.hazards != self.hazards:
+            self.hazards = frozenset(state.hazards)
+            self.hazard_points = tuple(self.hazards)
+        state.hazards = self.hazards
+
+
+class SessionStore:
+    """
+    Game sessions by game id, created on /start and dropped on /end. At most
+    `max_sessions` are kept; the least recently used is evicted when /end never arrives.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS) -> None:
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def start(self, game_state: Dict) -> GameSession:
+        session = GameSession.from_request(game_state)
+        with self._lock:
+            self._sessions[session.game_id] = session
+            self._sessions.move_to_end(session.game_id)
+            self._evict()
+        return session
+
+    def get(self, game_state: Dict) -> GameSession:
+        """
+        Looks the session up by game id, creating it when /start was missed.
+        """
+        game_id = game_state.get("game", {}).get("id", "")
+        with self._lock:
+            session = self._sessions.get(game_id)
+            if session is not None:
+                self._sessions.move_to_end(game_id)
+                return session
+        return self.start(game_state)
+
+    def end(self, game_id: str) -> Optional[GameSession]:
+        with self._lock:
+            return self._sessions.pop(game_id, None)
+
+    def _evict(self) -> None:
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._sessions
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from board import add_points, direction_to_delta, manhattan
-from config import LOW_HEALTH
+from board import manhattan, step
+from metrics import counters
 from state import GameState, Point, Snake
+from zobrist import KEYS
 
 # Health restored on food per Battlesnake rules.
 FOOD_HEALTH = 100
@@ -24,18 +26,19 @@ def hypothetical_after_move_for_snake(
     Opponents remain stationary which is acceptable for localized scoring heuristics.
     """
     new_state = state.copy()
+    new_state.zobrist = None
     snake = new_state.snakes[snake_id]
-    delta = direction_to_delta(move)
-    new_head = add_points(snake.head, delta)
+    new_head = step(new_state, snake.head, move)
     will_eat = new_head in new_state.food
-    snake.body.insert(0, new_head)
+    snake.body.push_head(new_head)
     if will_eat:
         new_state.food.discard(new_head)
         snake.health = FOOD_HEALTH
     else:
         # Tail slip is naturally handled by popping the last segment.
-        snake.body.pop()
+        snake.body.pop_tail()
         snake.health = max(0, snake.health - 1)
+    new_state.invalidate_occupancy()
     return new_state, will_eat
 
 
@@ -44,115 +47,190 @@ def simulate_turn(state: GameState, move_map: Dict[str, str]) -> GameState:
     Applies a collection of moves (including our own) and returns the new game state.
     """
     new_state = state.copy()
-    original_snakes = {sid: s.copy() for sid, s in state.snakes.items()}
-    planned: Dict[str, Dict] = {}
+    apply_moves(new_state, move_map)
+    return new_state
+
+
+@dataclass(slots=True)
+class SnakeUndo:
+    snake_id: str
+    health: int
+    eliminated: bool
+    death_cause: Optional[str]
+    moved: bool = False
+    popped_tail: Optional[Point] = None
+
+
+@dataclass(slots=True)
+class TurnUndo:
+    """
+    Everything `apply_moves` changed, in the order it changed it, so `undo` can restore it.
+    """
+
+    turn: int
+    snakes: List[SnakeUndo] = field(default_factory=list)
+    eaten_food: List[Point] = field(default_factory=list)
+    zobrist: Optional[int] = None
 
-    for snake in state.active_snakes:
+
+def apply_moves(state: GameState, move_map: Dict[str, str]) -> TurnUndo:
+    """
+    Applies a full turn in place and returns the record needed to revert it with `undo`.
+    Active snakes without an entry in `move_map` are eliminated.
+    """
+    counters.simulated += 1
+    active = state.active_snakes
+    planned: Dict[str, Tuple[Point, bool]] = {}
+    for snake in active:
         move = move_map.get(snake.id)
-        if snake.eliminated or move is None:
-            # If a snake has no move it dies this turn.
-            snake_ref = new_state.snakes[snake.id]
-            snake_ref.eliminated = True
-            snake_ref.death_cause = "no-move"
+        if move is None:
             continue
-        delta = direction_to_delta(move)
-        new_head = add_points(snake.head, delta)
-        will_eat = new_head in state.food
-        planned[snake.id] = {
-            "new_head": new_head,
-            "will_eat": will_eat,
-            "move": move,
-        }
-
-    # Pre-compute body occupancy ignoring tails that will move away.
-    body_footprint: Dict[str, set[Point]] = {}
-    for sid, snake in original_snakes.items():
-        plan = planned.get(sid)
-        if plan and plan["will_eat"]:
-            segments = set(snake.body)
-        else:
-            segments = set(snake.body[:-1])
-        body_footprint[sid] = segments
+        new_head = step(state, snake.head, move)
+        planned[snake.id] = (new_head, new_head in state.food)
 
     eliminated: Dict[str, str] = {}
 
-    # Check wall and body collisions.
-    for sid, plan in planned.items():
-        snake = original_snakes[sid]
-        new_head = plan["new_head"]
+    # Check wall and body collisions against each body's cell counts, ignoring tails that
+    # will move away (a snake that eats keeps its tail).
+    for sid, (new_head, _) in planned.items():
         if not state.inside(new_head):
             eliminated[sid] = "wall"
             continue
-        for other_id, footprint in body_footprint.items():
-            if other_id == sid:
+        for snake in active:
+            count = snake.body.counts.get(new_head)
+            if not count:
                 continue
-            if new_head in footprint:
-                eliminated[sid] = "body"
+            plan = planned.get(snake.id)
+            if new_head == snake.tail and not (plan and plan[1]):
+                count -= 1
+            if count:
+                eliminated[sid] = "self" if snake.id == sid else "body"
                 break
-        if eliminated.get(sid):
-            continue
-        # Self body collision (excluding tail when not eating).
-        own_segments = body_footprint[sid]
-        if new_head in own_segments:
-            eliminated[sid] = "self"
 
     # Handle head-to-head collisions.
     heads_to_snakes: Dict[Point, List[str]] = defaultdict(list)
-    for sid, plan in planned.items():
+    for sid, (new_head, _) in planned.items():
         if sid in eliminated:
             continue
-        heads_to_snakes[plan["new_head"]].append(sid)
+        heads_to_snakes[new_head].append(sid)
 
-    for point, participants in heads_to_snakes.items():
+    for participants in heads_to_snakes.values():
         if len(participants) <= 1:
             continue
-        lengths = [original_snakes[sid].length for sid in participants]
-        max_length = max(lengths)
-        survivors = [
-            sid for sid in participants if original_snakes[sid].length == max_length
-        ]
-        if len(survivors) > 1:
-            for sid in participants:
+        max_length = max(state.snakes[sid].length for sid in participants)
+        survivors = [sid for sid in participants if state.snakes[sid].length == max_length]
+        winner = survivors[0] if len(survivors) == 1 else None
+        for sid in participants:
+            if sid != winner:
                 eliminated[sid] = "head-to-head"
-        else:
-            winner = survivors[0]
-            for sid in participants:
-                if sid != winner:
-                    eliminated[sid] = "head-to-head"
-
-    # Apply transitions.
-    new_food = set(state.food)
-    for sid, snake in new_state.snakes.items():
+
+    # Apply transitions, updating the Zobrist hash incrementally when one is tracked.
+    record = TurnUndo(turn=state.turn, zobrist=state.zobrist)
+    track = state.zobrist is not None
+    zhash = state.zobrist or 0
+    for snake in active:
+        sid = snake.id
+        entry = SnakeUndo(sid, snake.health, snake.eliminated, snake.death_cause)
+        record.snakes.append(entry)
+        if track:
+            zhash ^= KEYS.signature(snake)
         plan = planned.get(sid)
-        if sid in eliminated:
-            snake.eliminated = True
-            snake.death_cause = eliminated[sid]
-            continue
-        if not plan:
+        if sid in eliminated or plan is None:
             snake.eliminated = True
-            snake.death_cause = "no-move"
+            snake.death_cause = eliminated.get(sid, "no-move")
+            if track:
+                zhash ^= KEYS.body_hash(snake)
             continue
-        new_head = plan["new_head"]
-        will_eat = plan["will_eat"]
-        prior = original_snakes[sid]
+        new_head, will_eat = plan
 
-        new_health = prior.health - 1
+        new_health = snake.health - 1
         if new_head in state.hazards:
             new_health -= HAZARD_DAMAGE
         if will_eat:
             new_health = FOOD_HEALTH
         snake.health = max(0, new_health)
 
+        snake.body.push_head(new_head)
+        entry.moved = True
         if will_eat:
-            snake.body = [new_head] + prior.body
-            new_food.discard(new_head)
+            if new_head in state.food:
+                state.food.discard(new_head)
+                record.eaten_food.append(new_head)
+                if track:
+                    zhash ^= KEYS.food(new_head)
         else:
-            snake.body = [new_head] + prior.body[:-1]
+            entry.popped_tail = snake.body.pop_tail()
+            if track:
+                zhash ^= KEYS.body(snake.slot, entry.popped_tail)
+        if track:
+            zhash ^= KEYS.body(snake.slot, new_head)
 
         if snake.health <= 0:
             snake.eliminated = True
             snake.death_cause = "starvation"
+            if track:
+                zhash ^= KEYS.body_hash(snake)
+        elif track:
+            zhash ^= KEYS.signature(snake)
 
-    new_state.food = new_food
-    new_state.turn = state.turn + 1
-    return new_state
+    if track:
+        zhash ^= KEYS.turn(state.turn) ^ KEYS.turn(state.turn + 1)
+        state.zobrist = zhash
+    state.turn += 1
+    state.invalidate_occupancy()
+    return record
+
+
+def apply_snake_move(state: GameState, snake_id: str, move: str) -> TurnUndo:
+    """
+    In-place counterpart of `hypothetical_after_move_for_snake`: moves one snake,
+    leaves the others and the turn counter untouched.
+    """
+    snake = state.snakes[snake_id]
+    record = TurnUndo(turn=state.turn, zobrist=state.zobrist)
+    entry = SnakeUndo(snake_id, snake.health, snake.eliminated, snake.death_cause, moved=True)
+    record.snakes.append(entry)
+    track = state.zobrist is not None
+    # Eliminated snakes are not part of the hash; only eaten food changes it then.
+    counted = track and not snake.eliminated
+    zhash = state.zobrist or 0
+    if counted:
+        zhash ^= KEYS.signature(snake)
+    new_head = step(state, snake.head, move)
+    snake.body.push_head(new_head)
+    if new_head in state.food:
+        state.food.discard(new_head)
+        record.eaten_food.append(new_head)
+        snake.health = FOOD_HEALTH
+        if track:
+            zhash ^= KEYS.food(new_head)
+    else:
+        entry.popped_tail = snake.body.pop_tail()
+        snake.health = max(0, snake.health - 1)
+        if counted:
+            zhash ^= KEYS.body(snake.slot, entry.popped_tail)
+    if counted:
+        zhash ^= KEYS.body(snake.slot, new_head) ^ KEYS.signature(snake)
+    if track:
+        state.zobrist = zhash
+    state.invalidate_occupancy()
+    return record
+
+
+def undo(state: GameState, record: TurnUndo) -> None:
+    """
+    Reverts a turn applied by `apply_moves` or `apply_snake_move`.
+    """
+    for entry in reversed(record.snakes):
+        snake = state.snakes[entry.snake_id]
+        if entry.moved:
+            snake.body.pop_head()
+            if entry.popped_tail is not None:
+                snake.body.push_tail(entry.popped_tail)
+        snake.health = entry.health
+        snake.eliminated = entry.eliminated
+        snake.death_cause = entry.death_cause
+    state.food.update(record.eaten_food)
+    state.turn = record.turn
+    state.zobrist = record.zobrist
+    state.invalidate_occupancy()
@@ -1,13 +1,40 @@
 from __future__ import annotations
 
-import hashlib
 import random
+import zlib
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from body import Body
 from config import SEED
+from tables import BoardTables, board_tables
 
 Point = Tuple[int, int]
+# Occupancy entry: (owner snake id, segment index nearest the head, tail that vacates next turn).
+Occupant = Tuple[str, int, bool]
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def game_seed(game_id: str) -> int:
+    """
+    Per-game part of the RNG seed: SEED mixed with a CRC of the game id.
+    """
+    return _splitmix64((SEED << 32) ^ zlib.crc32(game_id.encode("utf-8")))
+
+
+def turn_seed(base: int, turn: int) -> int:
+    """
+    Deterministic 31-bit seed for one turn of a game; `base` comes from game_seed.
+    """
+    return _splitmix64(base ^ turn) & 0x7FFFFFFF
 
 
 def _to_point(coord: Dict[str, int]) -> Point:
@@ -19,20 +46,26 @@ class Snake:
     id: str
     name: str
     health: int
-    body: List[Point]
+    body: Body
     latency: str = ""
     shout: str = ""
     squad: str = ""
     eliminated: bool = False
     death_cause: Optional[str] = None
+    # Position in the game's snake list; GameState assigns it (see zobrist).
+    slot: int = 0
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.body, Body):
+            self.body = Body(self.body)
 
     @property
     def head(self) -> Point:
-        return self.body[0]
+        return self.body.head
 
     @property
     def tail(self) -> Point:
-        return self.body[-1]
+        return self.body.tail
 
     @property
     def length(self) -> int:
@@ -43,12 +76,13 @@ class Snake:
             id=self.id,
             name=self.name,
             health=self.health,
-            body=list(self.body),
+            body=self.body.copy(),
             latency=self.latency,
             shout=self.shout,
             squad=self.squad,
             eliminated=self.eliminated,
             death_cause=self.death_cause,
+            slot=self.slot,
         )
 
 
@@ -62,6 +96,22 @@ class GameState:
     food: Set[Point] = field(default_factory=set)
     hazards: Set[Point] = field(default_factory=set)
     rng: random.Random = field(default_factory=random.Random)
+    # Wrapped rules: moving off one edge re-enters on the opposite edge.
+    wrapped: bool = False
+    # Incremental Zobrist hash; None until first requested (see zobrist.ensure_hash).
+    zobrist: Optional[int] = None
+    _occupancy: Optional[Dict[Point, Occupant]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Analyses of the current bodies (distance fields by origin, the space analysis),
+    # dropped together with the index.
+    _derived: Optional[Dict[object, object]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        for slot, snake in enumerate(self.snakes.values()):
+            snake.slot = slot
 
     @classmethod
     def from_json(cls, data: Dict) -> "GameState":
@@ -85,11 +135,62 @@ class GameState:
         food = {_to_point(p) for p in board.get("food", [])}
         hazards = {_to_point(p) for p in board.get("hazards", [])}
         turn = int(data.get("turn", 0))
-        game_id = data.get("game", {}).get("id", "")
-        seed_material = f"{SEED}|{game_id}|{turn}"
-        seed_int = int(hashlib.sha1(seed_material.encode("utf-8")).hexdigest(), 16) & 0x7FFFFFFF
-        rng = random.Random(seed_int)
-        return cls(width, height, turn, snakes, you, food, hazards, rng)
+        game = data.get("game", {})
+        rng = random.Random(turn_seed(game_seed(game.get("id", "")), turn))
+        wrapped = game.get("ruleset", {}).get("name") == "wrapped"
+        return cls(width, height, turn, snakes, you, food, hazards, rng, wrapped)
+
+    def to_compact(self) -> Tuple:
+        """
+        Small picklable form for shipping to worker processes: flat coordinate tuples,
+        no names or RNG state.
+        """
+        snakes = tuple(
+            (
+                snake.id,
+                snake.health,
+                tuple(coord for point in snake.body for coord in point),
+                snake.eliminated,
+            )
+            for snake in self.snakes.values()
+        )
+        food = tuple(coord for point in self.food for coord in point)
+        hazards = tuple(coord for point in self.hazards for coord in point)
+        return (
+            self.width,
+            self.height,
+            self.turn,
+            self.me_id,
+            snakes,
+            food,
+            hazards,
+            self.wrapped,
+        )
+
+    @classmethod
+    def from_compact(cls, data: Tuple) -> "GameState":
+        width, height, turn, me_id, snake_rows, food, hazards, wrapped = data
+        snakes = {
+            sid: Snake(
+                id=sid,
+                name=sid,
+                health=health,
+                body=list(zip(flat[0::2], flat[1::2])),
+                eliminated=eliminated,
+            )
+            for sid, health, flat, eliminated in snake_rows
+        }
+        return cls(
+            width,
+            height,
+            turn,
+            snakes,
+            me_id,
+            set(zip(food[0::2], food[1::2])),
+            set(zip(hazards[0::2], hazards[1::2])),
+            random.Random(turn),
+            wrapped,
+        )
 
     def copy(self) -> "GameState":
         snakes_copy = {sid: snake.copy() for sid, snake in self.snakes.items()}
@@ -102,10 +203,16 @@ class GameState:
             food=set(self.food),
             hazards=set(self.hazards),
             rng=random.Random(),
+            wrapped=self.wrapped,
+            zobrist=self.zobrist,
         )
         new_state.rng.setstate(self.rng.getstate())
         return new_state
 
+    @property
+    def tables(self) -> BoardTables:
+        return board_tables(self.width, self.height, self.wrapped)
+
     @property
     def me(self) -> Snake:
         return self.snakes[self.me_id]
@@ -118,6 +225,35 @@ class GameState:
     def active_snakes(self) -> List[Snake]:
         return [s for s in self.snakes.values() if not s.eliminated]
 
+    def occupancy(self) -> Dict[Point, Occupant]:
+        """
+        Cell -> occupant index over active snakes, built on first use.
+        Anything that moves bodies or eliminates snakes must call `invalidate_occupancy`.
+        """
+        index = self._occupancy
+        if index is None:
+            index = {}
+            for snake in self.active_snakes:
+                tail_index = len(snake.body) - 1
+                sid = snake.id
+                # Tail to head, so a stacked cell keeps the index nearest the head.
+                for position, segment in zip(range(tail_index, -1, -1), reversed(snake.body)):
+                    index[segment] = (sid, position, position == tail_index)
+            self._occupancy = index
+        return index
+
+    def invalidate_occupancy(self) -> None:
+        self._occupancy = None
+        self._derived = None
+
+    def derived(self) -> Dict[object, object]:
+        """
+        Cache for analyses of the current bodies, e.g. distance_field() and space_analysis().
+        """
+        if self._derived is None:
+            self._derived = {}
+        return self._derived
+
     def occupied_points(self, exclude: Optional[Sequence[Point]] = None) -> List[Point]:
         exclude_set = set(exclude or [])
         tiles: List[Point] = []
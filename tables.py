@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+
+Point = Tuple[int, int]
+
+DELTAS: Dict[str, Point] = {
+    "up": (0, 1),
+    "down": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BoardTables:
+    """
+    Board topology and per-size constants, shared by every state of the same shape.
+    `moves[cell][direction]` is the cell a move lands on: wrapped around the edges on
+    wrapped boards, or the off-board point on standard boards so wall checks still see it.
+    `neighbors[cell]` lists only on-board neighbours, so hot loops need no bounds checks.
+    """
+
+    width: int
+    height: int
+    wrapped: bool
+    tiles: int
+    center: Point
+    moves: Dict[Point, Dict[str, Point]]
+    neighbors: Dict[Point, Tuple[Point, ...]]
+    center_distance: Dict[Point, int]
+
+
+@lru_cache(maxsize=32)
+def board_tables(width: int, height: int, wrapped: bool = False) -> BoardTables:
+    center = ((width - 1) // 2, (height - 1) // 2)
+    moves: Dict[Point, Dict[str, Point]] = {}
+    neighbors: Dict[Point, Tuple[Point, ...]] = {}
+    center_distance: Dict[Point, int] = {}
+    for x in range(width):
+        for y in range(height):
+            targets: Dict[str, Point] = {}
+            for direction, (dx, dy) in DELTAS.items():
+                nx, ny = x + dx, y + dy
+                if wrapped:
+                    nx, ny = nx % width, ny % height
+                targets[direction] = (nx, ny)
+            moves[(x, y)] = targets
+            neighbors[(x, y)] = tuple(
+                (nx, ny) for nx, ny in targets.values() if 0 <= nx < width and 0 <= ny < height
+            )
+            center_distance[(x, y)] = abs(x - center[0]) + abs(y - center[1])
+    return BoardTables(
+        width, height, wrapped, width * height, center, moves, neighbors, center_distance
+    )
+
+
+def wrapped_distance(a: Point, b: Point, width: int, height: int) -> int:
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return min(dx, width - dx) + min(dy, height - dy)
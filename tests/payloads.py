@@ -0,0 +1,31 @@
+"""
+Request payload builders shared by the search tests.
+"""
+from state import GameState
+
+
+def snake(snake_id, body, health=90):
+    cells = [{"x": x, "y": y} for x, y in body]
+    return {"id": snake_id, "name": snake_id, "health": health, "body": cells, "head": cells[0]}
+
+
+def board_payload(snakes, food=(), width=7, height=7, turn=0, game_id="test"):
+    """
+    A /move body on an empty board; the first snake is "you".
+    """
+    return {
+        "game": {"id": game_id},
+        "turn": turn,
+        "board": {
+            "height": height,
+            "width": width,
+            "food": [{"x": x, "y": y} for x, y in food],
+            "hazards": [],
+            "snakes": snakes,
+        },
+        "you": snakes[0],
+    }
+
+
+def board_state(snakes, **kwargs):
+    return GameState.from_json(board_payload(snakes, **kwargs))
@@ -0,0 +1,84 @@
+import time
+
+from algorithms.alphabeta import WIN, alphabeta_deepening
+from algorithms.engines import search_moves
+import config
+from config import get_weights
+from policy import legal_moves
+from tests.payloads import board_state, snake
+from zobrist import ensure_hash
+
+
+def _state(me_body, opp_body):
+    return board_state([snake("me", me_body), snake("opp", opp_body)], turn=5, game_id="alphabeta")
+
+
+def _open_state():
+    return _state([(1, 2), (1, 1), (1, 0)], [(4, 4), (4, 3), (4, 2)])
+
+
+def test_both_modes_score_every_root_move_and_restore_state():
+    for mode in ("paranoid", "maxn"):
+        state = _open_state()
+        ensure_hash(state)
+        before = (list(state.me.body), state.zobrist)
+        moves = legal_moves(state)
+        result = alphabeta_deepening(state, moves, get_weights(), None, 2, 2, mode=mode)
+        assert result.depth == 2
+        assert not result.deadline_hit
+        assert sorted(move for move, _ in result.scores) == sorted(moves)
+        assert (list(state.me.body), state.zobrist) == before
+
+
+def test_expired_deadline_keeps_depth_zero_scores():
+    state = _open_state()
+    moves = legal_moves(state)
+    result = alphabeta_deepening(state, moves, get_weights(), time.perf_counter() - 1.0, 4, 2)
+    assert result.depth == 0
+    assert result.deadline_hit
+    assert sorted(move for move, _ in result.scores) == sorted(moves)
+
+
+def test_paranoid_sees_a_trapped_opponent_as_a_win():
+    # The opponent is boxed into the corner by its own body and ours: any move wins.
+    state = _state([(2, 1), (2, 0), (1, 0), (1, 1)], [(0, 0), (0, 1), (0, 2)])
+    moves = legal_moves(state)
+    result = alphabeta_deepening(state, moves, get_weights(), None, 1, 2)
+    assert result.scores
+    assert all(score >= WIN for _, score in result.scores)
+
+
+def test_search_moves_dispatches_on_engine_name():
+    state = _open_state()
+    moves = legal_moves(state)
+    for engine in ("beam", "paranoid", "maxn", "mcts"):
+        result = search_moves(state, moves, get_weights(), None, 1, 2, 1, engine=engine)
+        assert sorted(move for move, _ in result.scores) == sorted(moves)
+    try:
+        search_moves(state, moves, get_weights(), None, 1, 2, 1, engine="random")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown engines must be rejected")
+
+
+def test_scores_in_the_tie_band_are_exact():
+    # Mirror-symmetric board where every root move is worth the same at depth 2: with a
+    # zero margin, each later move is searched with alpha at its true score and fails low.
+    state = _state([(3, 1), (3, 0)], [(3, 5), (3, 6)])
+    moves = legal_moves(state)
+    margin = config.TIE_MARGIN
+    try:
+        config.TIE_MARGIN = float("inf")
+        exact = dict(alphabeta_deepening(state, moves, get_weights(), None, 2, 2).scores)
+        for config.TIE_MARGIN in (0.0, 0.02, 0.2):
+            scores = dict(alphabeta_deepening(state, moves, get_weights(), None, 2, 2).scores)
+            top = max(scores.values())
+            denom = max(1.0, abs(top))
+            band = [move for move, score in scores.items() if (top - score) / denom <= config.TIE_MARGIN]
+            assert {move: scores[move] for move in band} == {move: exact[move] for move in band}
+            assert set(band) == {move for move, score in exact.items() if (top - score) / denom <= config.TIE_MARGIN}
+            assert all(scores[move] >= exact[move] for move in moves)
+            assert max(exact.values()) == top
+    finally:
+        config.TIE_MARGIN = margin
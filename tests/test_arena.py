@@ -0,0 +1,101 @@
+import random
+
+from algorithms.mcts import mcts_search
+from config import get_weights
+from evaluation import score_state
+from policy import legal_moves
+from tools.arena import (
+    ArenaConfig,
+    Player,
+    _Overrides,
+    grow_hazards,
+    move_request,
+    new_game,
+    play_game,
+    run_arena,
+    spawn_food,
+)
+from state import GameState
+
+
+FAST = (("FALLBACK_MS", 5), ("LOOKAHEAD_DEPTH", 0))
+
+
+def test_new_game_is_seeded_and_valid():
+    arena = ArenaConfig(width=7, height=7, snakes=4)
+    first, _ = new_game(3, arena)
+    second, _ = new_game(3, arena)
+    assert {s.id: s.body for s in first.snakes.values()} == {s.id: s.body for s in second.snakes.values()}
+    assert first.food == second.food
+    heads = [snake.head for snake in first.snakes.values()]
+    assert len(set(heads)) == 4
+    assert all(len(snake.body) == 3 for snake in first.snakes.values())
+    assert not first.food & set(heads)
+
+
+def test_request_round_trips_through_from_json():
+    arena = ArenaConfig(width=7, height=7, snakes=2, ruleset="wrapped")
+    state, _ = new_game(1, arena)
+    parsed = GameState.from_json(move_request(state, "snake-1", "g", arena))
+    assert parsed.me_id == "snake-1"
+    assert parsed.wrapped
+    assert parsed.food == state.food
+    assert parsed.snakes["snake-0"].body == state.snakes["snake-0"].body
+
+
+def test_food_and_hazard_rules():
+    arena = ArenaConfig(width=7, height=7, snakes=2, minimum_food=3, ruleset="royale", shrink_every=5)
+    state, rng = new_game(2, arena)
+    state.food.clear()
+    spawn_food(state, rng, arena)
+    assert len(state.food) == 3
+    state.turn = 5
+    grow_hazards(state, rng, arena)
+    assert len(state.hazards) == 7
+    state.turn = 6
+    grow_hazards(state, random.Random(0), arena)
+    assert len(state.hazards) == 7
+
+
+def test_games_finish_and_report():
+    arena = ArenaConfig(width=7, height=7, snakes=2, max_turns=40)
+    players = [Player("a", FAST), Player("b", FAST)]
+    record = play_game(5, players, arena)
+    assert record.turns <= 40
+    assert record.moves == len(record.latencies_ms["a"]) + len(record.latencies_ms["b"])
+
+    report = run_arena(2, players, arena, processes=0, seed=5)
+    assert report["games"] == 2
+    assert report["players"]["a"]["games"] == 2
+    wins = sum(p["wins"] for p in report["players"].values())
+    assert wins + report["draws"] == 2
+
+
+def test_player_spec_parsing():
+    player = Player.parse("deep:LOOKAHEAD_DEPTH=3,W_FOOD=10.5")
+    assert player.name == "deep"
+    assert dict(player.overrides) == {"LOOKAHEAD_DEPTH": 3, "W_FOOD": 10.5}
+    for spec in ("bad:NOPE=1", "bad:POOL_SIZE=2", "bad:SEED=3"):
+        try:
+            Player.parse(spec)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{spec} accepted")
+
+
+def test_overrides_change_engine_behaviour():
+    state, _ = new_game(2, ArenaConfig(width=7, height=7, snakes=2))
+    state.me.health = 50
+    weights = get_weights()
+    base = score_state(state, weights)
+    with _Overrides(Player.parse("hungry:LOW_HEALTH=60").overrides):
+        hungry = score_state(state, weights)
+    assert hungry != base
+    assert score_state(state, weights) == base
+
+    moves = legal_moves(state)
+    with _Overrides(Player.parse("small:MCTS_ITERATIONS=40").overrides):
+        result = mcts_search(state, moves, weights, None, 2)
+    visits = sum(score // 1 for _, score in result.scores)
+    assert visits == 40
@@ -0,0 +1,30 @@
+from tools.bench import benchmark_cases, compare, environment, environment_mismatch, run_benchmarks
+from tools.board_fixtures import FIXTURES, load_fixture
+
+
+def test_fixtures_match_their_descriptions():
+    states = {name: load_fixture(name) for name in FIXTURES}
+    assert len(states["early_game"].active_snakes) == 4
+    assert states["early_game"].turn < 10
+    assert len(states["crowded_midgame"].active_snakes) == 4
+    assert (states["large_8_snake"].width, len(states["large_8_snake"].active_snakes)) == (19, 8)
+    assert len(states["duel_endgame"].active_snakes) == 2
+    assert all(not state.me.eliminated for state in states.values())
+
+
+def test_run_and_compare():
+    results = run_benchmarks(fixtures=("early_game",), repeat=1, min_seconds=0.0, only="legal_moves")
+    assert list(results) == ["early_game/legal_moves"]
+    assert results["early_game/legal_moves"] > 0
+
+    rows = compare({"a": 13.0, "b": 10.0, "c": 1.0}, {"a": 10.0, "b": 10.0}, tolerance=0.25)
+    assert [(row["name"], row["regressed"]) for row in rows] == [("a", True), ("b", False)]
+
+
+def test_baseline_gate_compares_like_with_like():
+    env = environment()
+    assert env["cpu_count"] >= 1 and env["cpu_model"]
+    assert environment_mismatch(env, dict(env)) == []
+    assert environment_mismatch(env, dict(env, orjson=not env["orjson"], cpu_count=64)) == ["cpu_count", "orjson"]
+    assert environment_mismatch(env, {}) == sorted(env)
+    assert [key for key, _ in benchmark_cases(("early_game",), only="legal_moves")] == ["early_game/legal_moves"]
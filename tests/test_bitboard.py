@@ -0,0 +1,72 @@
+import random
+
+from algorithms.flood_fill import area_from_state
+from bitboard import flood_fill_count, mask_from_points, points_from_mask
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "bitboard"},
+        "turn": 3,
+        "board": {
+            "height": 6,
+            "width": 7,
+            "food": [{"x": 0, "y": 5}, {"x": 6, "y": 0}],
+            "hazards": [{"x": 3, "y": 3}],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 80,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 70,
+                    "body": [{"x": 3, "y": 0}, {"x": 3, "y": 1}, {"x": 3, "y": 2}, {"x": 3, "y": 3}, {"x": 3, "y": 4}],
+                    "head": {"x": 3, "y": 0},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def _reference_fill(start, blocked, width, height):
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for nbr in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nbr[0] < width and 0 <= nbr[1] < height and nbr not in blocked and nbr not in seen:
+                seen.add(nbr)
+                stack.append(nbr)
+    return len(seen)
+
+
+def test_mask_points_round_trip():
+    points = {(0, 0), (6, 5), (3, 2)}
+    mask = mask_from_points(points, 7, 6)
+    assert set(points_from_mask(mask, 7)) == points
+
+
+def test_flood_fill_matches_reference_on_random_boards():
+    rng = random.Random(7)
+    for _ in range(50):
+        width, height = rng.randint(3, 19), rng.randint(3, 19)
+        blocked = {(rng.randrange(width), rng.randrange(height)) for _ in range(width * height // 3)}
+        start = (rng.randrange(width), rng.randrange(height))
+        blocked.discard(start)
+        assert flood_fill_count(start, blocked, width, height) == _reference_fill(start, blocked, width, height)
+
+
+def test_flood_fill_count_matches_state_area():
+    state = GameState.from_json(_build_state())
+    blocked = {segment for snake in state.active_snakes for segment in snake.body}
+    blocked.discard(state.me.head)
+    count, _ = area_from_state(state)
+    assert flood_fill_count(state.me.head, blocked, state.width, state.height) == count
+    assert count == _reference_fill(state.me.head, blocked, state.width, state.height)
@@ -0,0 +1,79 @@
+import pickle
+import random
+
+from body import Body
+from simulate import apply_moves, undo
+from state import GameState
+
+
+def _assert_matches(body, model):
+    assert len(body) == len(model)
+    assert list(body) == model
+    assert list(reversed(body)) == model[::-1]
+    assert body == model
+    if model:
+        assert (body.head, body.tail) == (model[0], model[-1])
+        assert body[0] == model[0] and body[-1] == model[-1]
+        assert body[:-1] == model[:-1]
+    counts = {}
+    for point in model:
+        counts[point] = counts.get(point, 0) + 1
+    assert body.counts == counts
+
+
+def test_ring_operations_match_a_list_through_wraparound_and_growth():
+    rng = random.Random(3)
+    body = Body([(0, 0), (0, 1), (0, 1)])
+    model = [(0, 0), (0, 1), (0, 1)]
+    for _ in range(2000):
+        action = rng.random()
+        point = (rng.randrange(4), rng.randrange(4))
+        if action < 0.35 or not model:
+            body.push_head(point)
+            model.insert(0, point)
+        elif action < 0.6:
+            assert body.pop_tail() == model.pop()
+        elif action < 0.8:
+            body.push_tail(point)
+            model.append(point)
+        else:
+            assert body.pop_head() == model.pop(0)
+        _assert_matches(body, model)
+
+
+def test_copy_and_pickle_are_independent():
+    body = Body([(1, 1), (1, 2), (1, 3)])
+    clone = body.copy()
+    clone.push_head((1, 0))
+    assert body == [(1, 1), (1, 2), (1, 3)]
+    assert (1, 0) not in body and (1, 0) in clone
+    restored = pickle.loads(pickle.dumps(clone))
+    assert restored == clone and restored.counts == clone.counts
+
+
+def test_apply_and_undo_keep_long_bodies_and_counts_in_step():
+    cells = [(x, 0) for x in range(10, -1, -1)] + [(x, 1) for x in range(11)]
+    cells += [(x, 2) for x in range(10, -1, -1)] + [(x, 3) for x in range(11)]
+    me = {
+        "id": "me",
+        "name": "me",
+        "health": 90,
+        "body": [{"x": x, "y": y} for x, y in reversed(cells)],
+    }
+    state = GameState.from_json(
+        {
+            "game": {"id": "body"},
+            "turn": 0,
+            "board": {"width": 11, "height": 11, "food": [], "hazards": [], "snakes": [me]},
+            "you": me,
+        }
+    )
+    snake = state.me
+    before = list(snake.body)
+    records = [apply_moves(state, {"me": move}) for move in ("up", "left", "left", "left")]
+    assert snake.length == len(before)
+    assert not snake.eliminated and (10, 0) not in snake.body
+    _assert_matches(snake.body, [(7, 4), (8, 4), (9, 4), (10, 4)] + before[:-4])
+    for record in reversed(records):
+        undo(state, record)
+    _assert_matches(snake.body, before)
@@ -0,0 +1,68 @@
+from algorithms.astar import shortest_path_length
+from algorithms.distance_field import DistanceField, distance_field
+from features.context import FeatureContext
+from simulate import apply_moves, undo
+from state import GameState
+from tables import board_tables
+
+
+def _state(ruleset="standard", food=((4, 0),)):
+    me = {
+        "id": "me",
+        "name": "me",
+        "health": 50,
+        "body": [{"x": 2, "y": 0}, {"x": 2, "y": 1}, {"x": 2, "y": 2}, {"x": 2, "y": 3}],
+    }
+    return GameState.from_json(
+        {
+            "game": {"id": "field", "ruleset": {"name": ruleset}},
+            "turn": 0,
+            "board": {
+                "width": 5,
+                "height": 5,
+                "food": [{"x": x, "y": y} for x, y in food],
+                "hazards": [],
+                "snakes": [me],
+            },
+            "you": me,
+        }
+    )
+
+
+def test_field_routes_around_bodies():
+    field = DistanceField((0, 0), {(1, 0), (1, 1), (1, 2)}, board_tables(5, 5))
+    assert field.distance((2, 0)) == 8
+    assert field.first_step((2, 0)) == "up"
+    assert field.reachable((4, 4)) and not field.reachable((1, 1))
+    assert field.nearest([(2, 0), (0, 3)]) == 3
+    assert field.nearest([(1, 1)]) is None
+
+
+def test_wrapped_field_crosses_the_edge():
+    field = DistanceField((0, 2), set(), board_tables(5, 5, wrapped=True))
+    assert field.distance((4, 2)) == 1
+    assert field.first_step((4, 2)) == "left"
+    assert shortest_path_length((0, 2), [(4, 2)], set(), 5, 5, wrapped=True) == 1
+    assert shortest_path_length((0, 2), [(4, 2)], set(), 5, 5) == 4
+
+
+def test_cached_field_follows_apply_and_undo():
+    state = _state()
+    field = distance_field(state, state.me.head)
+    assert distance_field(state, state.me.head) is field
+    # The body splits the board; food on the right is 2 steps away over the head's row.
+    assert field.distance((4, 0)) == 2 and field.first_step((4, 0)) == "right"
+    assert field.distance((0, 4)) == 6
+    record = apply_moves(state, {"me": "right"})
+    moved = distance_field(state, state.me.head)
+    assert moved is not field and moved.distance((4, 0)) == 1
+    undo(state, record)
+    assert distance_field(state, state.me.head).distances == field.distances
+
+
+def test_context_nearest_distance_matches_the_field():
+    state = _state(food=((0, 4), (4, 4)))
+    ctx = FeatureContext(state)
+    field = distance_field(state, state.me.head)
+    assert ctx.nearest_distance(state.food) == field.nearest(state.food) == 6
+    assert ctx.nearest_distance([]) is None
@@ -0,0 +1,57 @@
+from algorithms.flood_fill import area_from_state
+from config import get_weights
+from evaluation import TERMS, score_state
+from features.context import FeatureContext
+from policy import count_safe_moves
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "context"},
+        "turn": 0,
+        "board": {
+            "height": 7,
+            "width": 7,
+            "food": [{"x": 5, "y": 1}],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 20,
+                    "body": [{"x": 2, "y": 2}, {"x": 2, "y": 1}, {"x": 2, "y": 0}],
+                    "head": {"x": 2, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 4, "y": 4}, {"x": 3, "y": 4}, {"x": 3, "y": 3}, {"x": 3, "y": 2}],
+                    "head": {"x": 4, "y": 4},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_context_matches_direct_computations():
+    state = GameState.from_json(_build_state())
+    ctx = FeatureContext(state)
+    assert ctx.area == area_from_state(state)
+    assert ctx.safe_moves == count_safe_moves(state, state.me)
+    assert [snake.id for snake in ctx.opponents] == ["opp"]
+    assert ctx.distance_to((2, 2)) == 0
+    assert ctx.distance_to((2, 4)) == 2
+    assert ctx.distance_to((4, 2)) == 10  # around the opponent, not Manhattan 2
+    assert ctx.distance_to((3, 2)) is None
+
+
+def test_score_state_reports_per_term_timings():
+    state = GameState.from_json(_build_state())
+    weights = get_weights()
+    timings = {}
+    timed_score = score_state(state, weights, timings)
+    assert set(timings) == {name for name, _ in TERMS}
+    assert timed_score == score_state(state, weights)
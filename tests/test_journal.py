@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+from journal import Journal, read_journal
+
+
+def _request(turn):
+    snake = {"id": "me", "name": "Me", "health": 90, "body": [{"x": 1, "y": 1}]}
+    return {
+        "game": {"id": "journal"},
+        "turn": turn,
+        "board": {"width": 5, "height": 5, "food": [], "hazards": [], "snakes": [snake]},
+        "you": snake,
+    }
+
+
+def test_records_round_trip_with_sampling():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "decisions.bin")
+        journal = Journal(path, capacity=64, every=2, slow_ms=100.0, flush_s=60.0)
+        kept = [
+            journal.record(_request(turn), "left", [("left", 1.5), ("up", -0.25)], ms, 3, turn == 2, (0.5, 40, 12, 30))
+            for turn, ms in enumerate((10.0, 10.0, 10.0, 150.0))
+        ]
+        journal.close()
+        records = list(read_journal(path))
+
+    # Moves 0 and 2 are sampled; move 3 is kept for being slow.
+    assert kept == [True, False, True, True]
+    assert [record["request"]["turn"] for record in records] == [0, 2, 3]
+    first = records[1]
+    assert first["move"] == "left"
+    assert first["scores"] == [("left", 1.5), ("up", -0.25)]
+    assert first["deadline_hit"] and not records[0]["deadline_hit"]
+    assert (first["depth"], first["nodes"], first["simulated"], first["evaluations"]) == (3, 40, 12, 30)
+    assert first["request"] == _request(2)
+
+
+def test_full_ring_drops_oldest_and_truncated_tail_is_ignored():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "decisions.bin")
+        journal = Journal(path, capacity=2, flush_s=60.0)
+        for turn in range(3):
+            journal.record(_request(turn), "up", [], 1.0, 0, False)
+        assert journal.dropped == 1
+        journal.close()
+        with open(path, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00partial")
+        assert [record["request"]["turn"] for record in read_journal(path)] == [1, 2]
+        assert journal.written == 2
@@ -0,0 +1,19 @@
+from tools.loadtest import percentile
+from tools.payloads import synthetic_move_payload
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile(list(range(1, 101)), 99) == 99
+    assert percentile(list(range(1, 11)), 50) == 5
+    assert percentile(list(range(1, 201)), 99) == 198
+    assert percentile(list(range(1, 201)), 100) == 200
+    assert percentile([7.0], 50) == 7.0
+    assert percentile([], 99) == 0.0
+
+
+def test_synthetic_payload_stops_adding_snakes_on_a_full_board():
+    payload = synthetic_move_payload(3, 5, 5, snakes=8, max_length=25)
+    bodies = [(cell["x"], cell["y"]) for snake in payload["board"]["snakes"] for cell in snake["body"]]
+    assert 1 <= len(payload["board"]["snakes"]) <= 8
+    assert len(bodies) == len(set(bodies)) <= 25
+    assert payload["you"] is payload["board"]["snakes"][0]
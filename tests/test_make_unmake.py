@@ -0,0 +1,70 @@
+import itertools
+
+from simulate import apply_moves, apply_snake_move, simulate_turn, undo
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "make-unmake"},
+        "turn": 5,
+        "board": {
+            "height": 5,
+            "width": 5,
+            "food": [{"x": 2, "y": 3}],
+            "hazards": [{"x": 0, "y": 2}],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 1,
+                    "body": [{"x": 3, "y": 3}, {"x": 3, "y": 2}, {"x": 3, "y": 2}],
+                    "head": {"x": 3, "y": 3},
+                },
+            ],
+        },
+        "you": {
+            "id": "me",
+            "name": "Me",
+            "health": 90,
+            "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+            "head": {"x": 1, "y": 2},
+        },
+    }
+
+
+def _snapshot(state: GameState):
+    return (
+        state.turn,
+        sorted(state.food),
+        [(s.id, s.health, list(s.body), s.eliminated, s.death_cause) for s in state.snakes.values()],
+    )
+
+
+def test_apply_matches_simulate_and_undo_restores():
+    state = GameState.from_json(_build_state())
+    before = _snapshot(state)
+    for my_move, opp_move in itertools.product(["up", "down", "left", "right"], repeat=2):
+        move_map = {"me": my_move, "opp": opp_move}
+        expected = _snapshot(simulate_turn(state, move_map))
+        record = apply_moves(state, move_map)
+        assert _snapshot(state) == expected
+        undo(state, record)
+        assert _snapshot(state) == before
+
+
+def test_nested_apply_and_single_snake_undo():
+    state = GameState.from_json(_build_state())
+    before = _snapshot(state)
+    first = apply_moves(state, {"me": "up", "opp": "left"})
+    second = apply_snake_move(state, "me", "right")
+    undo(state, second)
+    undo(state, first)
+    assert _snapshot(state) == before
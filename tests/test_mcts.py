@@ -0,0 +1,44 @@
+import time
+
+from algorithms.mcts import mcts_search
+from config import get_weights
+from policy import legal_moves
+from tests.payloads import board_state, snake
+from zobrist import ensure_hash
+
+
+def _state(me_body, opp_body):
+    return board_state(
+        [snake("me", me_body), snake("opp", opp_body)], food=[(5, 5)], turn=3, game_id="mcts"
+    )
+
+
+def test_iteration_budget_is_spread_over_root_moves_and_state_restored():
+    state = _state([(1, 2), (1, 1), (1, 0)], [(4, 4), (4, 3), (4, 2)])
+    ensure_hash(state)
+    before = (list(state.me.body), list(state.snakes["opp"].body), state.zobrist)
+    moves = legal_moves(state)
+    result = mcts_search(state, moves, get_weights(), None, 3, iterations=300)
+    assert not result.deadline_hit
+    assert [move for move, _ in result.scores] == moves
+    assert sum(int(score) for _, score in result.scores) == 300
+    assert result.depth >= 1
+    assert (list(state.me.body), list(state.snakes["opp"].body), state.zobrist) == before
+
+
+def test_expired_deadline_still_visits_every_root_move():
+    state = _state([(1, 2), (1, 1), (1, 0)], [(4, 4), (4, 3), (4, 2)])
+    moves = legal_moves(state)
+    result = mcts_search(state, moves, get_weights(), time.perf_counter() - 1.0, 3)
+    assert result.deadline_hit
+    assert all(score >= 1 for _, score in result.scores)
+
+
+def test_visits_avoid_a_dead_end():
+    # Moving down from (0, 1) enters the corner cell, which our own body seals off.
+    state = _state([(0, 1), (1, 1), (1, 0), (2, 0), (3, 0)], [(5, 5), (5, 4), (5, 3)])
+    moves = legal_moves(state)
+    assert "down" in moves
+    result = mcts_search(state, moves, get_weights(), None, 2, iterations=400)
+    best = max(result.scores, key=lambda item: item[1])[0]
+    assert best != "down"
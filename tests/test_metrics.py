@@ -0,0 +1,72 @@
+import json
+import multiprocessing
+import os
+
+import main
+import metrics
+from evaluation import TERMS
+from tools.board_fixtures import FIXTURE_DIR
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_hist", "help", (1, 5), labels=(("term", "x"),))
+    for value in (0.5, 3, 3, 9):
+        histogram.observe(value)
+    lines = histogram.render()
+    assert lines == [
+        'test_hist_bucket{term="x",le="1"} 1',
+        'test_hist_bucket{term="x",le="5"} 3',
+        'test_hist_bucket{term="x",le="+Inf"} 4',
+        'test_hist_sum{term="x"} 15.5',
+        'test_hist_count{term="x"} 4',
+    ]
+
+
+def test_term_histograms_cover_every_evaluation_term():
+    assert set(metrics.TERM_SECONDS) == {name for name, _ in TERMS}
+
+
+def _observe_in_child():
+    metrics.NODES.observe(7)
+
+
+def test_histograms_are_shared_with_forked_workers():
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return
+    before = metrics.NODES.render()[-1]
+    child = multiprocessing.get_context("fork").Process(target=_observe_in_child)
+    child.start()
+    child.join()
+    count = float(metrics.NODES.render()[-1].split()[-1])
+    assert count == float(before.split()[-1]) + 1
+
+
+def test_move_publishes_search_counters():
+    with open(os.path.join(FIXTURE_DIR, "crowded_midgame.json"), encoding="utf-8") as handle:
+        payload = json.load(handle)
+    saved = main.LOOKAHEAD_DEPTH, main.FALLBACK_MS
+    main.LOOKAHEAD_DEPTH, main.FALLBACK_MS = 1, 1000
+    moves_before = metrics.MOVES.render()[0]
+    try:
+        response, result = main.decide(payload)
+    finally:
+        main.LOOKAHEAD_DEPTH, main.FALLBACK_MS = saved
+    assert result is not None and result.depth == 1
+    assert metrics.counters.nodes > 0
+    assert metrics.counters.simulated > 0
+    assert metrics.counters.evaluations > 0
+    assert float(metrics.MOVES.render()[0].split()[-1]) == float(moves_before.split()[-1]) + 1
+
+    text = metrics.render()
+    assert "# TYPE battlesnake_move_nodes histogram" in text
+    assert text.count("# TYPE battlesnake_eval_term_seconds histogram") == 1
+    assert 'battlesnake_move_depth_bucket{le="1"}' in text
+
+
+def test_warm_up_is_not_counted_as_a_move():
+    before = [line for metric in metrics.METRICS for line in metric.render()]
+    main.warm_up()
+    after = [line for metric in metrics.METRICS for line in metric.render()]
+    assert after == before
+    assert main.WARM_UP_GAME not in main.sessions
+    assert metrics.counters.nodes == 0
@@ -0,0 +1,56 @@
+from board import is_body_collision
+from simulate import apply_moves, undo
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "occupancy"},
+        "turn": 0,
+        "board": {
+            "height": 5,
+            "width": 5,
+            "food": [],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 2, "y": 2}, {"x": 2, "y": 1}, {"x": 2, "y": 0}],
+                    "head": {"x": 2, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 4, "y": 2}, {"x": 4, "y": 1}, {"x": 4, "y": 1}],
+                    "head": {"x": 4, "y": 2},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_index_marks_owner_segment_and_stacked_tail():
+    state = GameState.from_json(_build_state())
+    index = state.occupancy()
+    assert index[(2, 2)] == ("me", 0, False)
+    assert index[(2, 0)] == ("me", 2, True)
+    assert index[(4, 1)] == ("opp", 1, False)
+    opp = state.snakes["opp"]
+    assert is_body_collision(state, (4, 1), opp, will_eat=False)
+    assert not is_body_collision(state, (2, 0), state.me, will_eat=False)
+    assert is_body_collision(state, (2, 0), state.me, will_eat=True)
+
+
+def test_index_is_rebuilt_after_apply_and_undo():
+    state = GameState.from_json(_build_state())
+    state.occupancy()
+    record = apply_moves(state, {"me": "left", "opp": "up"})
+    assert (2, 0) not in state.occupancy()
+    assert state.occupancy()[(1, 2)] == ("me", 0, False)
+    undo(state, record)
+    assert state.occupancy()[(2, 0)] == ("me", 2, True)
+    assert (1, 2) not in state.occupancy()
@@ -0,0 +1,78 @@
+from algorithms.opponent_model import follow_up_degree, rank_opponent_moves
+from board import move_targets
+from policy import legal_moves_for_snake
+from simulate import apply_snake_move, undo
+from tests.payloads import board_state, snake
+from tools.board_fixtures import FIXTURES, load_fixture
+
+
+def _state(snakes, food=()):
+    return board_state(snakes, food=food, turn=9, game_id="opponent-model")
+
+
+def _reference_degree(state, snake, move):
+    record = apply_snake_move(state, snake.id, move)
+    try:
+        return len(legal_moves_for_snake(state, snake))
+    finally:
+        undo(state, record)
+
+
+def _assert_degrees_match(state):
+    for snake in state.active_snakes:
+        for move, target in move_targets(state, snake.head).items():
+            if not state.inside(target):
+                continue
+            assert follow_up_degree(state, snake, target) == _reference_degree(state, snake, move), (
+                snake.id,
+                move,
+            )
+
+
+def test_degree_matches_make_unmake_on_fixtures():
+    for name in FIXTURES:
+        _assert_degrees_match(load_fixture(name))
+
+
+def test_degree_handles_eating_stacked_tails_and_head_to_heads():
+    state = _state(
+        [
+            snake("me", [(3, 3), (3, 2), (2, 2), (2, 3)]),
+            # Just ate: the tail is stacked and stays put next turn.
+            snake("fed", [(5, 3), (5, 2), (5, 1), (5, 1)]),
+            snake("long", [(3, 5), (2, 5), (1, 5), (0, 5), (0, 4)]),
+        ],
+        food=[(4, 3), (2, 4)],
+    )
+    _assert_degrees_match(state)
+
+
+def test_ranking_is_copy_free_and_matches_the_reference_scores():
+    state = load_fixture("large_8_snake")
+    food = set(state.food)
+    bodies = {snake.id: list(snake.body) for snake in state.active_snakes}
+    rankings = rank_opponent_moves(state, 4)
+    assert set(rankings) == {opponent.id for opponent in state.opponents}
+    for opponent in state.opponents:
+        moves = [move for move, _ in rankings[opponent.id]]
+        assert sorted(moves) == sorted(legal_moves_for_snake(state, opponent))
+        scores = [score for _, score in rankings[opponent.id]]
+        assert scores == sorted(scores, reverse=True)
+    assert state.food == food
+    assert {snake.id: list(snake.body) for snake in state.active_snakes} == bodies
+
+
+def test_ranking_prefers_open_space_then_food_when_hungry():
+    # From (1, 1) next to the corner, right leaves three safe moves, left and down two.
+    # Safe moves + 1 / (distance to other food + 1) when hungry + 0.1 * length.
+    me = snake("me", [(5, 6), (5, 5), (5, 4)])
+    calm = _state([me, snake("opp", [(1, 1), (1, 2), (1, 3)], health=90)], food=[(0, 3)])
+    ranking = [(move, round(score, 3)) for move, score in rank_opponent_moves(calm, 3)["opp"]]
+    assert ranking[0] == ("right", 3.3)
+    assert sorted(ranking[1:]) == [("down", 2.3), ("left", 2.3)]
+
+    hungry = _state([me, snake("opp", [(1, 1), (1, 2), (1, 3)], health=5)], food=[(0, 3)])
+    ranking = rank_opponent_moves(hungry, 3)["opp"]
+    assert [move for move, _ in ranking] == ["right", "left", "down"]
+    assert [round(score, 3) for _, score in ranking] == [3.5, 2.633, 2.5]
+    assert rank_opponent_moves(hungry, 2)["opp"] == ranking[:2]
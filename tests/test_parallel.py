@@ -0,0 +1,104 @@
+import threading
+import time
+
+from config import get_weights
+from parallel import RootPool
+from policy import legal_moves
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "parallel"},
+        "turn": 4,
+        "board": {
+            "height": 7,
+            "width": 7,
+            "food": [{"x": 5, "y": 5}],
+            "hazards": [{"x": 0, "y": 0}],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 4, "y": 4}, {"x": 4, "y": 3}, {"x": 4, "y": 2}],
+                    "head": {"x": 4, "y": 4},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_compact_round_trip():
+    state = GameState.from_json(_build_state())
+    restored = GameState.from_compact(state.to_compact())
+    assert restored.food == state.food
+    assert restored.hazards == state.hazards
+    assert restored.me.body == state.me.body
+    assert restored.snakes["opp"].health == 90
+
+
+def test_pool_scores_every_root_move_within_deadline():
+    state = GameState.from_json(_build_state())
+    moves = legal_moves(state)
+    pool = RootPool(2)
+    try:
+        start = time.perf_counter()
+        result = pool.search(state, moves, get_weights(), start + 0.3, 3, 2, 1)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    assert [move for move, _ in result.scores] == moves
+    assert result.depth >= 1
+    assert elapsed < 0.5
+
+
+def test_pool_reaches_real_depth_with_fewer_workers_than_moves():
+    state = GameState.from_json(_build_state())
+    moves = legal_moves(state)
+    assert len(moves) == 3
+    for processes in (1, 2):
+        pool = RootPool(processes)
+        try:
+            depths = []
+            for _ in range(2):
+                start = time.perf_counter()
+                result = pool.search(state, moves, get_weights(), start + 0.25, 6, 3, 2)
+                assert time.perf_counter() - start < 0.35
+                assert [move for move, _ in result.scores] == moves
+                depths.append(result.depth)
+        finally:
+            pool.close()
+        # In-process search reaches depth 4 on this board in the same budget.
+        assert min(depths) >= 2, (processes, depths)
+
+
+def test_concurrent_searches_keep_their_own_results():
+    state = GameState.from_json(_build_state())
+    moves = legal_moves(state)[:2]
+    pool = RootPool(4)
+    results = {}
+
+    def run(name):
+        start = time.perf_counter()
+        results[name] = pool.search(state, moves, get_weights(), start + 0.3, 6, 2, 1)
+
+    try:
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.close()
+    for name in ("a", "b"):
+        assert [move for move, _ in results[name].scores] == moves
+        assert results[name].depth >= 2, (name, results[name].depth)
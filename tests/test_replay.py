@@ -0,0 +1,51 @@
+import io
+import json
+import os
+import tempfile
+
+import main
+from tools.board_fixtures import FIXTURE_DIR
+from tools.replay import InProcessMover, iter_payloads, replay
+
+
+def _write_corpus(directory):
+    path = os.path.join(directory, "moves.jsonl")
+    with open(path, "w", encoding="utf-8") as handle:
+        for name in ("early_game", "duel_endgame"):
+            with open(os.path.join(FIXTURE_DIR, f"{name}.json"), encoding="utf-8") as fixture:
+                handle.write(json.dumps(json.load(fixture)) + "\n")
+        handle.write('{"request_id": "not-a-move"}\n')
+        handle.write("\n")
+    return path
+
+
+def test_iter_payloads_skips_other_lines():
+    with tempfile.TemporaryDirectory() as directory:
+        rows = list(iter_payloads(_write_corpus(directory)))
+    assert [number for number, _ in rows] == [1, 2, 3, 4]
+    assert [payload is not None for _, payload in rows] == [True, True, False, False]
+
+
+def test_replay_reports_and_diffs_decisions():
+    saved = main.LOOKAHEAD_DEPTH, main.FALLBACK_MS
+    main.LOOKAHEAD_DEPTH, main.FALLBACK_MS = 1, 50
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = _write_corpus(directory)
+            decisions = io.StringIO()
+            report = replay(corpus, InProcessMover(), decisions=decisions)
+            assert report["requests"] == 2
+            assert report["skipped"] == 2
+            assert sum(report["depths"].values()) == 2
+            assert "deadline_hits" in report
+
+            rows = [json.loads(line) for line in decisions.getvalue().splitlines()]
+            assert [row["line"] for row in rows] == [1, 2]
+            rows[1]["move"] = "nowhere"
+            reference = io.StringIO("".join(json.dumps(row) + "\n" for row in rows))
+            diffed = replay(corpus, InProcessMover(), reference=reference)
+            assert diffed["compared"] == 2
+            assert diffed["changed"] == 1
+            assert diffed["changed_examples"][0]["line"] == 2
+    finally:
+        main.LOOKAHEAD_DEPTH, main.FALLBACK_MS = saved
@@ -0,0 +1,60 @@
+import time
+
+from algorithms.search import iterative_deepening
+from config import get_weights
+from policy import legal_moves
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "search"},
+        "turn": 0,
+        "board": {
+            "height": 7,
+            "width": 7,
+            "food": [{"x": 5, "y": 5}],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 4, "y": 4}, {"x": 4, "y": 3}, {"x": 4, "y": 2}],
+                    "head": {"x": 4, "y": 4},
+                },
+            ],
+        },
+        "you": {
+            "id": "me",
+            "name": "Me",
+            "health": 90,
+            "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+            "head": {"x": 1, "y": 2},
+        },
+    }
+
+
+def test_expired_deadline_still_scores_every_root_move():
+    state = GameState.from_json(_build_state())
+    moves = legal_moves(state)
+    result = iterative_deepening(state, moves, get_weights(), time.perf_counter() - 1.0, 4, 2, 1)
+    assert result.depth == 0
+    assert result.deadline_hit
+    assert [move for move, _ in result.scores] == moves
+
+
+def test_deepens_until_max_depth_without_deadline():
+    state = GameState.from_json(_build_state())
+    body_before = list(state.me.body)
+    result = iterative_deepening(state, legal_moves(state), get_weights(), None, 2, 2, 1)
+    assert result.depth == 2
+    assert not result.deadline_hit
+    assert state.me.body == body_before
@@ -0,0 +1,44 @@
+import http.client
+import json
+import socket
+import threading
+
+from server import BattlesnakeRequestHandler, _WorkerHTTPServer
+
+
+def test_keep_alive_handler_serves_routes_on_one_connection():
+    calls = []
+    handlers = {
+        "info": lambda: {"apiversion": "1"},
+        "start": lambda game_state: calls.append("start"),
+        "move": lambda game_state: {"move": "up", "turn": game_state["turn"]},
+        "end": lambda game_state: calls.append("end"),
+        "metrics": lambda: "battlesnake_moves_total 3\n",
+    }
+    handler_class = type("Handler", (BattlesnakeRequestHandler,), {"handlers": handlers})
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    server = _WorkerHTTPServer(listener, handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", listener.getsockname()[1], timeout=5)
+        for turn in range(3):
+            connection.request("POST", "/move", json.dumps({"turn": turn}))
+            response = connection.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read()) == {"move": "up", "turn": turn}
+        connection.request("POST", "/start", "{}")
+        assert connection.getresponse().read() == b"ok"
+        connection.request("GET", "/")
+        assert json.loads(connection.getresponse().read()) == {"apiversion": "1"}
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        assert response.getheader("Content-Type").startswith("text/plain")
+        assert response.read() == b"battlesnake_moves_total 3\n"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert calls == ["start"]
@@ -0,0 +1,68 @@
+from board import board_center, legal_neighbor_tiles
+from session import SessionStore
+from state import GameState
+
+
+def _request(game_id: str, hazards=()):
+    snake = {"id": "me", "name": "Me", "health": 90, "body": [{"x": 0, "y": 0}]}
+    return {
+        "game": {"id": game_id, "ruleset": {"name": "royale"}},
+        "turn": 0,
+        "board": {
+            "width": 7,
+            "height": 5,
+            "food": [],
+            "hazards": [{"x": x, "y": y} for x, y in hazards],
+            "snakes": [snake],
+        },
+        "you": snake,
+    }
+
+
+def test_sessions_are_dropped_on_end_and_evicted_lru():
+    store = SessionStore(max_sessions=2)
+    store.start(_request("a"))
+    store.start(_request("b"))
+    store.get(_request("a"))  # refresh "a" so "b" is least recently used
+    store.start(_request("c"))
+    assert "a" in store and "c" in store and "b" not in store
+    assert store.evictions == 1
+    store.end("a")
+    assert len(store) == 1
+    assert store.get(_request("late")).game_id == "late"
+
+
+def test_session_tables_and_shared_hazards():
+    store = SessionStore()
+    session = store.start(_request("tables", hazards=[(0, 4)]))
+    assert session.ruleset == "royale"
+    assert session.tables.tiles == 35
+    first = GameState.from_json(_request("tables", hazards=[(0, 4)]))
+    second = GameState.from_json(_request("tables", hazards=[(0, 4)]))
+    session.attach(first)
+    session.attach(second)
+    assert first.hazards is second.hazards
+    assert session.hazards == {(0, 4)}
+    assert board_center(first) == (3, 2)
+    assert sorted(legal_neighbor_tiles(first, (0, 0))) == [(0, 1), (1, 0)]
+
+
+def test_fast_decode_matches_from_json():
+    from tools.board_fixtures import load_payload
+
+    payload = load_payload("large_8_snake")
+    payload["board"]["hazards"] = [{"x": 0, "y": y} for y in range(3)]
+    session = SessionStore().start(payload)
+    decoded = session.decode(payload)
+    reference = GameState.from_json(payload)
+    assert decoded.snakes == reference.snakes
+    assert (decoded.width, decoded.height, decoded.turn, decoded.me_id) == (
+        reference.width,
+        reference.height,
+        reference.turn,
+        reference.me_id,
+    )
+    assert decoded.food == reference.food and decoded.hazards == reference.hazards
+    assert decoded.rng.random() == reference.rng.random()
+    # An unchanged hazard layout reuses the session's set.
+    assert session.decode(payload).hazards is decoded.hazards
@@ -0,0 +1,81 @@
+from algorithms.flood_fill import area_after_move
+from algorithms.space import SpaceAnalysis, space_analysis
+from bitboard import flood_fill_count
+from simulate import apply_moves, hypothetical_after_move_for_snake, undo
+from state import GameState
+from tools.board_fixtures import load_fixture
+
+
+def _wall_state(food=()):
+    # A vertical body at x=2 with one gap at y=2: the gap is the only way between halves.
+    me = {
+        "id": "me",
+        "name": "me",
+        "health": 50,
+        "body": [{"x": 2, "y": 1}, {"x": 2, "y": 0}],
+    }
+    wall = {
+        "id": "wall",
+        "name": "wall",
+        "health": 50,
+        "body": [{"x": 2, "y": 3}, {"x": 2, "y": 4}],
+    }
+    return GameState.from_json(
+        {
+            "game": {"id": "space"},
+            "turn": 0,
+            "board": {
+                "width": 5,
+                "height": 5,
+                "food": [{"x": x, "y": y} for x, y in food],
+                "hazards": [],
+                "snakes": [me, wall],
+            },
+            "you": me,
+        }
+    )
+
+
+def _reference_area(state, snake_id, move):
+    hypo, _ = hypothetical_after_move_for_snake(state, snake_id, move)
+    start = hypo.snakes[snake_id].head
+    blocked = {segment for snake in hypo.active_snakes for segment in snake.body}
+    blocked.discard(start)
+    reachable = flood_fill_count(start, blocked, hypo.width, hypo.height, hypo.wrapped)
+    return reachable, reachable / max(1, hypo.width * hypo.height - len(blocked))
+
+
+def test_components_and_chokes():
+    state = _wall_state()
+    analysis = SpaceAnalysis(state)
+    assert analysis.sizes == [21]
+    assert analysis.is_choke((2, 2))
+    assert sorted(analysis.pieces[(2, 2)]) == [10, 10]
+    assert not analysis.is_choke((0, 0)) and not analysis.is_choke((2, 1))
+    assert analysis.component_size((2, 1)) == 0
+
+
+def test_move_areas_match_flood_fills_after_each_move():
+    state = _wall_state(food=[(1, 1)])
+    analysis = SpaceAnalysis(state)
+    for snake in state.active_snakes:
+        for move, area in analysis.move_areas(snake).items():
+            assert area == _reference_area(state, snake.id, move), (snake.id, move)
+    for name in ("crowded_midgame", "large_8_snake"):
+        fixture = load_fixture(name)
+        analysis = SpaceAnalysis(fixture)
+        for snake in fixture.active_snakes:
+            for move, area in analysis.move_areas(snake).items():
+                assert area == _reference_area(fixture, snake.id, move), (name, snake.id, move)
+
+
+def test_analysis_is_cached_until_bodies_move():
+    state = _wall_state()
+    analysis = space_analysis(state)
+    assert space_analysis(state) is analysis
+    assert area_after_move(state, "up") == analysis.move_area(state.me, "up") == (22, 1.0)
+    record = apply_moves(state, {"me": "up", "wall": "left"})
+    moved = space_analysis(state)
+    assert moved is not analysis and not moved.is_choke((2, 2))
+    undo(state, record)
+    assert space_analysis(state).pieces == analysis.pieces
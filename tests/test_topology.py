@@ -0,0 +1,94 @@
+from algorithms.astar import shortest_path_length
+from algorithms.flood_fill import area_from_state
+from algorithms.tree_reuse import observed_moves
+from bitboard import dilate, geometry, mask_from_points, points_from_mask
+from policy import legal_moves
+from simulate import apply_moves, simulate_turn, undo
+from state import GameState
+from tables import board_tables
+from zobrist import ensure_hash, state_hash
+
+
+def _build_state(ruleset="wrapped"):
+    return {
+        "game": {"id": "topology", "ruleset": {"name": ruleset}},
+        "turn": 4,
+        "board": {
+            "height": 5,
+            "width": 5,
+            "food": [{"x": 4, "y": 4}],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 0, "y": 2}, {"x": 1, "y": 2}, {"x": 2, "y": 2}],
+                    "head": {"x": 0, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 3, "y": 0}, {"x": 3, "y": 1}, {"x": 3, "y": 2}],
+                    "head": {"x": 3, "y": 0},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_ruleset_selects_topology():
+    assert GameState.from_json(_build_state()).wrapped
+    assert not GameState.from_json(_build_state("standard")).wrapped
+    tables = board_tables(5, 5, wrapped=True)
+    assert tables.moves[(0, 2)]["left"] == (4, 2)
+    assert tables.moves[(3, 0)]["down"] == (3, 4)
+    assert (4, 2) in tables.neighbors[(0, 2)]
+    assert board_tables(5, 5).moves[(0, 2)]["left"] == (-1, 2)
+
+
+def test_wrapped_moves_cross_the_edge():
+    wrapped = GameState.from_json(_build_state())
+    standard = GameState.from_json(_build_state("standard"))
+    assert "left" in legal_moves(wrapped)
+    assert "left" not in legal_moves(standard)
+
+    next_state = simulate_turn(wrapped, {"me": "left", "opp": "down"})
+    assert next_state.me.head == (4, 2)
+    assert next_state.snakes["opp"].head == (3, 4)
+    assert not next_state.me.eliminated
+
+
+def test_wrapped_make_unmake_keeps_hash_and_reuse_sees_moves():
+    state = GameState.from_json(_build_state())
+    before = state.copy()
+    ensure_hash(state)
+    record = apply_moves(state, {"me": "left", "opp": "down"})
+    assert state.zobrist == state_hash(state)
+    assert observed_moves(before, state) == {"me": "left", "opp": "down"}
+    undo(state, record)
+    assert state.snakes == before.snakes
+    assert state.zobrist == state_hash(before)
+
+
+def test_wrapped_dilate_and_flood_fill():
+    geo = geometry(5, 5, wrapped=True)
+    grown = set(points_from_mask(dilate(mask_from_points([(0, 0)], 5, 5), geo), 5))
+    assert grown == {(1, 0), (0, 1), (4, 0), (0, 4)}
+
+    # A full column is a wall on a standard board but not on a wrapped one.
+    data = _build_state()
+    data["board"]["snakes"][1]["body"] = [{"x": 2, "y": y} for y in range(5)]
+    data["board"]["snakes"][0]["body"] = [{"x": 0, "y": 2}]
+    wrapped = GameState.from_json(data)
+    data["game"]["ruleset"]["name"] = "standard"
+    standard = GameState.from_json(data)
+    assert area_from_state(standard)[0] == 10
+    assert area_from_state(wrapped)[0] == 20
+
+
+def test_wrapped_shortest_path():
+    assert shortest_path_length((0, 0), [(4, 0)], set(), 5, 5) == 4
+    assert shortest_path_length((0, 0), [(4, 0)], set(), 5, 5, wrapped=True) == 1
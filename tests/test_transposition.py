@@ -0,0 +1,98 @@
+import itertools
+
+from algorithms.lookahead import beam_search
+from algorithms.transposition import TranspositionTable
+from config import get_weights
+from simulate import apply_moves, apply_snake_move, undo
+from state import GameState
+from zobrist import ZobristKeys, ensure_hash, state_hash
+
+
+def _build_state():
+    return {
+        "game": {"id": "zobrist"},
+        "turn": 2,
+        "board": {
+            "height": 6,
+            "width": 6,
+            "food": [{"x": 2, "y": 3}, {"x": 4, "y": 4}],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 1,
+                    "body": [{"x": 3, "y": 3}, {"x": 3, "y": 2}, {"x": 3, "y": 2}],
+                    "head": {"x": 3, "y": 3},
+                },
+            ],
+        },
+        "you": {
+            "id": "me",
+            "name": "Me",
+            "health": 90,
+            "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+            "head": {"x": 1, "y": 2},
+        },
+    }
+
+
+def test_incremental_hash_matches_full_recompute():
+    state = GameState.from_json(_build_state())
+    root_hash = ensure_hash(state)
+    for my_move, opp_move in itertools.product(["up", "down", "left", "right"], repeat=2):
+        record = apply_moves(state, {"me": my_move, "opp": opp_move})
+        assert state.zobrist == state_hash(state)
+        single = apply_snake_move(state, "me", "up")
+        assert state.zobrist == state_hash(state)
+        undo(state, single)
+        undo(state, record)
+        assert state.zobrist == root_hash
+
+
+def test_table_replacement_and_hits():
+    table = TranspositionTable(size_bits=2)
+    table.store(5, 2, 1.5)
+    assert table.probe(5, 1) == 1.5
+    assert table.probe(5, 3) is None
+    table.store(9, 1, 7.0)  # same slot, shallower: keeps the deeper entry
+    assert table.probe(5, 2) == 1.5
+    table.new_search()
+    table.store(9, 1, 7.0)  # older generation gets replaced
+    assert table.probe(9, 1) == 7.0
+    assert table.hits == 3
+
+
+def test_beam_search_reuses_positions_across_root_moves():
+    state = GameState.from_json(_build_state())
+    table = TranspositionTable()
+    weights = get_weights()
+    for move in ["up", "right", "left"]:
+        beam_search(state, move, depth=2, beam_width=3, opp_topk=2, weights=weights, table=table)
+    assert table.hits > 0
+    assert state.zobrist == state_hash(state)
+
+
+def test_keys_stay_bounded_across_games_and_hash_hazards():
+    keys = ZobristKeys(seed=1)
+    sizes = []
+    for game in range(30):
+        data = _build_state()
+        for snake in data["board"]["snakes"]:
+            snake["id"] = f"{snake['id']}-{game}"
+        data["you"]["id"] = f"me-{game}"
+        state_hash(GameState.from_json(data), keys)
+        sizes.append(keys.size())
+    assert sizes[0] == sizes[-1]
+
+    plain = GameState.from_json(_build_state())
+    hazards = _build_state()
+    hazards["board"]["hazards"] = [{"x": 0, "y": 0}]
+    assert state_hash(plain) != state_hash(GameState.from_json(hazards))
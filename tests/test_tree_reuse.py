@@ -0,0 +1,67 @@
+from algorithms.lookahead import beam_search
+from algorithms.transposition import TranspositionTable
+from algorithms.tree_reuse import GameMemory, observed_moves
+from config import get_weights
+from simulate import simulate_turn
+from state import GameState
+
+
+def _build_state():
+    return {
+        "game": {"id": "reuse"},
+        "turn": 10,
+        "board": {
+            "height": 7,
+            "width": 7,
+            "food": [],
+            "hazards": [],
+            "snakes": [
+                {
+                    "id": "me",
+                    "name": "Me",
+                    "health": 90,
+                    "body": [{"x": 1, "y": 2}, {"x": 1, "y": 1}, {"x": 1, "y": 0}],
+                    "head": {"x": 1, "y": 2},
+                },
+                {
+                    "id": "opp",
+                    "name": "Opp",
+                    "health": 90,
+                    "body": [{"x": 4, "y": 4}, {"x": 4, "y": 3}, {"x": 4, "y": 2}],
+                    "head": {"x": 4, "y": 4},
+                },
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_observed_moves_follow_head_deltas():
+    previous = GameState.from_json(_build_state())
+    current = simulate_turn(previous, {"me": "up", "opp": "left"})
+    assert observed_moves(previous, current) == {"me": "up", "opp": "left"}
+
+
+def test_matching_turn_keeps_table_and_hits_previous_subtree():
+    memory = GameMemory()
+    root = GameState.from_json(_build_state())
+    assert not memory.observe(root)
+    weights = get_weights()
+    for move in ["up", "right"]:
+        beam_search(root, move, depth=2, beam_width=2, opp_topk=1, weights=weights, table=memory.table)
+    memory.remember(root)
+
+    data = _build_state()
+    data["turn"] = 11
+    data["board"]["snakes"][0]["body"] = [{"x": 1, "y": 3}, {"x": 1, "y": 2}, {"x": 1, "y": 1}]
+    data["board"]["snakes"][0]["health"] = 89
+    data["board"]["snakes"][1]["body"] = [{"x": 4, "y": 5}, {"x": 4, "y": 4}, {"x": 4, "y": 3}]
+    data["board"]["snakes"][1]["health"] = 89
+    current = GameState.from_json(data)
+    assert memory.observe(current)
+    cold = TranspositionTable()
+    beam_search(current, "up", depth=1, beam_width=2, opp_topk=1, weights=weights, table=cold)
+    hits_before = memory.table.hits
+    beam_search(current, "up", depth=1, beam_width=2, opp_topk=1, weights=weights, table=memory.table)
+    assert memory.table.hits - hits_before > cold.hits
+    assert memory.matched_turns == 1
@@ -0,0 +1,70 @@
+from algorithms.voronoi import voronoi_control, voronoi_regions
+from config import get_weights
+from evaluation import score_state
+from state import GameState
+
+
+def _build_state():
+    # Our body is a wall along x=1 that shuts the opponent into the x=0 column.
+    wall = [{"x": 1, "y": y} for y in range(5)]
+    return {
+        "game": {"id": "voronoi"},
+        "turn": 0,
+        "board": {
+            "height": 5,
+            "width": 5,
+            "food": [],
+            "hazards": [],
+            "snakes": [
+                {"id": "me", "name": "Me", "health": 90, "body": wall},
+                {"id": "opp", "name": "Opp", "health": 90, "body": [{"x": 0, "y": 2}]},
+            ],
+        },
+        "you": {"id": "me"},
+    }
+
+
+def test_bodies_wall_off_territory():
+    state = GameState.from_json(_build_state())
+    result = voronoi_regions(state)
+    counts = result.counts
+    assert counts["me"] == 16
+    assert counts["opp"] == 3
+    assert result.owner_of((2, 2)) == "me"
+    assert result.owner_of((0, 4)) == "opp"
+    grid = result.owner_grid()
+    assert grid[2 * 5 + 1] == -1
+    assert voronoi_control(state) == 16 / 19
+
+
+def test_equidistant_cells_are_contested():
+    data = _build_state()
+    data["board"]["snakes"][0]["body"] = [{"x": 0, "y": 2}]
+    data["board"]["snakes"][1]["body"] = [{"x": 4, "y": 2}]
+    state = GameState.from_json(data)
+    result = voronoi_regions(state)
+    assert result.owner_of((2, 2)) is None
+    assert result.contested & (1 << (2 * 5 + 2))
+    assert result.counts["me"] == result.counts["opp"]
+
+
+def test_tail_timing_opens_vacated_segments():
+    state = GameState.from_json(_build_state())
+    static = voronoi_regions(state).counts
+    timed = voronoi_regions(state, tail_timing=True).counts
+    assert timed["opp"] > static["opp"]
+
+
+def test_eliminated_snake_owns_nothing_and_still_scores():
+    data = _build_state()
+    data["board"]["snakes"].append(
+        {"id": "third", "name": "Third", "health": 90, "body": [{"x": 4, "y": 4}]}
+    )
+    state = GameState.from_json(data)
+    state.snakes["me"].eliminated = True
+    state.invalidate_occupancy()
+    result = voronoi_regions(state)
+    assert "me" not in result.snake_ids
+    assert result.count("me") == 0
+    assert voronoi_control(state) == 0.0
+    assert isinstance(score_state(state, get_weights()), float)
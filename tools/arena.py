@@ -0,0 +1,405 @@
+"""
+Headless self-play arena: plays full games of main.move against itself or other configs.
+
+    python -m tools.arena --games 200 --processes 4 --player base --player fast:FALLBACK_MS=40
+
+A player is `name[:KNOB=value,...]`, where each KNOB is a config.py constant (search
+budget, depth, weights...). Seats rotate between players so every player sees every
+starting corner. Turns are resolved with simulate.apply_moves; food spawns as in the
+standard ruleset and the royale ruleset grows hazards from a random edge. Every game is
+seeded from --seed, so boards and spawns replay exactly; moves still depend on how far
+each search got before its deadline.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import config
+from simulate import apply_moves
+from state import GameState, Point, Snake
+from tools.loadtest import percentile
+
+START_LENGTH = 3
+START_HEALTH = 100
+
+# Knobs that take effect when rebound for one player's moves: main's search settings,
+# weights (read by get_weights) and the knobs the engine reads from config on each use.
+# Anything else (SEED, POOL_SIZE, journal and metrics settings, ...) is fixed when a
+# module is imported or a process starts, so overriding it would silently do nothing.
+TUNABLE_KNOBS = frozenset(
+    (
+        "FALLBACK_MS",
+        "LOOKAHEAD_DEPTH",
+        "BEAM_WIDTH",
+        "OPP_TOPK",
+        "TOPK_RANDOM",
+        "TIE_MARGIN",
+        "SEARCH_ENGINE",
+        "LOW_HEALTH",
+        "TT_BITS",
+        "ALPHABETA_RADIUS",
+        "MCTS_EXPLORATION",
+        "MCTS_ROLLOUT_DEPTH",
+        "MCTS_ITERATIONS",
+    )
+) | frozenset(name for name in vars(config) if name.startswith("W_"))
+
+
+@dataclass(frozen=True)
+class Player:
+    name: str
+    overrides: Tuple[Tuple[str, object], ...] = ()
+
+    @classmethod
+    def parse(cls, spec: str) -> "Player":
+        name, _, knobs = spec.partition(":")
+        overrides = []
+        for item in filter(None, knobs.split(",")):
+            key, _, raw = item.partition("=")
+            key = key.strip().upper()
+            if not hasattr(config, key) or not key.isupper():
+                raise ValueError(f"Unknown config knob {key!r} in player {spec!r}")
+            if key not in TUNABLE_KNOBS:
+                raise ValueError(f"Config knob {key!r} cannot be overridden per player in {spec!r}")
+            current = getattr(config, key)
+            value = raw.strip() == "1" if isinstance(current, bool) else type(current)(raw)
+            overrides.append((key, value))
+        return cls(name or spec, tuple(overrides))
+
+
+@dataclass(frozen=True)
+class ArenaConfig:
+    width: int = 11
+    height: int = 11
+    snakes: int = 4
+    max_turns: int = 500
+    ruleset: str = "standard"  # "standard", "royale" or "wrapped"
+    food_spawn_chance: int = 15  # Percent chance per turn of one extra pellet.
+    minimum_food: int = 1
+    shrink_every: int = 25  # Royale only: turns between hazard growth steps.
+
+
+@dataclass
+class GameRecord:
+    seed: int
+    seats: List[str]
+    winner: Optional[str]
+    turns: int
+    moves: int
+    seconds: float
+    latencies_ms: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def start_positions(width: int, height: int) -> List[Point]:
+    """
+    Battlesnake-style spawn points: corners first, then edge midpoints, one cell in.
+    """
+    low_x, mid_x, high_x = 1, (width - 1) // 2, width - 2
+    low_y, mid_y, high_y = 1, (height - 1) // 2, height - 2
+    return [
+        (low_x, low_y),
+        (high_x, high_y),
+        (low_x, high_y),
+        (high_x, low_y),
+        (mid_x, low_y),
+        (mid_x, high_y),
+        (low_x, mid_y),
+        (high_x, mid_y),
+    ]
+
+
+def new_game(seed: int, arena: ArenaConfig) -> Tuple[GameState, random.Random]:
+    rng = random.Random(seed)
+    spots = start_positions(arena.width, arena.height)
+    if arena.snakes > len(spots):
+        raise ValueError(f"At most {len(spots)} snakes can spawn")
+    chosen = spots[: arena.snakes]
+    rng.shuffle(chosen)
+    snakes = {
+        f"snake-{index}": Snake(
+            id=f"snake-{index}",
+            name=f"snake-{index}",
+            health=START_HEALTH,
+            body=[head] * START_LENGTH,
+        )
+        for index, head in enumerate(chosen)
+    }
+    state = GameState(
+        arena.width,
+        arena.height,
+        0,
+        snakes,
+        "snake-0",
+        rng=random.Random(seed),
+        wrapped=arena.ruleset == "wrapped",
+    )
+    center = ((arena.width - 1) // 2, (arena.height - 1) // 2)
+    taken = {head for head in chosen}
+    for x, y in chosen:
+        options = [
+            (x + dx, y + dy)
+            for dx, dy in ((-1, -1), (-1, 1), (1, -1), (1, 1))
+            if state.inside((x + dx, y + dy)) and (x + dx, y + dy) not in taken
+        ]
+        if options:
+            pellet = rng.choice(options)
+            state.food.add(pellet)
+            taken.add(pellet)
+    if center not in taken:
+        state.food.add(center)
+    return state, rng
+
+
+def spawn_food(state: GameState, rng: random.Random, arena: ArenaConfig) -> None:
+    wanted = 0
+    if len(state.food) < arena.minimum_food:
+        wanted = arena.minimum_food - len(state.food)
+    elif arena.food_spawn_chance > 0 and rng.randrange(100) < arena.food_spawn_chance:
+        wanted = 1
+    if not wanted:
+        return
+    occupied: Set[Point] = set(state.food)
+    for snake in state.active_snakes:
+        occupied.update(snake.body)
+    free = [
+        (x, y)
+        for x in range(state.width)
+        for y in range(state.height)
+        if (x, y) not in occupied
+    ]
+    for pellet in rng.sample(free, min(wanted, len(free))):
+        state.food.add(pellet)
+
+
+def grow_hazards(state: GameState, rng: random.Random, arena: ArenaConfig) -> None:
+    """
+    Royale rule: every `shrink_every` turns one random edge of the safe box turns to hazard.
+    """
+    if arena.ruleset != "royale" or arena.shrink_every <= 0:
+        return
+    if state.turn == 0 or state.turn % arena.shrink_every:
+        return
+    xs = [x for x in range(state.width) if any((x, y) not in state.hazards for y in range(state.height))]
+    ys = [y for y in range(state.height) if any((x, y) not in state.hazards for x in range(state.width))]
+    if not xs or not ys:
+        return
+    side = rng.randrange(4)
+    if side == 0:
+        cells = [(min(xs), y) for y in range(state.height)]
+    elif side == 1:
+        cells = [(max(xs), y) for y in range(state.height)]
+    elif side == 2:
+        cells = [(x, min(ys)) for x in range(state.width)]
+    else:
+        cells = [(x, max(ys)) for x in range(state.width)]
+    state.hazards.update(cells)
+
+
+def move_request(state: GameState, snake_id: str, game_id: str, arena: ArenaConfig) -> Dict:
+    """
+    The /move body `snake_id` would receive for `state`.
+    """
+
+    def snake_json(snake: Snake) -> Dict:
+        body = [{"x": x, "y": y} for x, y in snake.body]
+        return {
+            "id": snake.id,
+            "name": snake.name,
+            "health": snake.health,
+            "body": body,
+            "head": body[0],
+            "length": snake.length,
+            "latency": "0",
+            "shout": "",
+        }
+
+    snakes = [snake_json(snake) for snake in state.active_snakes]
+    return {
+        "game": {"id": game_id, "ruleset": {"name": arena.ruleset}, "timeout": 500},
+        "turn": state.turn,
+        "board": {
+            "width": state.width,
+            "height": state.height,
+            "food": [{"x": x, "y": y} for x, y in sorted(state.food)],
+            "hazards": [{"x": x, "y": y} for x, y in sorted(state.hazards)],
+            "snakes": snakes,
+        },
+        "you": snake_json(state.snakes[snake_id]),
+    }
+
+
+class _Overrides:
+    """
+    Temporarily rebinds config knobs, in config itself and wherever main imported them.
+    """
+
+    def __init__(self, overrides: Sequence[Tuple[str, object]]) -> None:
+        self.overrides = overrides
+        self.saved: List[Tuple[object, str, object]] = []
+
+    def __enter__(self) -> None:
+        import main
+
+        for key, value in self.overrides:
+            for module in (config, main):
+                if hasattr(module, key):
+                    self.saved.append((module, key, getattr(module, key)))
+                    setattr(module, key, value)
+
+    def __exit__(self, *exc) -> None:
+        for module, key, value in reversed(self.saved):
+            setattr(module, key, value)
+        self.saved.clear()
+
+
+def play_game(seed: int, players: Sequence[Player], arena: ArenaConfig) -> GameRecord:
+    """
+    Plays one game to the last survivor (or `max_turns`). Seat i is driven by players[i];
+    each seat gets its own game id so per-game search memory is not shared between seats.
+    """
+    import main
+
+    state, rng = new_game(seed, arena)
+    seats = {f"snake-{index}": players[index] for index in range(arena.snakes)}
+    latencies: Dict[str, List[float]] = {player.name: [] for player in players}
+    moves = 0
+    start = time.perf_counter()
+    while len(state.active_snakes) > 1 and state.turn < arena.max_turns:
+        move_map: Dict[str, str] = {}
+        for snake in state.active_snakes:
+            player = seats[snake.id]
+            request = move_request(state, snake.id, f"arena-{seed}-{snake.id}", arena)
+            with _Overrides(player.overrides):
+                began = time.perf_counter()
+                move_map[snake.id] = main.move(request)["move"]
+                latencies[player.name].append((time.perf_counter() - began) * 1000.0)
+            moves += 1
+        apply_moves(state, move_map)
+        spawn_food(state, rng, arena)
+        grow_hazards(state, rng, arena)
+    for sid in seats:
+        main.sessions.end(f"arena-{seed}-{sid}")
+
+    survivors = state.active_snakes
+    winner = seats[survivors[0].id].name if len(survivors) == 1 else None
+    return GameRecord(
+        seed=seed,
+        seats=[player.name for player in players[: arena.snakes]],
+        winner=winner,
+        turns=state.turn,
+        moves=moves,
+        seconds=time.perf_counter() - start,
+        latencies_ms=latencies,
+    )
+
+
+def _seating(players: Sequence[Player], game_index: int, seats: int) -> List[Player]:
+    return [players[(game_index + seat) % len(players)] for seat in range(seats)]
+
+
+def _init_worker() -> None:
+    logging.getLogger("battlesnake").setLevel(logging.ERROR)
+
+
+def _play(args: Tuple[int, List[Player], ArenaConfig]) -> GameRecord:
+    return play_game(*args)
+
+
+def run_arena(
+    games: int,
+    players: Sequence[Player],
+    arena: ArenaConfig,
+    processes: int = 0,
+    seed: int = 0,
+) -> Dict:
+    """
+    Plays `games` games (in a process pool when `processes` > 0) and summarises throughput,
+    per-player move latency and win rates. Draws count games with no single survivor.
+    """
+    tasks = [(seed + index, _seating(players, index, arena.snakes), arena) for index in range(games)]
+    start = time.perf_counter()
+    records: List[GameRecord]
+    if processes > 0:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        with context.Pool(processes, initializer=_init_worker) as pool:
+            records = list(pool.imap_unordered(_play, tasks))
+    else:
+        _init_worker()
+        records = [_play(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+    return summarise(records, players, elapsed)
+
+
+def summarise(records: Sequence[GameRecord], players: Sequence[Player], elapsed: float) -> Dict:
+    total_moves = sum(record.moves for record in records)
+    per_player: Dict[str, Dict] = {}
+    for player in players:
+        name = player.name
+        seated = sum(record.seats.count(name) for record in records)
+        wins = sum(1 for record in records if record.winner == name)
+        latencies = [ms for record in records for ms in record.latencies_ms.get(name, [])]
+        per_player[name] = {
+            "games": seated,
+            "wins": wins,
+            "win_rate": round(wins / seated, 4) if seated else 0.0,
+            "moves": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies, default=0.0), 2),
+        }
+    return {
+        "games": len(records),
+        "draws": sum(1 for record in records if record.winner is None),
+        "seconds": round(elapsed, 3),
+        "games_per_sec": round(len(records) / elapsed, 3) if elapsed else 0.0,
+        "moves_per_sec": round(total_moves / elapsed, 2) if elapsed else 0.0,
+        "mean_turns": round(sum(record.turns for record in records) / len(records), 1) if records else 0.0,
+        "players": per_player,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--player", action="append", default=[], help="name[:KNOB=value,...]; repeatable")
+    parser.add_argument("--snakes", type=int, default=4)
+    parser.add_argument("--width", type=int, default=11)
+    parser.add_argument("--height", type=int, default=11)
+    parser.add_argument("--ruleset", choices=("standard", "royale", "wrapped"), default="standard")
+    parser.add_argument("--max-turns", type=int, default=500)
+    parser.add_argument("--budget-ms", type=int, default=50, help="FALLBACK_MS for players that do not set it")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    players = [Player.parse(spec) for spec in args.player or ["base"]]
+    players = [
+        player
+        if any(key == "FALLBACK_MS" for key, _ in player.overrides)
+        else Player(player.name, player.overrides + (("FALLBACK_MS", args.budget_ms),))
+        for player in players
+    ]
+    if len({player.name for player in players}) != len(players):
+        parser.error("player names must be unique")
+    arena = ArenaConfig(
+        width=args.width,
+        height=args.height,
+        snakes=args.snakes,
+        max_turns=args.max_turns,
+        ruleset=args.ruleset,
+    )
+    print(json.dumps(run_arena(args.games, players, arena, args.processes, args.seed)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,326 @@
+"""
+Microbenchmarks for the hot paths on fixed board fixtures (tools/fixtures/*.json).
+
+    python -m tools.bench                       # time and compare to tools/bench_baseline.json
+    python -m tools.bench --tolerance 0.15      # fail when anything is >15% slower
+    python -m tools.bench --update-baseline     # record this machine's numbers as the baseline
+    python -m tools.bench --throughput          # beam search nodes/second on 4 and 8 snakes
+
+Each benchmark reports the best time per call (microseconds) over --repeat rounds;
+the minimum is the least noisy estimate on a shared machine.
+The exit status is 1 when any benchmark regressed past the tolerance, so the command
+can gate a deploy. The baseline records the environment it was measured in (Python,
+CPU model and count, optional dependencies); a baseline from another environment is
+reported but not gated on. Benchmarks that look regressed are timed again (--retries)
+and only count when they stay slow, so one noisy round does not fail the gate.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from algorithms.flood_fill import _flood_fill
+from algorithms.lookahead import beam_search
+from algorithms.opponent_model import rank_opponent_moves
+from algorithms.search import iterative_deepening
+from algorithms.space import SpaceAnalysis
+from algorithms.voronoi import voronoi_control
+from config import get_weights
+from evaluation import score_state
+from metrics import begin_move, counters
+from policy import legal_moves, legal_moves_for_snake
+from server import loads
+from session import GameSession
+from simulate import simulate_turn
+from state import GameState
+from tools.board_fixtures import FIXTURES, load_fixture, load_payload
+from tools.payloads import synthetic_move_payload
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "bench_baseline.json")
+THROUGHPUT_FIXTURES = ("crowded_midgame", "large_8_snake")
+
+# Search shape for the beam benchmark; fixed so results stay comparable across config changes.
+BEAM_DEPTH = 2
+BEAM_WIDTH = 3
+OPP_TOPK = 2
+
+
+def decode_benchmarks(payload: Dict) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    Request decoding from the raw body: stdlib JSON plus from_json (the old path) against
+    the server's body decoder (orjson when installed) plus the session fast path.
+    """
+    raw = json.dumps(payload).encode("utf-8")
+    session = GameSession.from_request(payload)
+    return [
+        ("decode_from_json", lambda: GameState.from_json(json.loads(raw))),
+        ("decode_session", lambda: session.decode(loads(raw))),
+    ]
+
+
+def _first_moves(state: GameState) -> Dict[str, str]:
+    moves: Dict[str, str] = {}
+    for snake in state.active_snakes:
+        options = legal_moves_for_snake(state, snake)
+        moves[snake.id] = options[0] if options else "up"
+    return moves
+
+
+def _cold(state: GameState, fn: Callable[[], object]) -> Callable[[], object]:
+    """
+    Wraps `fn` so every call starts without the state's occupancy index and derived
+    analyses, as a freshly reached search node does, instead of reusing the first build.
+    """
+
+    def call() -> object:
+        state.invalidate_occupancy()
+        return fn()
+
+    return call
+
+
+def benchmarks(state: GameState) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    (name, zero-argument callable) pairs timed for one fixture. Each call pays for the
+    occupancy index and other per-state caches, like a new search node would.
+    """
+    weights = get_weights()
+    me = state.me
+    blocked = {segment for snake in state.active_snakes for segment in snake.body}
+    blocked.discard(me.head)
+    move_map = _first_moves(state)
+    cases: List[Tuple[str, Callable[[], object]]] = [
+        ("flood_fill", lambda: _flood_fill(me.head, blocked, state.width, state.height, state.wrapped)),
+        ("voronoi_control", lambda: voronoi_control(state)),
+        ("simulate_turn", lambda: simulate_turn(state, move_map)),
+        ("legal_moves", lambda: legal_moves(state)),
+        ("score_state", lambda: score_state(state, weights)),
+        ("rank_opponent_moves", lambda: rank_opponent_moves(state, OPP_TOPK)),
+        ("space_analysis", lambda: SpaceAnalysis(state).move_areas(me)),
+    ]
+    for move in legal_moves(state):
+        cases.append(
+            (
+                f"beam_search[{move}]",
+                lambda move=move: beam_search(
+                    state=state,
+                    root_move=move,
+                    depth=BEAM_DEPTH,
+                    beam_width=BEAM_WIDTH,
+                    opp_topk=OPP_TOPK,
+                    weights=weights,
+                ),
+            )
+        )
+    return [(name, _cold(state, fn)) for name, fn in cases]
+
+
+def time_call(fn: Callable[[], object], repeat: int, min_seconds: float) -> float:
+    """
+    Fastest round's microseconds per call. Each round loops enough calls to last `min_seconds`.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or loops >= 1 << 20:
+            break
+        loops *= 2
+    rounds = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - start) / loops)
+    return min(rounds) * 1e6
+
+
+def run_benchmarks(
+    fixtures: Tuple[str, ...] = FIXTURES,
+    repeat: int = 7,
+    min_seconds: float = 0.05,
+    only: Optional[str] = None,
+) -> Dict[str, float]:
+    """
+    Returns {"<fixture>/<benchmark>": best microseconds per call}.
+    """
+    results: Dict[str, float] = {}
+    for key, fn in benchmark_cases(fixtures, only):
+        results[key] = round(time_call(fn, repeat, min_seconds), 3)
+    return results
+
+
+def benchmark_cases(
+    fixtures: Tuple[str, ...] = FIXTURES, only: Optional[str] = None
+) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    ("<fixture>/<benchmark>", callable) for every benchmark whose name contains `only`.
+    """
+    cases: List[Tuple[str, Callable[[], object]]] = []
+    for fixture in fixtures:
+        payload = load_payload(fixture)
+        for name, fn in benchmarks(GameState.from_json(payload)) + decode_benchmarks(payload):
+            cases.append((f"{fixture}/{name}", fn))
+    # Late-game 19x19 request with eight long snakes, the largest /move bodies we see.
+    long_bodies = synthetic_move_payload(0, 19, 19, snakes=8, max_length=40, food=8)
+    for name, fn in decode_benchmarks(long_bodies):
+        cases.append((f"synthetic_19x19_8_long/{name}", fn))
+
+    return [(key, fn) for key, fn in cases if not only or only in key]
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def environment() -> Dict:
+    """
+    What a timing depends on besides the code: interpreter, CPU model and count, and
+    whether orjson backs the server's body decoder.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count() or 1,
+        "orjson": loads is not json.loads,
+    }
+
+
+def environment_mismatch(current: Dict, recorded: Dict) -> List[str]:
+    """
+    Environment fields that differ from the baseline's.
+    """
+    return sorted(key for key in set(current) | set(recorded) if current.get(key) != recorded.get(key))
+
+
+def load_baseline(path: str) -> Dict:
+    """
+    {"environment": {...}, "results_us": {...}}; a file holding only timings has no environment.
+    """
+    with open(path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    if "results_us" not in baseline:
+        baseline = {"environment": {}, "results_us": baseline}
+    return baseline
+
+
+def search_throughput(
+    fixtures: Tuple[str, ...] = THROUGHPUT_FIXTURES, seconds: float = 1.0, repeat: int = 3
+) -> Dict[str, float]:
+    """
+    Best beam-search nodes expanded per second over `repeat` runs of iterative deepening
+    with a `seconds` deadline, per fixture.
+    """
+    weights = get_weights()
+    results: Dict[str, float] = {}
+    for fixture in fixtures:
+        best = 0.0
+        for _ in range(repeat):
+            state = load_fixture(fixture)
+            begin_move()
+            start = time.perf_counter()
+            iterative_deepening(
+                state, legal_moves(state), weights, start + seconds, 20, BEAM_WIDTH, OPP_TOPK
+            )
+            best = max(best, counters.nodes / (time.perf_counter() - start))
+        results[fixture] = round(best, 1)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[Dict]:
+    """
+    One row per benchmark present in both runs; `regressed` marks ratios above 1 + tolerance.
+    """
+    rows = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        ratio = current / reference
+        rows.append(
+            {
+                "name": key,
+                "baseline_us": reference,
+                "current_us": current,
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1.0 + tolerance,
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="minimum duration of one round")
+    parser.add_argument("--only", help="run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="also write the report JSON to this path")
+    parser.add_argument("--retries", type=int, default=3, help="re-time regressed benchmarks this many times")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--throughput", action="store_true", help="report search nodes/second instead")
+    args = parser.parse_args()
+
+    if args.throughput:
+        print(json.dumps({"nodes_per_sec": search_throughput(repeat=max(1, args.repeat))}, indent=2))
+        return 0
+
+    env = environment()
+    results = run_benchmarks(repeat=max(1, args.repeat), min_seconds=args.min_seconds, only=args.only)
+    report: Dict = {"environment": env, "results_us": results, "tolerance": args.tolerance}
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else None
+    mismatch = environment_mismatch(env, baseline["environment"]) if baseline is not None else []
+    if args.update_baseline:
+        # Merge so that an --only run refreshes just the benchmarks it ran, unless the
+        # old timings come from another environment.
+        recorded = baseline["results_us"] if baseline is not None and not mismatch else {}
+        recorded.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"environment": env, "results_us": recorded}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    elif mismatch:
+        report["environment_mismatch"] = {
+            key: {"baseline": baseline["environment"].get(key), "current": env.get(key)} for key in mismatch
+        }
+    elif baseline is not None:
+        rows = compare(results, baseline["results_us"], args.tolerance)
+        cases = dict(benchmark_cases(only=args.only))
+        for _ in range(max(0, args.retries)):
+            suspects = [row["name"] for row in rows if row["regressed"]]
+            if not suspects:
+                break
+            # Keep the best time seen: a slow round on a busy machine only ever adds time.
+            # Retries run twice as many rounds to outlast a slow stretch.
+            for key in suspects:
+                again = round(time_call(cases[key], 2 * max(1, args.repeat), args.min_seconds), 3)
+                results[key] = min(results[key], again)
+            rows = compare(results, baseline["results_us"], args.tolerance)
+        report["comparison"] = rows
+        report["regressions"] = [row["name"] for row in rows if row["regressed"]]
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,23 @@
+"""
+Recorded /move bodies in tools/fixtures/*.json, shared by the benchmarks, the replay
+harness and the tests.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict
+
+from state import GameState
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURES = ("early_game", "crowded_midgame", "large_8_snake", "duel_endgame")
+
+
+def load_payload(name: str) -> Dict:
+    with open(os.path.join(FIXTURE_DIR, f"{name}.json"), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def load_fixture(name: str) -> GameState:
+    return GameState.from_json(load_payload(name))
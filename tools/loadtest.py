@@ -0,0 +1,103 @@
+"""
+Closed-loop HTTP load test for a running snake server.
+
+    python -m tools.loadtest --url http://127.0.0.1:5000 --concurrency 8 --requests 400
+
+Each client thread keeps one connection alive (reconnecting if the server closes it)
+and posts synthetic /move payloads; the report gives requests/sec and latency percentiles.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from tools.payloads import synthetic_move_payload
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile: the smallest value with at least `pct`% of values at or below it.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _client(url: str, bodies: List[bytes], latencies: List[float], errors: List[str]) -> None:
+    parsed = urlparse(url)
+    connection = None
+    for body in bodies:
+        start = time.perf_counter()
+        for attempt in range(2):
+            if connection is None:
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
+            try:
+                connection.request("POST", "/move", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(f"status {response.status}")
+                if response.getheader("Connection", "").lower() == "close":
+                    connection.close()
+                    connection = None
+                break
+            except (http.client.HTTPException, OSError) as exc:
+                connection.close()
+                connection = None
+                if attempt:
+                    errors.append(repr(exc))
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    if connection is not None:
+        connection.close()
+
+
+def run_load(url: str, concurrency: int, requests: int, snakes: int, size: int) -> Dict:
+    per_client = max(1, requests // concurrency)
+    latencies: List[float] = []
+    errors: List[str] = []
+    threads = []
+    for client in range(concurrency):
+        bodies = [
+            json.dumps(synthetic_move_payload(client * per_client + i, size, size, snakes)).encode("utf-8")
+            for i in range(per_client)
+        ]
+        threads.append(threading.Thread(target=_client, args=(url, bodies, latencies, errors)))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0.0), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--snakes", type=int, default=4)
+    parser.add_argument("--size", type=int, default=11)
+    args = parser.parse_args()
+    print(json.dumps(run_load(args.url, args.concurrency, args.requests, args.snakes, args.size)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Set, Tuple
+
+Point = Tuple[int, int]
+
+
+def synthetic_move_payload(
+    seed: int,
+    width: int = 11,
+    height: int = 11,
+    snakes: int = 4,
+    max_length: int = 10,
+    food: int = 4,
+) -> Dict:
+    """
+    Deterministic /move request with up to `snakes` non-overlapping random-walk bodies.
+    Snakes stop being added once every cell is taken, so small boards get fewer snakes.
+    """
+    if width <= 0 or height <= 0 or snakes <= 0:
+        raise ValueError("synthetic payloads need a non-empty board and at least one snake")
+    rng = random.Random(seed)
+    taken: Set[Point] = set()
+    snake_rows: List[Dict] = []
+    for index in range(snakes):
+        if len(taken) >= width * height:
+            break
+        head = (rng.randrange(width), rng.randrange(height))
+        while head in taken:
+            head = (rng.randrange(width), rng.randrange(height))
+        body = [head]
+        taken.add(head)
+        for _ in range(rng.randint(2, max(2, max_length)) - 1):
+            x, y = body[-1]
+            options = [
+                (x + dx, y + dy)
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= x + dx < width and 0 <= y + dy < height and (x + dx, y + dy) not in taken
+            ]
+            if not options:
+                break
+            step = rng.choice(options)
+            body.append(step)
+            taken.add(step)
+        snake_rows.append(
+            {
+                "id": f"snake-{index}",
+                "name": f"snake-{index}",
+                "health": rng.randint(10, 100),
+                "body": [{"x": x, "y": y} for x, y in body],
+                "head": {"x": body[0][0], "y": body[0][1]},
+                "length": len(body),
+            }
+        )
+    pellets = []
+    for _ in range(food):
+        point = (rng.randrange(width), rng.randrange(height))
+        if point not in taken:
+            pellets.append({"x": point[0], "y": point[1]})
+    return {
+        "game": {"id": f"synthetic-{seed}", "ruleset": {"name": "standard"}, "timeout": 500},
+        "turn": rng.randint(0, 200),
+        "board": {"width": width, "height": height, "food": pellets, "hazards": [], "snakes": snake_rows},
+        "you": snake_rows[0],
+    }
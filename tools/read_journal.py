@@ -0,0 +1,42 @@
+"""
+Decodes a binary decision journal (see journal.py) into one JSON object per line.
+
+    python -m tools.read_journal decisions.bin                 # stats and decisions
+    python -m tools.read_journal decisions.bin --requests      # include the raw /move bodies
+    python -m tools.read_journal decisions.bin --replay > corpus.jsonl
+
+--replay writes only the requests, in the format tools.replay consumes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from journal import read_journal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--requests", action="store_true", help="include each raw request")
+    parser.add_argument("--replay", action="store_true", help="emit only the requests")
+    args = parser.parse_args()
+
+    for record in read_journal(args.path):
+        if args.replay:
+            row = record["request"]
+        else:
+            row = dict(record)
+            request = row.pop("request")
+            row["game"] = request.get("game", {}).get("id", "")
+            row["turn"] = request.get("turn", 0)
+            row["you"] = request.get("you", {}).get("id", "")
+            if args.requests:
+                row["request"] = request
+        sys.stdout.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
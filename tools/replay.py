@@ -0,0 +1,234 @@
+"""
+Replays recorded /move payloads (one JSON object per line) to reproduce latency offline.
+
+    python -m tools.replay moves.jsonl                          # in-process through main.move
+    python -m tools.replay moves.jsonl --url http://127.0.0.1:5000
+    python -m tools.replay moves.jsonl --decisions run.jsonl    # record the moves made
+    python -m tools.replay moves.jsonl --reference run.jsonl    # count changed decisions
+
+The corpus is streamed line by line, so its size is bounded by disk, not memory. Lines
+that are not /move payloads are skipped. In-process runs report how often the search
+stopped at the FALLBACK_MS deadline; HTTP runs can only see responses slower than it.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import logging
+import time
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import FALLBACK_MS
+from tools.loadtest import percentile
+
+
+def iter_payloads(path: str) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """
+    Yields (line number, payload) for every line; payload is None for lines that are
+    blank, not JSON or not a /move request.
+    """
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            line = line.strip()
+            payload = None
+            if line:
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    payload = None
+            if not isinstance(payload, dict) or "board" not in payload or "you" not in payload:
+                payload = None
+            yield number, payload
+
+
+class InProcessMover:
+    """
+    Calls main.decide directly, so the search result (depth, deadline) is visible.
+    """
+
+    def __init__(self) -> None:
+        import main
+
+        self._decide = main.decide
+        logging.getLogger("battlesnake").setLevel(logging.WARNING)
+
+    def __call__(self, payload: Dict) -> Tuple[str, Optional[bool], Optional[int]]:
+        response, result = self._decide(payload)
+        if result is None:
+            return response["move"], None, None
+        return response["move"], result.deadline_hit, result.depth
+
+    def close(self) -> None:
+        pass
+
+
+class HttpMover:
+    """
+    Posts to a running server over one kept-alive connection, reconnecting when it closes.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._connection: Optional[http.client.HTTPConnection] = None
+
+    def __call__(self, payload: Dict) -> Tuple[str, Optional[bool], Optional[int]]:
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in range(2):
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._connection.request("POST", "/move", body, {"Content-Type": "application/json"})
+                response = self._connection.getresponse()
+                data = response.read()
+                if response.getheader("Connection", "").lower() == "close":
+                    self.close()
+                if response.status != 200:
+                    raise RuntimeError(f"/move returned {response.status}")
+                return json.loads(data)["move"], None, None
+            except (http.client.HTTPException, OSError):
+                self.close()
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def replay(
+    path: str,
+    mover,
+    decisions: Optional[IO[str]] = None,
+    reference: Optional[IO[str]] = None,
+    limit: int = 0,
+    budget_ms: float = FALLBACK_MS,
+) -> Dict:
+    """
+    Sends every payload in `path` through `mover` and summarises latency. When `decisions`
+    is given each decision is written to it as JSON; `reference` is a file written that way
+    by an earlier run, read in step, and decisions that differ from it are counted.
+    """
+    latencies: List[float] = []
+    deadline_hits = 0
+    searched = 0
+    over_budget = 0
+    skipped = 0
+    errors = 0
+    compared = 0
+    changed: List[Dict] = []
+    depths: Dict[int, int] = {}
+    start = time.perf_counter()
+    for number, payload in iter_payloads(path):
+        if payload is None:
+            skipped += 1
+            continue
+        began = time.perf_counter()
+        try:
+            chosen, deadline_hit, depth = mover(payload)
+        except Exception:  # noqa: BLE001 - a bad line should not stop the replay.
+            errors += 1
+            continue
+        elapsed_ms = (time.perf_counter() - began) * 1000.0
+        latencies.append(elapsed_ms)
+        if elapsed_ms > budget_ms:
+            over_budget += 1
+        if deadline_hit is not None:
+            searched += 1
+            deadline_hits += int(deadline_hit)
+            depths[depth] = depths.get(depth, 0) + 1
+        row = {
+            "line": number,
+            "game": payload.get("game", {}).get("id", ""),
+            "turn": payload.get("turn", 0),
+            "you": payload["you"].get("id", ""),
+            "move": chosen,
+            "ms": round(elapsed_ms, 3),
+            "deadline_hit": deadline_hit,
+            "depth": depth,
+        }
+        if decisions is not None:
+            decisions.write(json.dumps(row) + "\n")
+        if reference is not None:
+            expected = _reference_row(reference, number)
+            if expected is not None:
+                compared += 1
+                if expected.get("move") != chosen:
+                    changed.append(
+                        {"line": number, "turn": row["turn"], "was": expected.get("move"), "now": chosen}
+                    )
+        if limit and len(latencies) >= limit:
+            break
+    elapsed = time.perf_counter() - start
+
+    report: Dict = {
+        "requests": len(latencies),
+        "skipped": skipped,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies, default=0.0), 2),
+        "over_budget": over_budget,
+        "budget_ms": budget_ms,
+    }
+    if searched:
+        report["deadline_hits"] = deadline_hits
+        report["deadline_hit_rate"] = round(deadline_hits / searched, 4)
+        report["depths"] = {str(depth): count for depth, count in sorted(depths.items())}
+    if reference is not None:
+        report["compared"] = compared
+        report["changed"] = len(changed)
+        report["changed_examples"] = changed[:20]
+    return report
+
+
+def _reference_row(reference: IO[str], number: int) -> Optional[Dict]:
+    """
+    Advances `reference` to the row for corpus line `number`; rows are in line order.
+    """
+    while True:
+        position = reference.tell()
+        line = reference.readline()
+        if not line:
+            return None
+        row = json.loads(line)
+        if row["line"] == number:
+            return row
+        if row["line"] > number:
+            reference.seek(position)
+            return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="JSONL file of recorded /move payloads")
+    parser.add_argument("--url", help="replay against a running server instead of in-process")
+    parser.add_argument("--decisions", help="write each decision as JSONL here")
+    parser.add_argument("--reference", help="decisions file from an earlier run to diff against")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many payloads")
+    args = parser.parse_args()
+
+    mover = HttpMover(args.url) if args.url else InProcessMover()
+    decisions = open(args.decisions, "w", encoding="utf-8") if args.decisions else None
+    reference = open(args.reference, encoding="utf-8") if args.reference else None
+    try:
+        report = replay(args.corpus, mover, decisions, reference, args.limit)
+    finally:
+        mover.close()
+        for handle in (decisions, reference):
+            if handle is not None:
+                handle.close()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, Tuple
+
+import config
+from config import SEED
+from state import GameState, Point, Snake
+
+# Health is hashed in buckets so near-identical positions share table entries.
+HEALTH_BUCKET = 5
+
+
+class ZobristKeys:
+    """
+    Lazily generated 64-bit keys. A snake contributes its head, tail, length and health
+    bucket plus one key per body segment; food, hazards, turn parity and which snake is
+    ours are hashed per board. Snakes are keyed by slot (their position in the game's
+    snake list), not by id, so the tables are bounded by slots x cells however many
+    games a process plays.
+    """
+
+    __slots__ = (
+        "_rng",
+        "_head",
+        "_tail",
+        "_body",
+        "_length",
+        "_health",
+        "_food",
+        "_hazard",
+        "_you",
+        "_turn",
+    )
+
+    def __init__(self, seed: int = SEED) -> None:
+        self._rng = random.Random(seed)
+        self._head: Dict[Tuple[int, Point], int] = {}
+        self._tail: Dict[Tuple[int, Point], int] = {}
+        self._body: Dict[Tuple[int, Point], int] = {}
+        self._length: Dict[Tuple[int, int], int] = {}
+        self._health: Dict[Tuple[int, int], int] = {}
+        self._food: Dict[Point, int] = {}
+        self._hazard: Dict[Point, int] = {}
+        self._you: Dict[int, int] = {}
+        self._turn = (self._rng.getrandbits(64), self._rng.getrandbits(64))
+
+    def _key(self, table: Dict, item) -> int:
+        key = table.get(item)
+        if key is None:
+            key = self._rng.getrandbits(64)
+            table[item] = key
+        return key
+
+    def body(self, slot: int, point: Point) -> int:
+        return self._key(self._body, (slot, point))
+
+    def food(self, point: Point) -> int:
+        return self._key(self._food, point)
+
+    def hazard(self, point: Point) -> int:
+        return self._key(self._hazard, point)
+
+    def you(self, slot: int) -> int:
+        return self._key(self._you, slot)
+
+    def size(self) -> int:
+        """
+        Number of keys generated so far.
+        """
+        return sum(
+            len(table)
+            for table in (
+                self._head,
+                self._tail,
+                self._body,
+                self._length,
+                self._health,
+                self._food,
+                self._hazard,
+                self._you,
+            )
+        )
+
+    def turn(self, turn: int) -> int:
+        return self._turn[turn & 1]
+
+    def signature(self, snake: Snake) -> int:
+        """
+        Hash of everything about a snake except its body segments.
+        """
+        health = snake.health
+        bucket = (health // HEALTH_BUCKET) * 2 + (1 if health < config.LOW_HEALTH else 0)
+        slot = snake.slot
+        return (
+            self._key(self._head, (slot, snake.head))
+            ^ self._key(self._tail, (slot, snake.tail))
+            ^ self._key(self._length, (slot, snake.length))
+            ^ self._key(self._health, (slot, bucket))
+        )
+
+    def body_hash(self, snake: Snake) -> int:
+        value = 0
+        for segment in snake.body:
+            value ^= self.body(snake.slot, segment)
+        return value
+
+
+KEYS = ZobristKeys()
+
+
+def state_hash(state: GameState, keys: ZobristKeys = KEYS) -> int:
+    value = keys.turn(state.turn) ^ keys.you(state.me.slot)
+    for snake in state.active_snakes:
+        value ^= keys.signature(snake) ^ keys.body_hash(snake)
+    for pellet in state.food:
+        value ^= keys.food(pellet)
+    # Hazards never change inside a search, so apply_moves/undo leave this part alone.
+    for cell in state.hazards:
+        value ^= keys.hazard(cell)
+    return value
+
+
+def ensure_hash(state: GameState) -> int:
+    """
+    Computes the state's hash once; `apply_moves`/`undo` keep it current afterwards.
+    """
+    if state.zobrist is None:
+        state.zobrist = state_hash(state)
+    return state.zobrist